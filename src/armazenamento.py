@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+ARMAZENAMENTO - BANCO SQLITE PERSISTENTE DE PROCESSOS E MOVIMENTAÇÕES
+================================================================================
+Guarda cada `Processo` extraído em tabelas normalizadas, atualizadas a cada
+execução (upsert pelo número do processo):
+
+- processos: cabeçalho, status e as respostas às 14 questões;
+- partes: interessados e credores, na ordem da página;
+- advogados: advogados do requerente;
+- movimentacoes: uma linha por movimentação, com a data também em ISO
+  (AAAA-MM-DD) para filtros e ordenação por período;
+- recursos: recursos encontrados no 2º grau (cposg);
+- textos: texto da página e dos documentos (guardados só aqui) e cópia das
+  movimentações, com índice de texto completo (FTS5) atualizado na mesma
+  transação.
+
+As consultas devolvem objetos `Processo`, de modo que relatórios e resumos
+entre execuções viram consultas ao banco, sem novas raspagens:
+
+    with ArmazenamentoProcessos("resultados/jurimetria.sqlite") as banco:
+        extrator.extrair_lote(PROCESSOS, armazenamento=banco)
+        processos = banco.consultar(foro="Foro de Osasco", q04_essencialidade="SIM")
+        numeros = banco.buscar_texto('"art 49 § 3"', origem="movimentacao", data_de="01/01/2024")
+================================================================================
+"""
+
+import sqlite3
+import threading
+import time
+from dataclasses import fields
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from extrator_jurimetria import Processo
+
+
+# Textos longos de `Processo`, guardados na tabela textos (origem -> campo)
+TEXTOS_PROCESSO = {"pagina": "texto_completo", "documentos": "texto_documentos"}
+
+# Campos de texto de `Processo` guardados diretamente na tabela processos
+COLUNAS_PROCESSO = [
+    f.name for f in fields(Processo)
+    if f.name not in ("numero", "advogados_requerente", "interessados", "credores", "movimentacoes",
+                      "texto_comprimido", "texto_documentos_comprimido", "recursos", "documentos",
+                      *TEXTOS_PROCESSO.values())
+]
+COLUNAS_QUESTOES = [c for c in COLUNAS_PROCESSO if c[:1] == "q" and c[1:3].isdigit()]
+
+# Campos de cada recurso de `Processo.recursos` (numero vira numero_recurso)
+CAMPOS_RECURSO = ["numero", "classe", "situacao", "orgao_julgador", "relator", "ultima_movimentacao"]
+
+# Papéis da tabela partes e o campo (lista) correspondente em `Processo`
+PAPEIS_PARTES = {"interessado": "interessados", "credor": "credores"}
+
+# Origens dos trechos do índice de texto
+ORIGENS_TEXTO = ("movimentacao", "pagina", "documentos")
+
+# Máximo de parâmetros por cláusula IN (limite antigo do SQLite é 999)
+_LOTE_IN = 500
+
+
+def data_iso(data: str) -> Optional[str]:
+    """Converte "dd/mm/aaaa" em "aaaa-mm-dd" (None se não for uma data)"""
+    try:
+        return datetime.strptime(data.strip()[:10], "%d/%m/%Y").strftime("%Y-%m-%d")
+    except (ValueError, AttributeError):
+        return None
+
+
+def _textos(p: Processo, movimentacoes: bool = True) -> List[tuple]:
+    """Linhas da tabela textos: (origem, ordem, data_iso, texto)
+
+    A página e os documentos entram sempre (é onde ficam guardados); as
+    movimentações, só quando indexadas.
+    """
+    trechos = []
+    if movimentacoes:
+        trechos = [("movimentacao", i, data_iso(m.get("data", "")), m.get("descricao", ""))
+                   for i, m in enumerate(p.movimentacoes) if m.get("descricao")]
+    for origem, texto in (("pagina", p.texto()), ("documentos", p.texto_dos_documentos())):
+        if texto:
+            trechos.append((origem, 0, None, texto))
+    return trechos
+
+
+def frase(texto: str) -> str:
+    """Texto livre como uma frase exata da sintaxe de consulta do FTS5"""
+    return '"' + texto.replace('"', '""') + '"'
+
+
+class ArmazenamentoProcessos:
+    """Banco SQLite de processos, partes, advogados e movimentações
+
+    `adicionar` acumula processos e grava a cada `tamanho_lote` em uma
+    única transação; `gravar` grava uma coleção de uma vez. Use
+    `descarregar` (ou feche o banco) para gravar o que restar no buffer.
+    O texto da página e dos documentos fica na tabela textos, também
+    indexada; com `indexar_texto`, as movimentações entram no índice FTS5
+    consultado por `buscar_texto`.
+    """
+
+    def __init__(self, caminho: str, tamanho_lote: int = 100, indexar_texto: bool = True):
+        self.caminho = caminho
+        self.tamanho_lote = max(1, tamanho_lote)
+        self.indexar_texto = indexar_texto
+        self._buffer: List[Processo] = []
+        self._trava = threading.RLock()
+        self._db = sqlite3.connect(caminho, check_same_thread=False)
+        havia_indice = self._db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'textos'").fetchone() is not None
+        colunas = ",\n                ".join(f"{c} TEXT NOT NULL DEFAULT ''" for c in COLUNAS_PROCESSO)
+        indices = "\n            ".join(
+            f"CREATE INDEX IF NOT EXISTS idx_processos_{c} ON processos ({c});" for c in COLUNAS_QUESTOES
+        )
+        self._db.executescript(f"""
+            PRAGMA journal_mode = WAL;
+            PRAGMA foreign_keys = ON;
+            CREATE TABLE IF NOT EXISTS processos (
+                numero TEXT PRIMARY KEY,
+                {colunas},
+                atualizado_em REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS partes (
+                numero TEXT NOT NULL REFERENCES processos (numero) ON DELETE CASCADE,
+                papel TEXT NOT NULL,
+                ordem INTEGER NOT NULL,
+                nome TEXT NOT NULL,
+                PRIMARY KEY (numero, papel, ordem)
+            );
+            CREATE TABLE IF NOT EXISTS advogados (
+                numero TEXT NOT NULL REFERENCES processos (numero) ON DELETE CASCADE,
+                ordem INTEGER NOT NULL,
+                nome TEXT NOT NULL,
+                PRIMARY KEY (numero, ordem)
+            );
+            CREATE TABLE IF NOT EXISTS movimentacoes (
+                numero TEXT NOT NULL REFERENCES processos (numero) ON DELETE CASCADE,
+                ordem INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                data_iso TEXT,
+                descricao TEXT NOT NULL,
+                PRIMARY KEY (numero, ordem)
+            );
+            CREATE TABLE IF NOT EXISTS recursos (
+                numero TEXT NOT NULL REFERENCES processos (numero) ON DELETE CASCADE,
+                ordem INTEGER NOT NULL,
+                numero_recurso TEXT NOT NULL,
+                classe TEXT NOT NULL,
+                situacao TEXT NOT NULL,
+                orgao_julgador TEXT NOT NULL,
+                relator TEXT NOT NULL,
+                ultima_movimentacao TEXT NOT NULL,
+                PRIMARY KEY (numero, ordem)
+            );
+            CREATE TABLE IF NOT EXISTS textos (
+                id INTEGER PRIMARY KEY,
+                numero TEXT NOT NULL REFERENCES processos (numero) ON DELETE CASCADE,
+                origem TEXT NOT NULL,
+                ordem INTEGER NOT NULL,
+                data_iso TEXT,
+                texto TEXT NOT NULL
+            );
+            -- Índice de conteúdo externo: o FTS5 lê o texto da tabela textos, sem cópia própria,
+            -- e os gatilhos o mantêm
+            CREATE VIRTUAL TABLE IF NOT EXISTS textos_fts USING fts5 (
+                texto, content = 'textos', content_rowid = 'id',
+                tokenize = 'unicode61 remove_diacritics 2'
+            );
+            CREATE TRIGGER IF NOT EXISTS textos_fts_insercao AFTER INSERT ON textos BEGIN
+                INSERT INTO textos_fts (rowid, texto) VALUES (new.id, new.texto);
+            END;
+            CREATE TRIGGER IF NOT EXISTS textos_fts_remocao AFTER DELETE ON textos BEGIN
+                INSERT INTO textos_fts (textos_fts, rowid, texto) VALUES ('delete', old.id, old.texto);
+            END;
+            CREATE INDEX IF NOT EXISTS idx_processos_foro_vara ON processos (foro, vara);
+            CREATE INDEX IF NOT EXISTS idx_processos_status ON processos (status);
+            CREATE INDEX IF NOT EXISTS idx_movimentacoes_data ON movimentacoes (data_iso, numero);
+            CREATE INDEX IF NOT EXISTS idx_partes_nome ON partes (nome);
+            CREATE INDEX IF NOT EXISTS idx_advogados_nome ON advogados (nome);
+            CREATE INDEX IF NOT EXISTS idx_recursos_numero_recurso ON recursos (numero_recurso);
+            CREATE INDEX IF NOT EXISTS idx_textos_numero ON textos (numero);
+            {indices}
+        """)
+        migrados = self._migrar_textos()
+        if (migrados or self.indexar_texto and not havia_indice) and len(self):
+            # Banco de uma versão anterior: indexa o que já está guardado
+            print(f"🔎 Indexando o texto de {len(self)} processos já gravados...")
+            self.reindexar_texto()
+
+    def _migrar_textos(self) -> bool:
+        """Move para textos a página e os documentos de bancos que os guardavam em processos"""
+        colunas = {linha[1] for linha in self._db.execute("PRAGMA table_info(processos)")}
+        antigas = {o: c for o, c in TEXTOS_PROCESSO.items() if c in colunas}
+        preenchidas = " OR ".join(f"{c} != ''" for c in antigas.values())
+        if not antigas or self._db.execute(f"SELECT 1 FROM processos WHERE {preenchidas} LIMIT 1").fetchone() is None:
+            return False
+        with self._db:
+            for origem, coluna in antigas.items():
+                self._db.execute("DELETE FROM textos WHERE origem = ?", (origem,))
+                self._db.execute(
+                    f"INSERT INTO textos (numero, origem, ordem, data_iso, texto) "
+                    f"SELECT numero, ?, 0, NULL, {coluna} FROM processos WHERE {coluna} != ''", (origem,))
+                self._db.execute(f"UPDATE processos SET {coluna} = '' WHERE {coluna} != ''")
+        return True
+
+    def __enter__(self) -> "ArmazenamentoProcessos":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    # -- gravação -------------------------------------------------------------
+
+    def adicionar(self, proc: Processo) -> None:
+        """Acumula o processo e grava o lote quando o buffer enche"""
+        with self._trava:
+            self._buffer.append(proc)
+            if len(self._buffer) >= self.tamanho_lote:
+                self.descarregar()
+
+    def descarregar(self) -> None:
+        """Grava os processos acumulados por `adicionar`"""
+        with self._trava:
+            if self._buffer:
+                lote, self._buffer = self._buffer, []
+                self.gravar(lote)
+
+    def gravar(self, processos: Iterable[Processo]) -> int:
+        """Insere ou substitui os processos em uma única transação"""
+        processos = list(processos)
+        if not processos:
+            return 0
+        agora = time.time()
+        numeros = [(p.numero,) for p in processos]
+        linhas_proc = [
+            (p.numero, *(getattr(p, c) or "" for c in COLUNAS_PROCESSO), agora) for p in processos
+        ]
+        linhas_partes = [
+            (p.numero, papel, i, nome)
+            for p in processos
+            for papel, campo in PAPEIS_PARTES.items()
+            for i, nome in enumerate(getattr(p, campo))
+        ]
+        linhas_adv = [(p.numero, i, nome) for p in processos for i, nome in enumerate(p.advogados_requerente)]
+        linhas_mov = [
+            (p.numero, i, m.get("data", ""), data_iso(m.get("data", "")), m.get("descricao", ""))
+            for p in processos
+            for i, m in enumerate(p.movimentacoes)
+        ]
+        linhas_rec = [
+            (p.numero, i, *(r.get(c, "") for c in CAMPOS_RECURSO))
+            for p in processos
+            for i, r in enumerate(p.recursos)
+        ]
+        linhas_textos = [(p.numero, *t) for p in processos for t in _textos(p, self.indexar_texto)]
+        marcadores = ", ".join("?" * (len(COLUNAS_PROCESSO) + 2))
+        atualizacao = ", ".join(f"{c} = excluded.{c}" for c in COLUNAS_PROCESSO + ["atualizado_em"])
+        with self._trava, self._db:
+            # Filhos são substituídos por inteiro; o processo é atualizado no lugar
+            for tabela in ("partes", "advogados", "movimentacoes", "recursos", "textos"):
+                self._db.executemany(f"DELETE FROM {tabela} WHERE numero = ?", numeros)
+            self._db.executemany(
+                f"INSERT INTO processos (numero, {', '.join(COLUNAS_PROCESSO)}, atualizado_em) "
+                f"VALUES ({marcadores}) ON CONFLICT (numero) DO UPDATE SET {atualizacao}",
+                linhas_proc
+            )
+            self._db.executemany("INSERT INTO partes VALUES (?, ?, ?, ?)", linhas_partes)
+            self._db.executemany("INSERT INTO advogados VALUES (?, ?, ?)", linhas_adv)
+            self._db.executemany("INSERT INTO movimentacoes VALUES (?, ?, ?, ?, ?)", linhas_mov)
+            self._db.executemany("INSERT INTO recursos VALUES (?, ?, ?, ?, ?, ?, ?, ?)", linhas_rec)
+            self._db.executemany("INSERT INTO textos (numero, origem, ordem, data_iso, texto) VALUES (?, ?, ?, ?, ?)",
+                                 linhas_textos)
+        return len(processos)
+
+    def reindexar_texto(self) -> int:
+        """Refaz o índice de texto a partir dos processos guardados
+
+        As movimentações são copiadas de novo da tabela movimentacoes (se
+        `indexar_texto`); a página e os documentos já estão em textos.
+        """
+        with self._trava, self._db:
+            self._db.execute("DELETE FROM textos WHERE origem = 'movimentacao'")
+            if self.indexar_texto:
+                self._db.execute(
+                    "INSERT INTO textos (numero, origem, ordem, data_iso, texto) "
+                    "SELECT numero, 'movimentacao', ordem, data_iso, descricao FROM movimentacoes "
+                    "WHERE descricao != '' ORDER BY numero, ordem")
+            self._db.execute("INSERT INTO textos_fts (textos_fts) VALUES ('rebuild')")
+            self._db.execute("INSERT INTO textos_fts (textos_fts) VALUES ('optimize')")
+            return self._db.execute("SELECT COUNT(*) FROM processos").fetchone()[0]
+
+    def remover(self, numero: str) -> None:
+        with self._trava, self._db:
+            self._db.execute("DELETE FROM processos WHERE numero = ?", (numero,))
+
+    # -- consulta -------------------------------------------------------------
+
+    def _carregar(self, numeros: List[str]) -> List[Processo]:
+        """Monta os `Processo` dos números dados, na mesma ordem"""
+        processos: Dict[str, Processo] = {}
+        with self._trava:
+            for i in range(0, len(numeros), _LOTE_IN):
+                lote = numeros[i:i + _LOTE_IN]
+                em = f"IN ({', '.join('?' * len(lote))})"
+                for linha in self._db.execute(
+                    f"SELECT numero, {', '.join(COLUNAS_PROCESSO)} FROM processos WHERE numero {em}", lote
+                ):
+                    processos[linha[0]] = Processo(numero=linha[0], **dict(zip(COLUNAS_PROCESSO, linha[1:])))
+                for numero, papel, nome in self._db.execute(
+                    f"SELECT numero, papel, nome FROM partes WHERE numero {em} ORDER BY numero, papel, ordem", lote
+                ):
+                    getattr(processos[numero], PAPEIS_PARTES[papel]).append(nome)
+                for numero, nome in self._db.execute(
+                    f"SELECT numero, nome FROM advogados WHERE numero {em} ORDER BY numero, ordem", lote
+                ):
+                    processos[numero].advogados_requerente.append(nome)
+                for numero, data, descricao in self._db.execute(
+                    f"SELECT numero, data, descricao FROM movimentacoes WHERE numero {em} ORDER BY numero, ordem",
+                    lote
+                ):
+                    processos[numero].movimentacoes.append({"data": data, "descricao": descricao})
+                for numero, origem, texto in self._db.execute(
+                    f"SELECT numero, origem, texto FROM textos WHERE numero {em} AND origem IN "
+                    f"({', '.join('?' * len(TEXTOS_PROCESSO))})", [*lote, *TEXTOS_PROCESSO]
+                ):
+                    setattr(processos[numero], TEXTOS_PROCESSO[origem], texto)
+                for linha in self._db.execute(
+                    f"SELECT numero, numero_recurso, classe, situacao, orgao_julgador, relator, "
+                    f"ultima_movimentacao FROM recursos WHERE numero {em} ORDER BY numero, ordem", lote
+                ):
+                    processos[linha[0]].recursos.append(dict(zip(CAMPOS_RECURSO, linha[1:])))
+        return [processos[n] for n in numeros if n in processos]
+
+    def obter(self, numero: str) -> Optional[Processo]:
+        """Processo guardado, ou None se ausente"""
+        encontrados = self._carregar([numero])
+        return encontrados[0] if encontrados else None
+
+    def _filtros(self, foro: Optional[str], vara: Optional[str], status: Optional[str],
+                 movimentacao_de: Optional[str], movimentacao_ate: Optional[str],
+                 respostas: Dict[str, str]) -> tuple:
+        condicoes, parametros = self._condicoes(foro, vara, status, movimentacao_de, movimentacao_ate, respostas)
+        onde = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        return onde, parametros
+
+    @staticmethod
+    def _condicoes(foro: Optional[str], vara: Optional[str], status: Optional[str],
+                   movimentacao_de: Optional[str], movimentacao_ate: Optional[str],
+                   respostas: Dict[str, str]) -> tuple:
+        """Condições SQL sobre `processos p` e seus parâmetros"""
+        condicoes, parametros = [], []
+        for coluna, valor in (("foro", foro), ("vara", vara), ("status", status), *respostas.items()):
+            if valor is None:
+                continue
+            if coluna not in COLUNAS_PROCESSO:
+                raise ValueError(f"Coluna desconhecida: {coluna!r}")
+            condicoes.append(f"p.{coluna} = ?")
+            parametros.append(valor)
+        if movimentacao_de or movimentacao_ate:
+            periodo = []
+            if movimentacao_de:
+                periodo.append("m.data_iso >= ?")
+                parametros.append(data_iso(movimentacao_de) or movimentacao_de)
+            if movimentacao_ate:
+                periodo.append("m.data_iso <= ?")
+                parametros.append(data_iso(movimentacao_ate) or movimentacao_ate)
+            condicoes.append(
+                f"EXISTS (SELECT 1 FROM movimentacoes m WHERE m.numero = p.numero AND {' AND '.join(periodo)})"
+            )
+        return condicoes, parametros
+
+    def numeros(self, foro: Optional[str] = None, vara: Optional[str] = None,
+                status: Optional[str] = None, movimentacao_de: Optional[str] = None,
+                movimentacao_ate: Optional[str] = None, limite: Optional[int] = None,
+                **respostas: str) -> List[str]:
+        """Números dos processos que atendem aos filtros (ver `consultar`)"""
+        onde, parametros = self._filtros(foro, vara, status, movimentacao_de, movimentacao_ate, respostas)
+        sql = f"SELECT p.numero FROM processos p {onde} ORDER BY p.numero"
+        if limite is not None:
+            sql += " LIMIT ?"
+            parametros.append(limite)
+        with self._trava:
+            return [n for (n,) in self._db.execute(sql, parametros)]
+
+    def consultar(self, foro: Optional[str] = None, vara: Optional[str] = None,
+                  status: Optional[str] = None, movimentacao_de: Optional[str] = None,
+                  movimentacao_ate: Optional[str] = None, limite: Optional[int] = None,
+                  **respostas: str) -> List[Processo]:
+        """Processos que atendem a todos os filtros informados
+
+        `respostas` filtra por igualdade nas colunas das questões (por
+        exemplo `q04_essencialidade="SIM"`); `movimentacao_de`/`_ate`
+        ("dd/mm/aaaa" ou "aaaa-mm-dd") exigem ao menos uma movimentação no
+        período.
+        """
+        return self._carregar(self.numeros(foro, vara, status, movimentacao_de, movimentacao_ate,
+                                           limite, **respostas))
+
+    def buscar_texto(self, consulta: str, origem: Optional[str] = None, data_de: Optional[str] = None,
+                     data_ate: Optional[str] = None, foro: Optional[str] = None, vara: Optional[str] = None,
+                     status: Optional[str] = None, limite: Optional[int] = None, relevancia: bool = False,
+                     **respostas: str) -> List[str]:
+        """Números dos processos cujo texto atende à `consulta`
+
+        A consulta segue a sintaxe do FTS5: palavras (todas exigidas),
+        frases entre aspas (`"assembleia geral"`, ou `frase(texto)` para
+        texto livre), prefixos (`recupera*`), `OR`, `NOT` e `NEAR(a b, 5)`.
+        Acentos e maiúsculas são ignorados. `origem` restringe a busca a
+        "movimentacao", "pagina" ou "documentos"; `data_de`/`data_ate`
+        ("dd/mm/aaaa" ou "aaaa-mm-dd") exigem que o trecho encontrado seja
+        uma movimentação do período. Os demais filtros são os de `consultar`.
+
+        Os números vêm em ordem; com `relevancia`, do trecho mais relevante
+        (bm25) ao menos, o que custa calcular a pontuação de cada trecho
+        encontrado.
+        """
+        condicoes, parametros = ["textos_fts MATCH ?"], [consulta]
+        if origem is not None:
+            if origem not in ORIGENS_TEXTO:
+                raise ValueError(f"Origem desconhecida: {origem!r} (use {', '.join(ORIGENS_TEXTO)})")
+            condicoes.append("t.origem = ?")
+            parametros.append(origem)
+        if data_de:
+            condicoes.append("t.data_iso >= ?")
+            parametros.append(data_iso(data_de) or data_de)
+        if data_ate:
+            condicoes.append("t.data_iso <= ?")
+            parametros.append(data_iso(data_ate) or data_ate)
+        extras, parametros_extras = self._condicoes(foro, vara, status, None, None, respostas)
+        juncao = ""
+        if extras:
+            juncao = "JOIN processos p ON p.numero = t.numero"
+            condicoes += extras
+            parametros += parametros_extras
+        sql = (f"SELECT t.numero FROM textos_fts JOIN textos t ON t.id = textos_fts.rowid {juncao} "
+               f"WHERE {' AND '.join(condicoes)} GROUP BY t.numero "
+               f"ORDER BY {'MIN(textos_fts.rank), ' if relevancia else ''}t.numero")
+        if limite is not None:
+            sql += " LIMIT ?"
+            parametros.append(limite)
+        with self._trava:
+            try:
+                return [n for (n,) in self._db.execute(sql, parametros)]
+            except sqlite3.OperationalError as e:
+                if "locked" in str(e):
+                    raise
+                raise ValueError(f"Consulta de texto inválida: {consulta!r} ({e})") from e
+
+    def processos(self, tamanho_lote: int = 500) -> Iterator[Processo]:
+        """Percorre todos os processos guardados, carregando em lotes"""
+        numeros = self.numeros()
+        for i in range(0, len(numeros), tamanho_lote):
+            yield from self._carregar(numeros[i:i + tamanho_lote])
+
+    def contar_por(self, coluna: str, **filtros: str) -> Dict[str, int]:
+        """Quantidade de processos por valor de `coluna` (ex.: "foro", "q11_stay_period")"""
+        if coluna not in COLUNAS_PROCESSO:
+            raise ValueError(f"Coluna desconhecida: {coluna!r}")
+        onde, parametros = self._filtros(filtros.pop("foro", None), filtros.pop("vara", None),
+                                         filtros.pop("status", None), filtros.pop("movimentacao_de", None),
+                                         filtros.pop("movimentacao_ate", None), filtros)
+        with self._trava:
+            return dict(self._db.execute(
+                f"SELECT p.{coluna}, COUNT(*) FROM processos p {onde} GROUP BY p.{coluna} ORDER BY COUNT(*) DESC",
+                parametros
+            ))
+
+    def __len__(self) -> int:
+        with self._trava:
+            return self._db.execute("SELECT COUNT(*) FROM processos").fetchone()[0]
+
+    def fechar(self) -> None:
+        with self._trava:
+            self.descarregar()
+            self._db.close()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+BENCHMARK OFFLINE - VAZÃO E PICO DE MEMÓRIA SEM ACESSAR O TJSP
+================================================================================
+Mede as etapas do pipeline sobre páginas do e-SAJ sintéticas (`fixtures_esaj`)
+ou salvas, servidas localmente, em corpora de 1k, 10k e 100k processos:
+
+- interpretar_pagina: HTML -> dados estruturados (`busca_http`);
+- consulta_http: busca completa pelo `ClienteESAJ` contra o servidor local;
+- analisar: `Analisador.analisar` processo a processo;
+- analisar_df: o corpus inteiro por `Analisador.dataframe` + `analisar_df`;
+- gerar_relatorio: planilha Excel de `ExtratorTJSP.gerar_relatorio`;
+- gerar_resumo: resumo das 14 questões (`ExtratorTJSP.gerar_resumo`).
+
+Cada etapa informa a vazão (processos/s) e, em uma segunda passada sob o
+tracemalloc, o pico de memória alocada. Com uma linha de base gravada, as
+variações são comparadas e o código de saída é 1 se alguma etapa piorou
+além da tolerância.
+
+    python benchmark.py --tamanhos 1000 --salvar-baseline
+    python benchmark.py --tamanhos 1000,10000 --movimentacoes 200 --corpo-kb 50
+    python benchmark.py --paginas ../resultados/paginas   # páginas reais salvas
+================================================================================
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import cycle, islice
+from typing import Callable, Dict, List, Optional
+
+from busca_http import ClienteESAJ, interpretar_pagina
+from extrator_jurimetria import Analisador, Config, ExtratorTJSP, Processo
+from fixtures_esaj import PerfilSintetico, ServidorESAJ, gerar_paginas, numero_sintetico, paginas_salvas
+
+
+TAMANHOS_PADRAO = (1_000, 10_000, 100_000)
+ETAPAS = ("interpretar_pagina", "consulta_http", "analisar", "analisar_df", "gerar_relatorio", "gerar_resumo")
+ARQUIVO_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "resultados",
+                                "benchmark_baseline.json")
+
+
+def medir(funcao: Callable[[], None], n: int, memoria: bool) -> Dict[str, float]:
+    """Vazão de uma execução e, com `memoria`, o pico alocado em outra"""
+    gc.collect()
+    inicio = time.perf_counter()
+    funcao()
+    segundos = time.perf_counter() - inicio
+    resultado = {"n": n, "segundos": round(segundos, 3), "casos_s": round(n / segundos, 1) if segundos else 0.0}
+    if memoria:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            funcao()
+            resultado["pico_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+        finally:
+            tracemalloc.stop()
+    return resultado
+
+
+class Benchmark:
+    """Prepara o corpus de cada tamanho e mede as etapas sobre ele
+
+    Para não gastar o tempo do benchmark gerando HTML, cada corpus cicla
+    sobre `variantes` páginas distintas (mais as páginas salvas, se houver),
+    renumerando os processos resultantes.
+    """
+
+    def __init__(self, perfil: PerfilSintetico, salvas: Optional[Dict[str, str]] = None,
+                 variantes: int = 64, max_http: int = 5_000, diretorio: Optional[str] = None):
+        self.perfil = perfil
+        self.salvas = salvas or {}
+        self.max_http = max_http
+        self.paginas = list(self.salvas.values()) + [html for _, html in gerar_paginas(variantes, perfil)]
+        self.diretorio = diretorio or tempfile.mkdtemp(prefix="benchmark_jurimetria_")
+        self.extrator = ExtratorTJSP(Config(
+            DIR_SAIDA=self.diretorio, DIR_PDFS=os.path.join(self.diretorio, "pdfs"),
+            USAR_CACHE=False, BAIXAR_DOCUMENTOS=False, CONSULTAR_2GRAU=False,
+            USAR_DIARIO=False, METRICAS=False,
+        ))
+
+    def _dados(self, n: int) -> List[Dict]:
+        dados = [interpretar_pagina(html) for html in self.paginas]
+        return list(islice(cycle(dados), n))
+
+    def _processos(self, dados: List[Dict]) -> List[Processo]:
+        """Processos preenchidos como pelo extrator, ainda sem análise"""
+        processos = []
+        for i, d in enumerate(dados):
+            proc = Processo(numero=numero_sintetico(i), status="Sucesso", classe=d["classe"],
+                            assunto=d["assunto"], foro=d["foro"], vara=d["vara"], juiz=d["juiz"],
+                            texto_completo=d["texto"])
+            ExtratorTJSP._interpretar_partes(d["partes"], proc)
+            ExtratorTJSP._interpretar_movimentacoes(d["movimentacoes"], proc)
+            processos.append(proc)
+        return processos
+
+    def executar(self, n: int, etapas=ETAPAS, memoria: bool = True) -> Dict[str, Dict[str, float]]:
+        resultados = {}
+        if "interpretar_pagina" in etapas:
+            paginas = list(islice(cycle(self.paginas), n))
+            resultados["interpretar_pagina"] = medir(
+                lambda: [interpretar_pagina(html) for html in paginas], n, memoria)
+            del paginas
+
+        if "consulta_http" in etapas:
+            m = min(n, self.max_http)
+            with ServidorESAJ(self.perfil, self.salvas) as servidor:
+                cliente = ClienteESAJ(servidor.url_1grau)
+                numeros = list(self.salvas) + [numero_sintetico(i) for i in range(m)]
+                numeros = numeros[:m]
+                resultados["consulta_http"] = medir(lambda: [cliente.consultar(x) for x in numeros], m, memoria)
+                cliente.fechar()
+
+        dados = self._dados(n)
+        if "analisar" in etapas:
+            analisador = self.extrator.analisador
+            processos = self._processos(dados)
+            resultados["analisar"] = medir(lambda: [analisador.analisar(p) for p in processos], n, memoria)
+        if "analisar_df" in etapas:
+            # O corpus inteiro de uma vez: montagem do DataFrame (com a linha do tempo) e análise vetorizada
+            analisador = self.extrator.analisador
+            processos = self._processos(dados)
+            resultados["analisar_df"] = medir(
+                lambda: analisador.analisar_df(Analisador.dataframe(processos)), n, memoria)
+
+        # Relatório e resumo recebem processos já analisados, sem o texto (como após `compactar`)
+        processos = [self.extrator.analisador.analisar(p).compactar("descartar") for p in self._processos(dados)]
+        del dados
+        if "gerar_relatorio" in etapas:
+            caminho = os.path.join(self.diretorio, f"relatorio_{n}.xlsx")
+            resultados["gerar_relatorio"] = medir(
+                lambda: self.extrator.gerar_relatorio(processos, os.path.basename(caminho)), n, memoria)
+        if "gerar_resumo" in etapas:
+            resultados["gerar_resumo"] = medir(lambda: self.extrator.gerar_resumo(processos), n, memoria)
+        return resultados
+
+
+def comparar(atual: Dict, baseline: Dict, tolerancia: float) -> List[str]:
+    """Linhas de comparação com a linha de base; regressões marcadas com ❌"""
+    linhas = []
+    for chave, medida in atual.items():
+        base = baseline.get(chave)
+        if not base:
+            linhas.append(f"   {chave}: sem linha de base")
+            continue
+        variacao = medida["casos_s"] / base["casos_s"] - 1 if base.get("casos_s") else 0.0
+        piorou = variacao < -tolerancia
+        texto = f"vazão {variacao:+.1%}"
+        if "pico_mb" in medida and base.get("pico_mb"):
+            variacao_mem = medida["pico_mb"] / base["pico_mb"] - 1
+            piorou = piorou or variacao_mem > tolerancia
+            texto += f", memória {variacao_mem:+.1%}"
+        linhas.append(f"   {'❌' if piorou else '✅'} {chave}: {texto}")
+    return linhas
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark offline do extrator jurimétrico")
+    parser.add_argument("--tamanhos", default=",".join(map(str, TAMANHOS_PADRAO)),
+                        help="tamanhos de corpus separados por vírgula (padrão: 1000,10000,100000)")
+    parser.add_argument("--etapas", default=",".join(ETAPAS), help="etapas a medir, separadas por vírgula")
+    parser.add_argument("--movimentacoes", type=int, default=PerfilSintetico.movimentacoes)
+    parser.add_argument("--partes", type=int, default=PerfilSintetico.partes)
+    parser.add_argument("--corpo-kb", type=float, default=PerfilSintetico.corpo_kb)
+    parser.add_argument("--variantes", type=int, default=64, help="páginas sintéticas distintas por corpus")
+    parser.add_argument("--paginas", help="diretório com páginas reais salvas como <numero>.html")
+    parser.add_argument("--max-http", type=int, default=5_000, help="máximo de consultas HTTP por tamanho")
+    parser.add_argument("--sem-memoria", action="store_true", help="não mede o pico de memória")
+    parser.add_argument("--baseline", default=ARQUIVO_BASELINE, help="arquivo JSON da linha de base")
+    parser.add_argument("--salvar-baseline", action="store_true", help="grava os resultados como linha de base")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="piora aceita antes de falhar (0.2 = 20%%)")
+    parser.add_argument("--saida", help="grava os resultados desta execução em JSON")
+    args = parser.parse_args(argv)
+
+    tamanhos = [int(t) for t in args.tamanhos.split(",") if t]
+    etapas = [e for e in args.etapas.split(",") if e]
+    desconhecidas = set(etapas) - set(ETAPAS)
+    if desconhecidas:
+        parser.error(f"etapas desconhecidas: {', '.join(sorted(desconhecidas))}")
+    perfil = PerfilSintetico(movimentacoes=args.movimentacoes, partes=args.partes, corpo_kb=args.corpo_kb)
+    salvas = paginas_salvas(args.paginas) if args.paginas else None
+
+    print(f"⏱️ Benchmark: {perfil}, tamanhos {tamanhos}")
+    bench = Benchmark(perfil, salvas, variantes=args.variantes, max_http=args.max_http)
+    resultados: Dict[str, Dict[str, float]] = {}
+    for n in tamanhos:
+        for etapa, medida in bench.executar(n, etapas, memoria=not args.sem_memoria).items():
+            resultados[f"{etapa}@{n}"] = medida
+            memoria = f", pico {medida['pico_mb']} MB" if "pico_mb" in medida else ""
+            print(f"   {etapa}@{n}: {medida['casos_s']} processos/s ({medida['segundos']} s){memoria}")
+    bench.extrator.fechar()
+
+    relatorio = {
+        "perfil": vars(perfil),
+        "python": platform.python_version(),
+        "maquina": platform.machine(),
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "resultados": resultados,
+    }
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+
+    regressao = False
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("perfil") != relatorio["perfil"]:
+            print("⚠️ Linha de base gravada com outro perfil de páginas")
+        print("\n📊 Comparação com a linha de base:")
+        linhas = comparar(resultados, baseline.get("resultados", {}), args.tolerancia)
+        print("\n".join(linhas))
+        regressao = any("❌" in linha for linha in linhas)
+
+    if args.salvar_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Linha de base: {args.baseline}")
+        return 0
+    return 1 if regressao else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
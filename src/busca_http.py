@@ -0,0 +1,586 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+BUSCA HTTP - CONSULTA AO E-SAJ SEM NAVEGADOR
+================================================================================
+Consulta as páginas search.do/show.do do e-SAJ com conexões HTTP persistentes
+e interpreta o HTML devolvido, sem abrir o Chromium.
+
+O resultado de `ParserPaginaESAJ` é um dicionário simples com os campos do
+cabeçalho, o texto de cada linha das tabelas de partes e de movimentações e o
+texto visível da página, no mesmo formato que o `inner_text()` do Playwright.
+
+`ParserListaESAJ` lê as listas de resultados das pesquisas por parte,
+advogado, OAB ou documento, usadas por `ClienteESAJ.descobrir` para percorrer
+todas as páginas de uma pesquisa.
+================================================================================
+"""
+
+import gzip
+import http.client
+import queue
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urlencode, urljoin, urlsplit
+
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# Campos de cabeçalho lidos pelo id do elemento
+CAMPOS_CABECALHO = {
+    "classe": "classeProcesso",
+    "assunto": "assuntoProcesso",
+    "juiz": "juizProcesso",
+    "foro": "foroProcesso",
+    "vara": "varaProcesso",
+    "data_distribuicao": "dataHoraDistribuicaoProcesso",
+    "mensagem": "mensagemRetorno",
+}
+
+# Campos extras das páginas de recurso do 2º grau (cposg)
+CAMPOS_RECURSO = {
+    "numero": "numeroProcesso",
+    "situacao": "situacaoProcesso",
+    "orgao_julgador": "orgaoJulgadorProcesso",
+    "relator": "relatorProcesso",
+}
+
+_IDS_CAMPOS = set(CAMPOS_CABECALHO.values()) | set(CAMPOS_RECURSO.values())
+
+# Links de documentos (decisões, petições) nas tabelas de movimentações
+_TABELAS_MOVIMENTACOES = ("tabelaTodasMovimentacoes", "tabelaUltimasMovimentacoes")
+_RE_LINK_DOCUMENTO = re.compile(r"abrirDocumento|getPDF|pastadigital|\.pdf(\?|$)", re.IGNORECASE)
+
+# Tabelas cujas linhas interessam ao extrator
+TABELAS = ("tablePartesPrincipais", "tableTodasPartes",
+           "tabelaTodasMovimentacoes", "tabelaUltimasMovimentacoes")
+
+_BLOCOS = {
+    "address", "article", "aside", "blockquote", "body", "dd", "div", "dl", "dt",
+    "fieldset", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "html", "li", "main", "nav", "ol", "p", "pre", "section",
+    "table", "tbody", "tfoot", "thead", "tr", "ul",
+}
+_CELULAS = {"td", "th"}
+_IGNORADOS = {"script", "style", "noscript", "template", "head", "title"}
+_VAZIOS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+           "meta", "param", "source", "track", "wbr"}
+
+
+def _normalizar_texto(bruto: str) -> str:
+    """Aproxima a normalização de espaços feita pelo innerText"""
+    texto = re.sub(r" *([\n\t]) *", r"\1", bruto)
+    texto = re.sub(r"\n{2,}", "\n", texto)
+    return texto.strip()
+
+
+class ParserPaginaESAJ(HTMLParser):
+    """Extrai os dados de uma página de processo do e-SAJ"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._pilha: List[Tuple[str, Optional[str]]] = []
+        self._ignorando = 0
+        self._corpo: List[str] = []
+        self._ids_abertos: Dict[str, List[str]] = {}
+        self._campos: Dict[str, str] = {}
+        self._tabela_atual: Optional[str] = None
+        self._profundidade_tabela = 0
+        self._linha: Optional[List[str]] = None
+        self._linhas: Dict[str, List[str]] = {t: [] for t in TABELAS}
+        self.links_processos: List[str] = []
+        self.links_movimentacoes: List[str] = []
+
+    # -- coleta de texto ------------------------------------------------------
+
+    def _emitir(self, texto: str) -> None:
+        self._corpo.append(texto)
+        for partes in self._ids_abertos.values():
+            partes.append(texto)
+        if self._linha is not None:
+            self._linha.append(texto)
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        atributos = dict(attrs)
+        if tag in _IGNORADOS:
+            self._ignorando += 1
+            return
+        if tag == "br":
+            self._emitir("\n")
+            return
+        if tag == "a" and "processo.codigo" in (atributos.get("href") or ""):
+            self.links_processos.append(atributos["href"])
+        if tag == "a" and self._tabela_atual in _TABELAS_MOVIMENTACOES and atributos.get("href"):
+            self.links_movimentacoes.append(atributos["href"])
+        if tag in _VAZIOS:
+            return
+
+        id_elem = atributos.get("id")
+        self._pilha.append((tag, id_elem))
+        if id_elem in _IDS_CAMPOS:
+            self._ids_abertos[id_elem] = []
+        if id_elem in TABELAS and self._tabela_atual is None:
+            self._tabela_atual = id_elem
+            self._profundidade_tabela = len(self._pilha)
+        if tag == "tr" and self._tabela_atual is not None:
+            self._linha = []
+        if tag in _BLOCOS:
+            self._emitir("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _IGNORADOS:
+            self._ignorando = max(0, self._ignorando - 1)
+            return
+        if tag in _VAZIOS:
+            return
+        # Fecha também elementos que o HTML deixou sem fechamento
+        while self._pilha:
+            aberto, id_elem = self._pilha.pop()
+            self._fechar(aberto, id_elem)
+            if aberto == tag:
+                break
+
+    def _fechar(self, tag: str, id_elem: Optional[str]) -> None:
+        if tag in _CELULAS:
+            self._emitir("\t")
+        elif tag in _BLOCOS:
+            self._emitir("\n")
+        if tag == "tr" and self._linha is not None and self._tabela_atual is not None:
+            self._linhas[self._tabela_atual].append(_normalizar_texto("".join(self._linha)))
+            self._linha = None
+        if id_elem is not None and id_elem in self._ids_abertos:
+            self._campos[id_elem] = _normalizar_texto("".join(self._ids_abertos.pop(id_elem)))
+        if self._tabela_atual is not None and len(self._pilha) < self._profundidade_tabela:
+            self._tabela_atual = None
+
+    def handle_data(self, data: str) -> None:
+        if self._ignorando:
+            return
+        texto = re.sub(r"[ \t\n\r\f]+", " ", data)
+        if texto:
+            self._emitir(texto)
+
+    # -- resultado ------------------------------------------------------------
+
+    def dados(self) -> Dict:
+        """Dados da página no formato usado por `ExtratorTJSP._preencher`"""
+        while self._pilha:
+            self._fechar(*self._pilha.pop())
+        resultado = {campo: self._campos.get(id_elem, "")
+                     for campo, id_elem in CAMPOS_CABECALHO.items()}
+        resultado["encontrado"] = "classeProcesso" in self._campos
+        resultado["partes"] = self._linhas["tablePartesPrincipais"] or self._linhas["tableTodasPartes"]
+        resultado["movimentacoes"] = (self._linhas["tabelaTodasMovimentacoes"]
+                                      or self._linhas["tabelaUltimasMovimentacoes"])
+        resultado["texto"] = _normalizar_texto("".join(self._corpo))
+        resultado["links_processos"] = self.links_processos
+        resultado["documentos"] = self.links_movimentacoes
+        resultado["recurso"] = {campo: self._campos.get(id_elem, "")
+                                for campo, id_elem in CAMPOS_RECURSO.items()}
+        return resultado
+
+
+def interpretar_pagina(html: str) -> Dict:
+    """Interpreta o HTML de uma página do e-SAJ"""
+    parser = ParserPaginaESAJ()
+    parser.feed(html)
+    parser.close()
+    return parser.dados()
+
+
+def links_documentos(links: List[str], url_base: str) -> List[str]:
+    """URLs absolutas, sem repetição, dos links de movimentações que abrem documentos"""
+    return list(dict.fromkeys(urljoin(url_base, link) for link in links if _RE_LINK_DOCUMENTO.search(link)))
+
+
+def recurso_da_pagina(dados: Dict) -> Dict[str, str]:
+    """Resumo de um recurso a partir dos dados de uma página do cposg"""
+    movimentacoes = dados.get("movimentacoes") or [""]
+    return {
+        "numero": dados["recurso"]["numero"],
+        "classe": dados.get("classe", ""),
+        "situacao": dados["recurso"]["situacao"],
+        "orgao_julgador": dados["recurso"]["orgao_julgador"],
+        "relator": dados["recurso"]["relator"],
+        "ultima_movimentacao": movimentacoes[0],
+    }
+
+
+# =============================================================================
+# LISTAS DE RESULTADOS (DESCOBERTA DE PROCESSOS)
+# =============================================================================
+
+# Critérios de pesquisa do cpopg (valor de cbPesquisa)
+CRITERIOS_PESQUISA = {
+    "parte": "NMPARTE",
+    "advogado": "NMADVOGADO",
+    "oab": "NUMOAB",
+    "documento": "DOCPARTE",
+}
+
+# Classes CSS dos campos de cada resultado da lista
+_CAMPOS_LISTA = {
+    "classeProcesso": "classe",
+    "assuntoProcesso": "assunto",
+    "dataLocalDistribuicaoProcesso": "distribuicao",
+    "nomeParte": "parte",
+}
+
+_RE_NUMERO_CNJ = re.compile(r"\b\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}\b")
+
+
+@dataclass(frozen=True)
+class Pesquisa:
+    """Pesquisa de descoberta no cpopg
+    
+    `criterio` é uma chave de `CRITERIOS_PESQUISA`. O cpopg não pesquisa por
+    classe ou assunto: `classes` e `assuntos` filtram os resultados pelo
+    texto que a própria lista mostra (basta conter um dos termos).
+    """
+    criterio: str
+    valor: str
+    classes: Tuple[str, ...] = ()
+    assuntos: Tuple[str, ...] = ()
+    foro: str = "-1"  # -1 = todos os foros
+
+    def aceita(self, resultado: Dict[str, str]) -> bool:
+        def contem(campo: str, termos: Tuple[str, ...]) -> bool:
+            texto = resultado.get(campo, "").casefold()
+            return not termos or any(t.casefold() in texto for t in termos)
+        return contem("classe", self.classes) and contem("assunto", self.assuntos)
+
+
+class ParserListaESAJ(HTMLParser):
+    """Extrai os processos e o link da próxima página de uma lista de resultados"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.resultados: List[Dict[str, str]] = []
+        self.proxima: Optional[str] = None
+        self.total: Optional[int] = None
+        self._campo: Optional[str] = None
+        self._profundidade = 0
+        self._texto: List[str] = []
+        self._link_proxima = False
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        atributos = dict(attrs)
+        classes = (atributos.get("class") or "").split()
+        if self._campo is not None:
+            self._profundidade += tag not in _VAZIOS
+            return
+        if tag == "a" and "linkProcesso" in classes:
+            self.resultados.append({"numero": "", "link": atributos.get("href") or ""})
+            self._abrir("numero")
+        elif tag == "a" and ("unj-pagination__next" in classes
+                             or (atributos.get("title") or "").lower().startswith("próxima")):
+            self.proxima = self.proxima or atributos.get("href")
+        elif atributos.get("id") == "contadorDeProcessos":
+            self._abrir("total")
+        elif self.resultados:
+            for classe in classes:
+                if classe in _CAMPOS_LISTA and tag not in _VAZIOS:
+                    self._abrir(_CAMPOS_LISTA[classe])
+                    break
+
+    def _abrir(self, campo: str) -> None:
+        self._campo = campo
+        self._profundidade = 1
+        self._texto = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._campo is None or tag in _VAZIOS:
+            return
+        self._profundidade -= 1
+        if self._profundidade > 0:
+            return
+        texto = _normalizar_texto(re.sub(r"\s+", " ", "".join(self._texto)))
+        if self._campo == "total":
+            digitos = re.search(r"\d[\d.]*", texto)
+            self.total = int(digitos.group().replace(".", "")) if digitos else None
+        elif self._campo == "numero":
+            encontrado = _RE_NUMERO_CNJ.search(texto)
+            self.resultados[-1]["numero"] = encontrado.group() if encontrado else texto
+        else:
+            self.resultados[-1].setdefault(self._campo, texto)
+        self._campo = None
+
+    def handle_data(self, data: str) -> None:
+        if self._campo is not None:
+            self._texto.append(data)
+
+
+def interpretar_lista(html: str) -> Dict:
+    """Interpreta uma página de resultados: {"resultados", "proxima", "total"}"""
+    parser = ParserListaESAJ()
+    parser.feed(html)
+    parser.close()
+    return {"resultados": parser.resultados, "proxima": parser.proxima, "total": parser.total}
+
+
+# =============================================================================
+# CLIENTE HTTP
+# =============================================================================
+
+class ClienteESAJ:
+    """Cliente HTTP com pool de conexões persistentes para o e-SAJ
+
+    Seguro para uso a partir de várias threads: cada requisição toma uma
+    conexão do pool do host e a devolve ao terminar. Com `controle` (um
+    `controle_taxa.ControladorTaxa`), cada requisição espera a taxa e o
+    disjuntor e informa o resultado a ele.
+    """
+
+    MAX_REDIRECIONAMENTOS = 5
+    MAX_RECURSOS = 20  # páginas abertas a partir de uma lista de resultados do cposg
+
+    def __init__(self, url_base: str, tamanho_pool: int = 4, timeout: float = 30.0,
+                 segundo_grau: bool = False, controle=None):
+        self.url_base = url_base
+        self.segundo_grau = segundo_grau
+        self.controle = controle
+        self.timeout = timeout
+        self.tamanho_pool = max(1, tamanho_pool)
+        self._pools: Dict[Tuple[str, str, int], queue.LifoQueue] = {}
+        self._cookies: Dict[str, str] = {}
+        self._trava = threading.Lock()
+
+    def _pool(self, chave: Tuple[str, str, int]) -> queue.LifoQueue:
+        with self._trava:
+            if chave not in self._pools:
+                self._pools[chave] = queue.LifoQueue(maxsize=self.tamanho_pool)
+            return self._pools[chave]
+
+    def _conexao(self, chave: Tuple[str, str, int]) -> http.client.HTTPConnection:
+        try:
+            return self._pool(chave).get_nowait()
+        except queue.Empty:
+            esquema, host, porta = chave
+            classe = http.client.HTTPSConnection if esquema == "https" else http.client.HTTPConnection
+            return classe(host, porta, timeout=self.timeout)
+
+    def _devolver(self, chave: Tuple[str, str, int], conexao: http.client.HTTPConnection) -> None:
+        try:
+            self._pool(chave).put_nowait(conexao)
+        except queue.Full:
+            conexao.close()
+
+    def _guardar_cookies(self, resposta: http.client.HTTPResponse) -> None:
+        for cabecalho in resposta.headers.get_all("Set-Cookie") or []:
+            nome, _, valor = cabecalho.split(";", 1)[0].partition("=")
+            if nome:
+                with self._trava:
+                    self._cookies[nome.strip()] = valor.strip()
+
+    def _requisitar(self, url: str) -> Tuple[int, Dict[str, str], bytes]:
+        partes = urlsplit(url)
+        porta = partes.port or (443 if partes.scheme == "https" else 80)
+        chave = (partes.scheme, partes.hostname, porta)
+        caminho = quote(partes.path or "/", safe="/%:@;=,+")
+        if partes.query:
+            caminho += "?" + quote(partes.query, safe="/%:@;=,+&?")
+        with self._trava:
+            cookies = "; ".join(f"{k}={v}" for k, v in self._cookies.items())
+        cabecalhos = {
+            "User-Agent": USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        }
+        if cookies:
+            cabecalhos["Cookie"] = cookies
+
+        # Uma conexão reaproveitada pode ter sido fechada pelo servidor
+        for tentativa in range(2):
+            conexao = self._conexao(chave)
+            try:
+                conexao.request("GET", caminho, headers=cabecalhos)
+                resposta = conexao.getresponse()
+                corpo = resposta.read()
+            except (http.client.HTTPException, ConnectionError, OSError):
+                conexao.close()
+                if tentativa:
+                    raise
+                continue
+            self._guardar_cookies(resposta)
+            if resposta.will_close:
+                conexao.close()
+            else:
+                self._devolver(chave, conexao)
+            break
+
+        codificacao = (resposta.getheader("Content-Encoding") or "").lower()
+        if codificacao == "gzip":
+            corpo = gzip.decompress(corpo)
+        elif codificacao == "deflate":
+            corpo = zlib.decompress(corpo)
+        return resposta.status, {k.lower(): v for k, v in resposta.getheaders()}, corpo
+
+    def _requisitar_controlado(self, url: str, controle=None) -> Tuple[int, Dict[str, str], bytes]:
+        controle = controle or self.controle
+        if controle is None:
+            return self._requisitar(url)
+        controle.aguardar()
+        inicio = time.perf_counter()
+        try:
+            status, cabecalhos, corpo = self._requisitar(url)
+        except Exception:
+            controle.registrar(False, time.perf_counter() - inicio)
+            raise
+        controle.registrar(status < 400, time.perf_counter() - inicio)
+        return status, cabecalhos, corpo
+
+    def obter(self, url: str, controle=None) -> Tuple[str, str]:
+        """Baixa uma página seguindo redirecionamentos; devolve (url_final, html)
+
+        `controle` substitui o do cliente nesta chamada.
+        """
+        for _ in range(self.MAX_REDIRECIONAMENTOS + 1):
+            status, cabecalhos, corpo = self._requisitar_controlado(url, controle)
+            if status in (301, 302, 303, 307, 308) and "location" in cabecalhos:
+                url = urljoin(url, cabecalhos["location"])
+                continue
+            if status >= 400:
+                raise ConnectionError(f"HTTP {status} em {url}")
+            charset = re.search(r"charset=([\w-]+)", cabecalhos.get("content-type", ""))
+            return url, corpo.decode(charset.group(1) if charset else "utf-8", errors="replace")
+        raise ConnectionError(f"Redirecionamentos em excesso a partir de {url}")
+
+    def url_busca(self, numero: str) -> str:
+        """URL de search.do para a busca por número unificado"""
+        num_limpo = re.sub(r"\D", "", numero)
+        numero_ano = f"{num_limpo[:7]}-{num_limpo[7:9]}.{num_limpo[9:13]}"
+        if self.segundo_grau:
+            parametros = [
+                ("conversationId", ""),
+                ("paginaConsulta", "1"),
+                ("cbPesquisa", "NUMPROC"),
+                ("numeroDigitoAnoUnificado", numero_ano),
+                ("foroNumeroUnificado", num_limpo[-4:]),
+                ("dePesquisaNuUnificado", numero),
+                ("dePesquisaNuUnificado", "UNIFICADO"),
+                ("dePesquisa", ""),
+                ("tipoNuProcesso", "UNIFICADO"),
+            ]
+            return urljoin(self.url_base, "search.do") + "?" + urlencode(parametros)
+        parametros = [
+            ("conversationId", ""),
+            ("cbPesquisa", "NUMPROC"),
+            ("numeroDigitoAnoUnificado", numero_ano),
+            ("foroNumeroUnificado", num_limpo[-4:]),
+            ("dadosConsulta.valorConsultaNuUnificado", numero),
+            ("dadosConsulta.valorConsultaNuUnificado", "UNIFICADO"),
+            ("dadosConsulta.valorConsulta", ""),
+            ("dadosConsulta.tipoNuProcesso", "UNIFICADO"),
+        ]
+        return urljoin(self.url_base, "search.do") + "?" + urlencode(parametros)
+
+    def url_pesquisa(self, pesquisa: Pesquisa) -> str:
+        """URL de search.do para uma pesquisa de descoberta (1ª página)"""
+        if pesquisa.criterio not in CRITERIOS_PESQUISA:
+            raise ValueError(f"Critério de pesquisa desconhecido: {pesquisa.criterio!r} "
+                             f"(use {', '.join(CRITERIOS_PESQUISA)})")
+        parametros = [
+            ("conversationId", ""),
+            ("cbPesquisa", CRITERIOS_PESQUISA[pesquisa.criterio]),
+            ("dadosConsulta.valorConsulta", pesquisa.valor),
+            ("cdForo", pesquisa.foro),
+        ]
+        if pesquisa.criterio == "parte":
+            parametros.append(("chNmCompleto", "true"))
+        return urljoin(self.url_base, "search.do") + "?" + urlencode(parametros)
+
+    def descobrir(self, pesquisa: Pesquisa, max_paginas: Optional[int] = None,
+                  antes_de_cada_pagina=None, controle=None) -> Iterator[Dict[str, str]]:
+        """Percorre as páginas de resultados de uma pesquisa, sob demanda
+
+        Gera um dicionário por processo (numero, classe, assunto,
+        distribuicao, parte) aceito pelos filtros da `pesquisa`; a página
+        seguinte só é baixada quando o consumidor pede mais resultados.
+        `antes_de_cada_pagina` é chamado antes de cada página. Com
+        `controle` (um `controle_taxa.ControladorTaxa`), cada requisição
+        espera a taxa e o disjuntor e informa o resultado a ele, como as do
+        cliente com `controle`. Uma pesquisa com um único resultado vai
+        direto à página do processo e gera só ele.
+        """
+        url = self.url_pesquisa(pesquisa)
+        paginas = 0
+        while url and (max_paginas is None or paginas < max_paginas):
+            if antes_de_cada_pagina is not None:
+                antes_de_cada_pagina()
+            url, html = self.obter(url, controle)
+            paginas += 1
+            lista = interpretar_lista(html)
+            if not lista["resultados"]:
+                dados = interpretar_pagina(html)
+                if dados["encontrado"]:
+                    numero = _RE_NUMERO_CNJ.search(dados["texto"])
+                    resultado = {"numero": numero.group() if numero else "", "classe": dados["classe"],
+                                 "assunto": dados["assunto"], "link": url}
+                    if resultado["numero"] and pesquisa.aceita(resultado):
+                        yield resultado
+                return
+            for resultado in lista["resultados"]:
+                if resultado["numero"] and pesquisa.aceita(resultado):
+                    yield resultado
+            url = urljoin(url, lista["proxima"]) if lista["proxima"] else None
+
+    def consultar(self, numero: str) -> Optional[Tuple[str, Dict]]:
+        """Consulta um processo pelo número
+
+        Devolve (html, dados) quando a resposta é uma página de processo ou
+        uma mensagem do sistema, e None quando o HTML não é reconhecido e a
+        consulta precisa ser refeita pelo navegador.
+        """
+        url, html = self.obter(self.url_busca(numero))
+        dados = interpretar_pagina(html)
+        if dados["encontrado"] or dados["mensagem"]:
+            return html, dados
+
+        # Lista de resultados (processo com incidentes): abre o principal
+        num_limpo = re.sub(r"\D", "", numero)
+        for link in dados["links_processos"]:
+            if "show.do" in link:
+                _, html = self.obter(urljoin(url, link))
+                dados = interpretar_pagina(html)
+                if dados["encontrado"] and num_limpo in re.sub(r"\D", "", dados["texto"]):
+                    return html, dados
+        return None
+
+    def consultar_recursos(self, numero: str) -> List[Dict[str, str]]:
+        """Recursos do 2º grau encontrados na busca pelo número (cliente do cposg)
+
+        A busca devolve a página do próprio recurso ou uma lista deles;
+        cada página é resumida por `recurso_da_pagina`. Sem resultados,
+        devolve lista vazia.
+        """
+        url, html = self.obter(self.url_busca(numero))
+        dados = interpretar_pagina(html)
+        if dados["encontrado"]:
+            return [recurso_da_pagina(dados)]
+        recursos = []
+        for link in dict.fromkeys(dados["links_processos"]):
+            if "show.do" not in link or len(recursos) >= self.MAX_RECURSOS:
+                continue
+            _, html = self.obter(urljoin(url, link))
+            pagina = interpretar_pagina(html)
+            if pagina["encontrado"]:
+                recursos.append(recurso_da_pagina(pagina))
+        return recursos
+
+    def fechar(self) -> None:
+        """Fecha todas as conexões ociosas"""
+        with self._trava:
+            pools = list(self._pools.values())
+            self._pools = {}
+        for pool in pools:
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
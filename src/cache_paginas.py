@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+CACHE DE PÁGINAS - HTML E TEXTO BRUTOS POR NÚMERO DE PROCESSO
+================================================================================
+Guarda o HTML e o texto visível de cada página de processo consultada, para
+que mudanças nas regras do `Analisador` possam ser reaplicadas sem nova
+raspagem do e-SAJ.
+
+Os conteúdos ficam comprimidos em disco e endereçados pelo SHA-256 (páginas
+idênticas ocupam um único arquivo). Um índice SQLite associa cada número de
+processo aos seus conteúdos, com data de gravação (para o TTL) e de último
+acesso (para a remoção por tamanho, do menos usado para o mais usado).
+================================================================================
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+
+@dataclass
+class PaginaCache:
+    """Conteúdo bruto de uma página guardada no cache"""
+    numero: str
+    html: str
+    texto: str
+    salvo_em: float
+
+
+class CachePaginas:
+    """Cache comprimido e endereçado por conteúdo das páginas do e-SAJ
+
+    `ttl_horas` define a validade de uma página para consultas normais
+    (0 desativa a expiração) e `tamanho_maximo_mb` o espaço total dos
+    conteúdos antes de remover as páginas menos acessadas.
+
+    Com `somente_leitura`, o índice de um cache já existente é aberto sem
+    permissão de escrita e as leituras não atualizam o último acesso: vários
+    processos leem ao mesmo tempo sem disputar o lock de escrita do SQLite.
+    """
+
+    def __init__(self, diretorio: str, ttl_horas: float = 24.0, tamanho_maximo_mb: float = 2048,
+                 somente_leitura: bool = False):
+        self.diretorio = diretorio
+        self.ttl = ttl_horas * 3600
+        self.tamanho_maximo = int(tamanho_maximo_mb * 1024 * 1024)
+        self.somente_leitura = somente_leitura
+        self._trava = threading.Lock()
+        indice = os.path.join(diretorio, "indice.sqlite")
+        if somente_leitura:
+            self._db = sqlite3.connect(Path(indice).absolute().as_uri() + "?mode=ro", uri=True,
+                                       check_same_thread=False)
+            return
+        os.makedirs(os.path.join(diretorio, "objetos"), exist_ok=True)
+        self._db = sqlite3.connect(indice, check_same_thread=False)
+        self._db.executescript("""
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS paginas (
+                numero TEXT PRIMARY KEY,
+                sha_html TEXT NOT NULL,
+                sha_texto TEXT NOT NULL,
+                salvo_em REAL NOT NULL,
+                acessado_em REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS objetos (
+                sha TEXT PRIMARY KEY,
+                tamanho INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_paginas_acesso ON paginas (acessado_em);
+            CREATE INDEX IF NOT EXISTS idx_paginas_sha_html ON paginas (sha_html);
+            CREATE INDEX IF NOT EXISTS idx_paginas_sha_texto ON paginas (sha_texto);
+        """)
+
+    # -- objetos endereçados por conteúdo -------------------------------------
+
+    def _caminho(self, sha: str) -> str:
+        return os.path.join(self.diretorio, "objetos", sha[:2], sha + ".z")
+
+    def _gravar_objeto(self, conteudo: str) -> str:
+        dados = conteudo.encode("utf-8")
+        sha = hashlib.sha256(dados).hexdigest()
+        caminho = self._caminho(sha)
+        if not os.path.exists(caminho):
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporario, "wb") as f:
+                f.write(zlib.compress(dados, 6))
+            os.replace(temporario, caminho)
+        self._db.execute("INSERT OR IGNORE INTO objetos (sha, tamanho) VALUES (?, ?)",
+                         (sha, os.path.getsize(caminho)))
+        return sha
+
+    def _ler_objeto(self, sha: str) -> Optional[str]:
+        try:
+            with open(self._caminho(sha), "rb") as f:
+                return zlib.decompress(f.read()).decode("utf-8")
+        except (OSError, zlib.error):
+            return None
+
+    # -- interface pública ----------------------------------------------------
+
+    def guardar(self, numero: str, html: str, texto: str) -> None:
+        """Grava (ou substitui) a página de um processo"""
+        if self.somente_leitura:
+            raise RuntimeError("Cache aberto somente para leitura")
+        agora = time.time()
+        with self._trava, self._db:
+            anterior = self._db.execute(
+                "SELECT sha_html, sha_texto FROM paginas WHERE numero = ?", (numero,)
+            ).fetchone()
+            sha_html = self._gravar_objeto(html)
+            sha_texto = self._gravar_objeto(texto)
+            self._db.execute(
+                "INSERT OR REPLACE INTO paginas VALUES (?, ?, ?, ?, ?)",
+                (numero, sha_html, sha_texto, agora, agora)
+            )
+            if anterior:
+                # Conteúdos da versão substituída que nenhuma outra página usa
+                self._remover_orfaos(anterior)
+            self._remover_excedente()
+
+    def obter(self, numero: str, ignorar_ttl: bool = False, tocar: bool = True) -> Optional[PaginaCache]:
+        """Página guardada do processo, ou None se ausente ou expirada
+
+        Com `tocar` (e fora do modo somente leitura), a leitura conta como
+        acesso para a remoção por tamanho.
+        """
+        with self._trava:
+            linha = self._db.execute(
+                "SELECT sha_html, sha_texto, salvo_em FROM paginas WHERE numero = ?", (numero,)
+            ).fetchone()
+            if linha is None:
+                return None
+            sha_html, sha_texto, salvo_em = linha
+            if not ignorar_ttl and self.ttl > 0 and time.time() - salvo_em > self.ttl:
+                return None
+            html = self._ler_objeto(sha_html)
+            texto = self._ler_objeto(sha_texto)
+            if html is None or texto is None:
+                return None
+            if tocar and not self.somente_leitura:
+                with self._db:
+                    self._db.execute("UPDATE paginas SET acessado_em = ? WHERE numero = ?",
+                                     (time.time(), numero))
+        return PaginaCache(numero=numero, html=html, texto=texto, salvo_em=salvo_em)
+
+    def numeros(self) -> List[str]:
+        """Todos os números de processo com página no cache"""
+        with self._trava:
+            return [n for (n,) in self._db.execute("SELECT numero FROM paginas ORDER BY numero")]
+
+    def paginas(self, ignorar_ttl: bool = True) -> Iterator[PaginaCache]:
+        """Percorre todas as páginas guardadas, sem contar como acesso"""
+        for numero in self.numeros():
+            pagina = self.obter(numero, ignorar_ttl=ignorar_ttl, tocar=False)
+            if pagina is not None:
+                yield pagina
+
+    def tamanho(self) -> int:
+        """Bytes ocupados pelos conteúdos comprimidos"""
+        with self._trava:
+            return self._db.execute("SELECT COALESCE(SUM(tamanho), 0) FROM objetos").fetchone()[0]
+
+    def _remover_orfaos(self, shas) -> int:
+        """Apaga os objetos entre `shas` sem nenhuma página; devolve os bytes liberados
+
+        Só os conteúdos das páginas recém-removidas ou substituídas podem
+        ter ficado órfãos: cada um é conferido pelos índices de `sha_html` e
+        `sha_texto`, sem varrer a tabela de páginas.
+        """
+        liberado = 0
+        for sha in set(shas):
+            em_uso = self._db.execute("""
+                SELECT 1 FROM paginas WHERE sha_html = ?
+                UNION ALL SELECT 1 FROM paginas WHERE sha_texto = ? LIMIT 1
+            """, (sha, sha)).fetchone()
+            if em_uso:
+                continue
+            linha = self._db.execute("SELECT tamanho FROM objetos WHERE sha = ?", (sha,)).fetchone()
+            try:
+                os.remove(self._caminho(sha))
+            except OSError:
+                pass
+            self._db.execute("DELETE FROM objetos WHERE sha = ?", (sha,))
+            liberado += linha[0] if linha else 0
+        return liberado
+
+    def _remover_excedente(self) -> None:
+        """Remove as páginas menos acessadas até caber em `tamanho_maximo`"""
+        if self.tamanho_maximo <= 0:
+            return
+        total = self._db.execute("SELECT COALESCE(SUM(tamanho), 0) FROM objetos").fetchone()[0]
+        while total > self.tamanho_maximo:
+            linha = self._db.execute(
+                "SELECT numero, sha_html, sha_texto FROM paginas ORDER BY acessado_em LIMIT 1"
+            ).fetchone()
+            if linha is None:
+                break
+            numero, sha_html, sha_texto = linha
+            self._db.execute("DELETE FROM paginas WHERE numero = ?", (numero,))
+            total -= self._remover_orfaos((sha_html, sha_texto))
+
+    def fechar(self) -> None:
+        with self._trava:
+            self._db.close()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+CONTROLE DE TAXA - LIMITE GLOBAL DE CONSULTAS AO E-SAJ
+================================================================================
+Distribui as consultas no tempo para que vários trabalhadores simultâneos
+respeitem, juntos, um único orçamento de requisições ao portal.
+
+- `LimitadorTaxa`: balde de fichas com taxa fixa;
+- `ControladorTaxa`: ajusta a taxa pelo comportamento do portal (aumento
+  aditivo enquanto as respostas chegam rápidas, redução multiplicativa em
+  lentidão, timeouts e páginas de erro) e passa por um `Disjuntor`, que
+  pausa todos os trabalhadores durante quedas do portal;
+- `atraso_backoff`: espera exponencial com jitter entre tentativas.
+================================================================================
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Optional
+
+
+class LimitadorTaxa:
+    """Balde de fichas compartilhado entre threads e corrotinas
+
+    `taxa` é o número de consultas liberadas por segundo e `rajada` o máximo
+    de fichas acumuladas enquanto o extrator está ocioso. Com fichas em
+    bytes, o mesmo balde limita a banda (ver `aguardar(quantidade)`).
+    """
+
+    def __init__(self, taxa: float, rajada: int = 1):
+        if taxa <= 0:
+            raise ValueError("taxa deve ser positiva")
+        self.taxa = taxa
+        self.rajada = max(1, rajada)
+        self._fichas = float(self.rajada)
+        self._ultimo = time.monotonic()
+        self._trava = threading.Lock()
+
+    def _reservar(self, quantidade: float = 1) -> float:
+        """Consome fichas e devolve quantos segundos esperar por elas"""
+        with self._trava:
+            agora = time.monotonic()
+            self._fichas = min(self.rajada, self._fichas + (agora - self._ultimo) * self.taxa)
+            self._ultimo = agora
+            self._fichas -= quantidade
+            if self._fichas >= 0:
+                return 0.0
+            return -self._fichas / self.taxa
+
+    def aguardar(self, quantidade: float = 1) -> None:
+        """Bloqueia a thread atual até haver `quantidade` fichas disponíveis"""
+        espera = self._reservar(quantidade)
+        if espera > 0:
+            time.sleep(espera)
+
+    async def aguardar_async(self) -> None:
+        """Suspende a corrotina atual até haver ficha disponível"""
+        espera = self._reservar()
+        if espera > 0:
+            await asyncio.sleep(espera)
+
+
+def atraso_backoff(tentativa: int, base: float = 2.0, maximo: float = 60.0) -> float:
+    """Espera antes da tentativa seguinte: exponencial com jitter completo
+
+    Sorteada entre 0 e `base * 2**(tentativa - 1)` (limitado a `maximo`),
+    para que processos que falharam juntos não voltem todos juntos.
+    """
+    return random.uniform(0, min(maximo, base * 2 ** max(0, tentativa - 1)))
+
+
+class Disjuntor:
+    """Disjuntor (circuit breaker) compartilhado pelos trabalhadores
+
+    Abre após `falhas_para_abrir` falhas seguidas e bloqueia todas as
+    consultas por `pausa_s`. Depois da pausa fica meio-aberto: uma única
+    consulta de sonda passa; se ela der certo o disjuntor fecha, se falhar
+    ele reabre com a pausa dobrada (até `pausa_maxima_s`).
+    """
+
+    FECHADO = "fechado"
+    ABERTO = "aberto"
+    MEIO_ABERTO = "meio_aberto"
+
+    def __init__(self, falhas_para_abrir: int = 5, pausa_s: float = 60.0, pausa_maxima_s: float = 900.0):
+        self.falhas_para_abrir = max(1, falhas_para_abrir)
+        self.pausa_inicial = pausa_s
+        self.pausa_maxima = max(pausa_s, pausa_maxima_s)
+        self.estado = self.FECHADO
+        self.aberturas = 0
+        self._pausa = pausa_s
+        self._falhas = 0
+        self._reabre_em = 0.0
+        self._sonda_em_curso = False
+        self._trava = threading.Lock()
+
+    def espera(self) -> float:
+        """Segundos até a próxima consulta poder começar (0 = pode agora)"""
+        with self._trava:
+            if self.estado == self.FECHADO:
+                return 0.0
+            agora = time.monotonic()
+            if self.estado == self.ABERTO:
+                if agora < self._reabre_em:
+                    return self._reabre_em - agora
+                self.estado = self.MEIO_ABERTO
+                self._sonda_em_curso = False
+            if self._sonda_em_curso:
+                return min(1.0, self._pausa)
+            self._sonda_em_curso = True
+            return 0.0
+
+    def sucesso(self) -> None:
+        with self._trava:
+            if self.estado != self.FECHADO:
+                print("   🟢 Disjuntor fechado: portal respondendo de novo")
+            self.estado = self.FECHADO
+            self._falhas = 0
+            self._pausa = self.pausa_inicial
+            self._sonda_em_curso = False
+
+    def falha(self) -> None:
+        with self._trava:
+            self._falhas += 1
+            if self.estado == self.MEIO_ABERTO:
+                self._pausa = min(self.pausa_maxima, self._pausa * 2)
+            elif self.estado == self.ABERTO or self._falhas < self.falhas_para_abrir:
+                return
+            self.estado = self.ABERTO
+            self.aberturas += 1
+            self._sonda_em_curso = False
+            self._reabre_em = time.monotonic() + self._pausa
+            print(f"   🔴 Disjuntor aberto após {self._falhas} falhas seguidas: pausa de {self._pausa:.0f}s")
+
+
+class ControladorTaxa:
+    """Taxa de consultas ajustada pelo comportamento do portal (AIMD)
+
+    Cada consulta concluída é informada em `registrar`. Respostas bem
+    sucedidas em até `latencia_alvo` segundos somam `incremento` consultas/s
+    à taxa (até `taxa_maxima`); respostas lentas, timeouts e páginas de erro
+    a multiplicam por `fator_reducao` (até `taxa_minima`), no máximo uma vez
+    por `latencia_alvo` segundos para que uma rajada de falhas simultâneas
+    conte como um só sinal. Falhas e sucessos também alimentam o `Disjuntor`.
+
+    Com `taxa_inicial` None não há limite de taxa, só o disjuntor; com
+    `adaptativo=False` a taxa fica fixa.
+    """
+
+    def __init__(self, taxa_inicial: Optional[float], taxa_minima: float = 0.05, taxa_maxima: float = 2.0,
+                 incremento: float = 0.02, fator_reducao: float = 0.5, latencia_alvo: float = 5.0,
+                 adaptativo: bool = True, disjuntor: Optional[Disjuntor] = None):
+        self.limitador = LimitadorTaxa(taxa_inicial) if taxa_inicial else None
+        self.taxa_minima = min(taxa_minima, taxa_inicial or taxa_minima)
+        self.taxa_maxima = max(taxa_maxima, taxa_inicial or taxa_maxima)
+        self.incremento = incremento
+        self.fator_reducao = fator_reducao
+        self.latencia_alvo = latencia_alvo
+        self.adaptativo = adaptativo
+        self.disjuntor = disjuntor or Disjuntor()
+        self.reducoes = 0
+        self._ultima_reducao = 0.0
+        self._trava = threading.Lock()
+
+    @property
+    def taxa(self) -> Optional[float]:
+        return self.limitador.taxa if self.limitador is not None else None
+
+    def _ajustar(self, taxa: float) -> None:
+        with self.limitador._trava:
+            self.limitador.taxa = min(self.taxa_maxima, max(self.taxa_minima, taxa))
+
+    def registrar(self, sucesso: bool, latencia: float) -> None:
+        """Informa o resultado de uma consulta ao portal"""
+        if sucesso:
+            self.disjuntor.sucesso()
+        else:
+            self.disjuntor.falha()
+        if self.limitador is None or not self.adaptativo:
+            return
+        if sucesso and latencia <= self.latencia_alvo:
+            self._ajustar(self.limitador.taxa + self.incremento)
+            return
+        with self._trava:
+            agora = time.monotonic()
+            if agora - self._ultima_reducao < self.latencia_alvo:
+                return
+            self._ultima_reducao = agora
+            self.reducoes += 1
+        self._ajustar(self.limitador.taxa * self.fator_reducao)
+
+    def aguardar_disjuntor(self) -> None:
+        """Bloqueia a thread só enquanto o disjuntor estiver aberto, sem gastar ficha
+
+        Para requisições que não contam no orçamento de consultas (downloads
+        de documentos) mas cujo resultado também é informado em `registrar`.
+        """
+        while (espera := self.disjuntor.espera()) > 0:
+            time.sleep(espera)
+
+    def aguardar(self) -> None:
+        """Bloqueia a thread até o disjuntor e a taxa liberarem uma consulta"""
+        self.aguardar_disjuntor()
+        if self.limitador is not None:
+            self.limitador.aguardar()
+
+    async def aguardar_async(self) -> None:
+        """Suspende a corrotina até o disjuntor e a taxa liberarem uma consulta"""
+        while (espera := self.disjuntor.espera()) > 0:
+            await asyncio.sleep(espera)
+        if self.limitador is not None:
+            await self.limitador.aguardar_async()
+
+    def descricao(self) -> str:
+        taxa = f"{self.taxa:.2f} consultas/s" if self.taxa is not None else "sem limite"
+        return f"{taxa}, {self.reducoes} reduções, disjuntor {self.disjuntor.estado} ({self.disjuntor.aberturas} aberturas)"
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+DIÁRIO DE EXECUÇÃO - RETOMADA DE LOTES INTERROMPIDOS
+================================================================================
+Arquivo JSONL somente de acréscimo: cada processo concluído vira uma linha,
+gravada e sincronizada no disco assim que o processo termina. Se a execução
+cair no meio do lote, rodar o mesmo lote de novo pula os processos já
+concluídos e repete apenas os que falharam, conforme a política:
+
+- `repetir_status`: status que devem ser consultados de novo (padrão "Erro");
+- `max_tentativas`: total de tentativas de um mesmo número, somando todas as
+  execuções, antes de desistir e manter o último resultado (0 = sem limite).
+
+Uma última linha truncada pela queda é descartada ao abrir o diário. Quando o
+lote termina sem interrupção, `descartar` apaga o diário: ele só serve para
+retomar aquele lote, e um diário antigo não deve responder pelo próximo.
+================================================================================
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, Iterator, Optional
+
+
+class DiarioExecucao:
+    """Diário de processos concluídos de um lote, com retomada"""
+
+    def __init__(self, caminho: str, repetir_status: Iterable[str] = ("Erro",),
+                 max_tentativas: int = 3, sincronizar: bool = True):
+        self.caminho = caminho
+        self.repetir_status = frozenset(repetir_status)
+        self.max_tentativas = max_tentativas
+        self.sincronizar = sincronizar
+        self._ultimo: Dict[str, Dict] = {}
+        self._tentativas: Counter = Counter()
+        self._trava = threading.Lock()
+        if os.path.dirname(caminho):
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        self._carregar()
+        self._arquivo = open(caminho, "a", encoding="utf-8")
+
+    def __enter__(self) -> "DiarioExecucao":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    def _carregar(self) -> None:
+        """Lê o diário existente e corta uma eventual linha incompleta no final"""
+        if not os.path.exists(self.caminho):
+            return
+        valido = 0
+        with open(self.caminho, "rb") as f:
+            for linha in f:
+                if not linha.endswith(b"\n"):
+                    break
+                try:
+                    registro = json.loads(linha)
+                except ValueError:
+                    break
+                valido += len(linha)
+                numero = registro.get("numero", "")
+                self._ultimo[numero] = registro
+                self._tentativas[numero] += 1
+        if valido < os.path.getsize(self.caminho):
+            with open(self.caminho, "r+b") as f:
+                f.truncate(valido)
+
+    def concluido(self, numero: str) -> Optional[Dict]:
+        """Último registro do número se ele não precisa ser consultado de novo"""
+        registro = self._ultimo.get(numero)
+        if registro is None:
+            return None
+        if registro.get("status") in self.repetir_status and (
+                self.max_tentativas <= 0 or self._tentativas[numero] < self.max_tentativas):
+            return None
+        return registro
+
+    def registrar(self, registro: Dict) -> None:
+        """Acrescenta o resultado de um processo e o grava no disco"""
+        registro = dict(registro, registrado_em=time.time())
+        linha = json.dumps(registro, ensure_ascii=False) + "\n"
+        with self._trava:
+            self._arquivo.write(linha)
+            self._arquivo.flush()
+            if self.sincronizar:
+                os.fsync(self._arquivo.fileno())
+            numero = registro.get("numero", "")
+            self._ultimo[numero] = registro
+            self._tentativas[numero] += 1
+
+    def registros(self) -> Iterator[Dict]:
+        """Último registro de cada número do diário"""
+        return iter(list(self._ultimo.values()))
+
+    def contagem(self) -> Dict[str, int]:
+        """Quantidade de números por status do último registro"""
+        return dict(Counter(r.get("status", "") for r in self._ultimo.values()))
+
+    def __len__(self) -> int:
+        return len(self._ultimo)
+
+    def fechar(self) -> None:
+        with self._trava:
+            if not self._arquivo.closed:
+                self._arquivo.close()
+
+    def descartar(self) -> None:
+        """Fecha e apaga o diário de um lote concluído"""
+        self.fechar()
+        with self._trava:
+            self._ultimo.clear()
+            self._tentativas.clear()
+            if os.path.exists(self.caminho):
+                os.remove(self.caminho)
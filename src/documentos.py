@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+DOCUMENTOS - DOWNLOAD CONCORRENTE DE PDFs E EXTRAÇÃO DE TEXTO
+================================================================================
+Baixa os documentos ligados às movimentações (decisões, petições) para o
+diretório de PDFs, com várias transferências simultâneas dentro de um limite
+global de banda, e extrai o texto de cada PDF em um pool de processos.
+
+- Cada arquivo é gravado como `<sha256[:2]>/<sha256>.pdf`: o mesmo documento
+  vindo de links diferentes ocupa um único arquivo.
+- Um índice SQLite associa cada URL ao hash do conteúdo; URLs já baixadas
+  não são baixadas de novo.
+- O texto fica em `<sha256>.txt` ao lado do PDF e é extraído uma única vez.
+- Respostas que não são PDF (página de login, erro) são descartadas.
+
+A extração de texto requer o pypdf (pip install pypdf); sem ele, os PDFs são
+baixados normalmente e o texto fica vazio. Qualquer URL aceita pelo urllib
+funciona, inclusive um servidor de arquivos local, o que facilita os testes.
+================================================================================
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.cookiejar import CookieJar
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from controle_taxa import LimitadorTaxa
+
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+_BLOCO = 64 * 1024
+
+
+def extrair_texto_pdf(caminho: str) -> str:
+    """Texto de um PDF com o pypdf ("" se o pypdf não estiver instalado)"""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return ""
+    try:
+        leitor = PdfReader(caminho)
+        return "\n".join((pagina.extract_text() or "") for pagina in leitor.pages).strip()
+    except Exception:
+        return ""
+
+
+def _extrair_e_gravar(caminho_pdf: str) -> str:
+    """Executado no worker: extrai o texto e o grava ao lado do PDF"""
+    texto = extrair_texto_pdf(caminho_pdf)
+    caminho_txt = caminho_pdf[:-4] + ".txt"
+    temporario = f"{caminho_txt}.{os.getpid()}.tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        f.write(texto)
+    os.replace(temporario, caminho_txt)
+    return texto
+
+
+class ColetorDocumentos:
+    """Baixa, deduplica e extrai o texto dos documentos das movimentações
+
+    `concorrencia` é o número de downloads simultâneos, `limite_kbps` a
+    banda total somada (0 = sem limite) e `workers_texto` o tamanho do pool
+    de extração (0 = todos os núcleos). Com `controle` (um
+    `controle_taxa.ControladorTaxa`), cada download espera o disjuntor das
+    consultas e informa o resultado a ele, mas não gasta fichas da taxa de
+    consultas: o ritmo dos downloads é o do limite de banda. Com
+    `somente_leitura`, só lê o índice e os textos já extraídos em disco
+    (`texto_em_disco`), sem pools nem escrita no índice.
+    """
+
+    def __init__(self, diretorio: str, concorrencia: int = 4, limite_kbps: float = 0,
+                 workers_texto: int = 0, timeout: float = 60.0, somente_leitura: bool = False,
+                 controle=None):
+        self.diretorio = diretorio
+        self.somente_leitura = somente_leitura
+        self.controle = controle
+        self.timeout = timeout
+        self.workers_texto = workers_texto or os.cpu_count() or 1
+        self.limitador: Optional[LimitadorTaxa] = None
+        if limite_kbps > 0:
+            self.limitador = LimitadorTaxa(limite_kbps * 1024, rajada=_BLOCO)
+        self._extratores: Optional[ProcessPoolExecutor] = None
+        self._trava = threading.Lock()
+        indice = os.path.join(diretorio, "indice.sqlite")
+        if somente_leitura:
+            self._downloads: Optional[ThreadPoolExecutor] = None
+            self._db = sqlite3.connect(Path(indice).absolute().as_uri() + "?mode=ro", uri=True,
+                                       check_same_thread=False)
+            return
+        os.makedirs(diretorio, exist_ok=True)
+        self._downloads = ThreadPoolExecutor(max_workers=max(1, concorrencia), thread_name_prefix="pdf")
+        self._abridor = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+        self._abridor.addheaders = [("User-Agent", USER_AGENT), ("Accept", "application/pdf,*/*")]
+        self._db = sqlite3.connect(indice, check_same_thread=False)
+        self._db.executescript("""
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS documentos (
+                url TEXT PRIMARY KEY,
+                sha TEXT NOT NULL,
+                tamanho INTEGER NOT NULL,
+                baixado_em REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_documentos_sha ON documentos (sha);
+        """)
+
+    def __enter__(self) -> "ColetorDocumentos":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    # -- arquivos ---------------------------------------------------------------
+
+    def caminho(self, sha: str) -> str:
+        return os.path.join(self.diretorio, sha[:2], sha + ".pdf")
+
+    def _sha_da_url(self, url: str) -> Optional[str]:
+        with self._trava:
+            linha = self._db.execute("SELECT sha FROM documentos WHERE url = ?", (url,)).fetchone()
+        if linha is None or not os.path.exists(self.caminho(linha[0])):
+            return None
+        return linha[0]
+
+    def _abrir(self, url: str):
+        """Abre a URL; com `controle`, respeita o disjuntor e alimenta o ajuste da taxa"""
+        if self.controle is None:
+            return self._abridor.open(url, timeout=self.timeout)
+        self.controle.aguardar_disjuntor()
+        inicio = time.perf_counter()
+        try:
+            resposta = self._abridor.open(url, timeout=self.timeout)
+        except Exception:
+            self.controle.registrar(False, time.perf_counter() - inicio)
+            raise
+        self.controle.registrar(True, time.perf_counter() - inicio)
+        return resposta
+
+    def _baixar(self, url: str) -> Optional[str]:
+        """Baixa uma URL em blocos, dentro do limite de banda; devolve o hash"""
+        sha = self._sha_da_url(url)
+        if sha is not None:
+            return sha
+        temporario = os.path.join(self.diretorio, f"baixando-{threading.get_ident()}-{time.monotonic_ns()}.tmp")
+        resumo = hashlib.sha256()
+        tamanho = 0
+        try:
+            with self._abrir(url) as resposta, open(temporario, "wb") as f:
+                while True:
+                    bloco = resposta.read(_BLOCO)
+                    if not bloco:
+                        break
+                    if tamanho == 0 and not bloco.startswith(b"%PDF"):
+                        return None
+                    if self.limitador is not None:
+                        self.limitador.aguardar(len(bloco))
+                    resumo.update(bloco)
+                    f.write(bloco)
+                    tamanho += len(bloco)
+            if tamanho == 0:
+                return None
+            sha = resumo.hexdigest()
+            destino = self.caminho(sha)
+            if os.path.exists(destino):
+                os.remove(temporario)
+            else:
+                os.makedirs(os.path.dirname(destino), exist_ok=True)
+                os.replace(temporario, destino)
+            with self._trava, self._db:
+                self._db.execute("INSERT OR REPLACE INTO documentos VALUES (?, ?, ?, ?)",
+                                 (url, sha, tamanho, time.time()))
+            return sha
+        finally:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+
+    # -- interface pública ------------------------------------------------------
+
+    def baixar(self, urls: Iterable[str]) -> Dict[str, str]:
+        """Baixa as URLs em paralelo; devolve url -> hash dos PDFs obtidos
+
+        Falhas e respostas que não são PDF são registradas e omitidas.
+        """
+        if self._downloads is None:
+            raise RuntimeError("Coletor de documentos aberto somente para leitura")
+        urls = list(dict.fromkeys(urls))
+        futuros = {url: self._downloads.submit(self._baixar, url) for url in urls}
+        obtidos = {}
+        for url, futuro in futuros.items():
+            try:
+                sha = futuro.result()
+            except Exception as e:
+                print(f"   ⚠️ Erro ao baixar documento {url}: {e}")
+                continue
+            if sha is not None:
+                obtidos[url] = sha
+        return obtidos
+
+    def textos(self, shas: Iterable[str], extrair: bool = True) -> Dict[str, str]:
+        """Texto de cada PDF (hash -> texto), extraindo no pool o que faltar
+
+        Com `extrair=False` só lê os textos já extraídos em disco.
+        """
+        textos, faltando = {}, []
+        for sha in dict.fromkeys(shas):
+            caminho_txt = self.caminho(sha)[:-4] + ".txt"
+            if os.path.exists(caminho_txt):
+                with open(caminho_txt, encoding="utf-8") as f:
+                    textos[sha] = f.read()
+            elif extrair and not self.somente_leitura and os.path.exists(self.caminho(sha)):
+                faltando.append(sha)
+        if faltando:
+            if self._extratores is None:
+                self._extratores = ProcessPoolExecutor(max_workers=self.workers_texto)
+            for sha, texto in zip(faltando, self._extratores.map(_extrair_e_gravar,
+                                                                 [self.caminho(s) for s in faltando])):
+                textos[sha] = texto
+        return textos
+
+    def texto_em_disco(self, urls: Iterable[str]) -> str:
+        """Texto já extraído dos documentos das URLs, sem acessar a rede"""
+        shas = [sha for sha in map(self._sha_da_url, urls) if sha is not None]
+        return "\n\n".join(t for t in self.textos(shas, extrair=False).values() if t)
+
+    def processar(self, urls: Iterable[str]) -> str:
+        """Baixa, extrai e devolve o texto concatenado dos documentos"""
+        obtidos = self.baixar(urls)
+        textos = self.textos(obtidos.values())
+        return "\n\n".join(t for t in textos.values() if t)
+
+    def fechar(self) -> None:
+        if self._downloads is not None:
+            self._downloads.shutdown(wait=True)
+        if self._extratores is not None:
+            self._extratores.shutdown(wait=True)
+            self._extratores = None
+        with self._trava:
+            self._db.close()
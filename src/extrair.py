@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+EXTRAIR - LINHA DE COMANDO EM FLUXO PARA O EXTRATOR JURIMÉTRICO
+================================================================================
+Lê números de processo sob demanda de um arquivo ou da entrada padrão e
+grava cada processo assim que ele termina, sem acumular o lote na memória:
+
+- entrada: texto (um número por linha, `#` comenta), JSONL (objetos com o
+  campo `numero` ou strings) ou CSV (coluna `numero` ou a primeira);
+- saída: uma linha JSON por `Processo` (padrão), ou uma linha do relatório
+  por processo em qualquer formato de `saidas` (jsonl, csv, parquet, xlsx).
+
+O log do extrator vai para a saída de erros, de modo que a saída padrão
+fica livre para o JSONL e pode ser encadeada com outras ferramentas:
+
+    python extrair.py numeros.txt > processos.jsonl
+    cat numeros.csv | python extrair.py --formato-entrada csv --concorrencia 8 | jq .status
+    python extrair.py numeros.jsonl -o relatorio.csv --formato csv --sem-cache
+================================================================================
+"""
+
+import argparse
+import asyncio
+import contextlib
+import csv
+import json
+import os
+import sys
+from typing import AsyncIterator, Iterator, List, Optional, TextIO
+
+from extrator_jurimetria import (
+    COLUNAS_RELATORIO, Config, ExtratorTJSP, Processo, processo_para_dict,
+)
+from saidas import SAIDAS, abrir_saida
+
+
+FORMATOS_ENTRADA = ("auto", "texto", "jsonl", "csv")
+FORMATOS_SAIDA = ("processo",) + tuple(SAIDAS)
+
+
+def _detectar_formato(arquivo: TextIO) -> str:
+    """Formato pela extensão do arquivo ou, na entrada padrão, pela primeira linha"""
+    extensao = os.path.splitext(getattr(arquivo, "name", ""))[1].lower()
+    if extensao in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if extensao == ".csv":
+        return "csv"
+    if extensao:
+        return "texto"
+    return "auto"
+
+
+def ler_numeros(arquivo: TextIO, formato: str = "auto", campo: str = "numero") -> Iterator[str]:
+    """Números de processo do arquivo, lidos linha a linha"""
+    if formato == "auto":
+        formato = _detectar_formato(arquivo)
+    linhas = iter(arquivo)
+    if formato == "auto":
+        # Entrada padrão: decide pela primeira linha não vazia
+        for primeira in linhas:
+            if primeira.strip():
+                break
+        else:
+            return
+        inicio = primeira.lstrip()
+        colunas = [c.strip() for c in next(csv.reader([primeira.strip()]))]
+        formato = "jsonl" if inicio[:1] in ("{", '"') else "csv" if campo in colunas else "texto"
+        linhas = _encadear(primeira, linhas)
+
+    if formato == "csv":
+        leitor = csv.reader(linhas)
+        primeira_linha = next(leitor, None)
+        if primeira_linha is None:
+            return
+        cabecalho = [c.strip() for c in primeira_linha]
+        coluna = 0
+        if campo in cabecalho:
+            coluna = cabecalho.index(campo)
+        else:
+            # Sem cabeçalho: a primeira linha já é de dados
+            leitor = _encadear(primeira_linha, leitor)
+        for valores in leitor:
+            if len(valores) > coluna and valores[coluna].strip():
+                yield valores[coluna].strip()
+        return
+
+    for n_linha, linha in enumerate(linhas, 1):
+        linha = linha.strip()
+        if not linha or linha.startswith("#"):
+            continue
+        if formato == "jsonl":
+            try:
+                registro = json.loads(linha)
+            except ValueError:
+                print(f"⚠️ Linha {n_linha} ignorada: JSON inválido", file=sys.stderr)
+                continue
+            numero = registro.get(campo) if isinstance(registro, dict) else registro
+            if isinstance(numero, str) and numero.strip():
+                yield numero.strip()
+        else:
+            yield linha
+
+
+def _encadear(primeira, linhas: Iterator) -> Iterator:
+    yield primeira
+    yield from linhas
+
+
+async def _ler_async(numeros: Iterator[str]) -> AsyncIterator[str]:
+    """Entrega os números sem bloquear o laço de eventos (a leitura pode esperar um pipe)
+
+    Um número por vez: cada um segue para a extração assim que a linha
+    chega, mesmo quando a entrada é um pipe que escreve devagar (`tail -f`).
+    """
+    while (numero := await asyncio.to_thread(next, numeros, None)) is not None:
+        yield numero
+
+
+class SaidaProcessos:
+    """Uma linha JSON por processo, descarregada a cada gravação
+
+    Se o leitor do pipe sair (ex.: `| head`), o BrokenPipeError interrompe
+    o lote: os próximos processos não teriam destino.
+    """
+
+    def __init__(self, arquivo: TextIO, manter_texto: bool = False):
+        self.arquivo = arquivo
+        self.manter_texto = manter_texto
+        self.linhas_gravadas = 0
+
+    def escrever(self, proc: Processo) -> None:
+        self.arquivo.write(json.dumps(processo_para_dict(proc, self.manter_texto), ensure_ascii=False) + "\n")
+        self.arquivo.flush()
+        self.linhas_gravadas += 1
+
+
+def configurar(args: argparse.Namespace) -> Config:
+    """Config do extrator a partir das opções da linha de comando"""
+    config = Config(CONCORRENCIA=args.concorrencia, USAR_CACHE=not args.sem_cache,
+                    MODO_OFFLINE=args.offline, CONSULTAR_2GRAU=not args.sem_2grau,
+                    BAIXAR_DOCUMENTOS=args.documentos, USAR_DIARIO=bool(args.diario),
+                    METRICAS=bool(args.metricas), BACKEND_CONSULTA=args.backend)
+    if args.diretorio:
+        config.DIR_SAIDA = args.diretorio
+        config.DIR_PDFS = os.path.join(args.diretorio, "pdfs")
+        config.DIR_CACHE = os.path.join(args.diretorio, "cache")
+    if args.cache:
+        config.DIR_CACHE = args.cache
+    if args.diario:
+        config.ARQUIVO_DIARIO = args.diario
+    if args.metricas:
+        config.ARQUIVO_METRICAS = args.metricas
+    if args.url:
+        config.URL_TJSP_1GRAU = args.url
+    if args.intervalo is not None:
+        config.DELAY_ENTRE_PROCESSOS = args.intervalo
+    return config
+
+
+async def executar(args: argparse.Namespace, entrada: TextIO, destino: TextIO) -> int:
+    with ExtratorTJSP(configurar(args)) as extrator:
+        numeros = _ler_async(ler_numeros(entrada, args.formato_entrada, args.campo))
+        if args.formato == "processo":
+            saida = SaidaProcessos(destino, manter_texto=args.texto)
+            await extrator.extrair_lote_async(numeros, ao_concluir=saida.escrever, manter_resultados=False)
+            return saida.linhas_gravadas
+        with abrir_saida(args.saida, COLUNAS_RELATORIO, args.formato) as saida:
+            await extrator.extrair_lote_async(numeros, saidas=[saida], manter_resultados=False)
+            return saida.linhas_gravadas
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Extrai processos do e-SAJ/TJSP lidos de um arquivo ou da entrada padrão, "
+                    "gravando cada um assim que termina")
+    parser.add_argument("entrada", nargs="?", default="-", help="arquivo de números (padrão: entrada padrão)")
+    parser.add_argument("-o", "--saida", default="-", help="arquivo de saída (padrão: saída padrão)")
+    parser.add_argument("--formato-entrada", choices=FORMATOS_ENTRADA, default="auto")
+    parser.add_argument("--campo", default="numero", help="campo ou coluna do número em JSONL/CSV")
+    parser.add_argument("--formato", choices=FORMATOS_SAIDA, default="processo",
+                        help="'processo': JSONL com o processo completo; demais: linhas do relatório")
+    parser.add_argument("--texto", action="store_true", help="inclui o texto das páginas e documentos no JSONL")
+    parser.add_argument("-c", "--concorrencia", type=int, default=Config.CONCORRENCIA)
+    parser.add_argument("--intervalo", type=float, help="intervalo inicial entre consultas, em segundos")
+    parser.add_argument("--backend", choices=("auto", "http", "navegador"), default=Config.BACKEND_CONSULTA)
+    parser.add_argument("--url", help="URL do cpopg (ex.: um servidor de testes local)")
+    parser.add_argument("--diretorio", help="diretório de resultados (cache, PDFs)")
+    parser.add_argument("--cache", help="diretório do cache de páginas")
+    parser.add_argument("--sem-cache", action="store_true", help="não lê nem grava o cache de páginas")
+    parser.add_argument("--offline", action="store_true", help="só reconstrói processos do cache, sem rede")
+    parser.add_argument("--sem-2grau", action="store_true", help="não consulta recursos no 2º grau")
+    parser.add_argument("--documentos", action="store_true", help="baixa os PDFs das movimentações")
+    parser.add_argument("--diario", help="diário de execução para retomar a entrada interrompida (apagado ao fim da entrada)")
+    parser.add_argument("--metricas", help="grava as métricas em <caminho>.json e <caminho>.prom")
+    parser.add_argument("-q", "--silencioso", action="store_true", help="descarta o log do extrator")
+    args = parser.parse_args(argv)
+
+    if args.formato != "processo" and args.saida == "-":
+        parser.error(f"o formato {args.formato} precisa de um arquivo de saída (-o)")
+    if args.offline and args.sem_cache:
+        parser.error("--offline precisa do cache")
+
+    entrada = sys.stdin if args.entrada == "-" else open(args.entrada, encoding="utf-8", newline="")
+    destino = sys.stdout
+    if args.formato == "processo" and args.saida != "-":
+        destino = open(args.saida, "w", encoding="utf-8")
+    # O log do extrator usa print: sai da saída padrão para não misturar com o JSONL
+    log = open(os.devnull, "w") if args.silencioso else sys.stderr
+    try:
+        with contextlib.redirect_stdout(log):
+            gravados = asyncio.run(executar(args, entrada, destino))
+    except KeyboardInterrupt:
+        print("⏹️ Interrompido", file=sys.stderr)
+        return 130
+    except BrokenPipeError:
+        # Evita um segundo erro quando o Python descarregar a saída padrão ao sair
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    finally:
+        for arquivo in (entrada, destino):
+            if arquivo not in (sys.stdin, sys.stdout):
+                arquivo.close()
+        if log is not sys.stderr:
+            log.close()
+    if not args.silencioso:
+        print(f"✅ {gravados} processos gravados", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
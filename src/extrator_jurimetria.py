@@ -27,15 +27,46 @@ QUESTÕES DO PLANO DE ESTUDO:
 """
 
 import re
+import sys
 import time
+import zlib
+import hashlib
 import json
 import os
+import asyncio
+import socket
+import threading
+import unicodedata
+import operator
+from collections import Counter, defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import count, islice
+from urllib.parse import urlsplit
+from functools import lru_cache, reduce
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field
-from playwright.sync_api import sync_playwright, Page
+from typing import (Any, AsyncIterable, AsyncIterator, Callable, Dict, FrozenSet, Iterable, Iterator, List,
+                    Optional, Set, Tuple, Union)
+from dataclasses import dataclass, field, fields, replace
+from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page
+from playwright.async_api import (
+    async_playwright,
+    Browser as BrowserAsync,
+    BrowserContext as BrowserContextAsync,
+    Page as PageAsync,
+)
+import numpy as np
 import pandas as pd
 
+from busca_http import ClienteESAJ, Pesquisa, interpretar_pagina, links_documentos
+from cache_paginas import CachePaginas, PaginaCache
+from controle_taxa import ControladorTaxa, Disjuntor, atraso_backoff
+from diario_execucao import DiarioExecucao
+from fila_trabalho import FilaTrabalho, ItemFila
+from documentos import ColetorDocumentos
+from metricas import Metricas, perfilar
+from saidas import SaidaRelatorio, abrir_saida
+
 
 # =============================================================================
 # CONFIGURAÇÕES
@@ -48,20 +79,118 @@ class Config:
     URL_TJSP_2GRAU: str = "https://esaj.tjsp.jus.br/cposg/open.do"
     TIMEOUT_PAGINA: int = 30000
     TIMEOUT_ELEMENTO: int = 15000
-    DELAY_ENTRE_PROCESSOS: float = 3.0
-    DELAY_DIGITACAO: int = 50
+    DELAY_ENTRE_PROCESSOS: float = 3.0  # intervalo inicial entre o início de duas consultas (0 = sem limite)
+    TAXA_ADAPTATIVA: bool = True  # ajusta o intervalo pela latência e pelas falhas do portal (AIMD)
+    TAXA_MINIMA: float = 0.05  # consultas/s
+    TAXA_MAXIMA: float = 2.0  # consultas/s
+    LATENCIA_ALVO_S: float = 8.0  # consultas mais lentas reduzem a taxa
+    TENTATIVAS_POR_PROCESSO: int = 3  # tentativas imediatas de um processo com erro, com backoff
+    BACKOFF_BASE_S: float = 2.0
+    BACKOFF_MAX_S: float = 60.0
+    DISJUNTOR_FALHAS: int = 5  # falhas seguidas que pausam todas as consultas
+    DISJUNTOR_PAUSA_S: float = 60.0  # dobra a cada sonda que falha, até 15 min
+    DELAY_DIGITACAO: int = 50  # só com ESPERAS_FIXAS
+    NAVEGACAO: str = "direta"  # "direta" (URL de search.do) ou "formulario" (preenche open.do)
+    ESPERAS_FIXAS: bool = False  # formulário com pausas e digitação simulada (fallback antigo)
+    TAMANHO_POOL_CONTEXTOS: int = 2  # contextos ociosos mantidos pela sessão síncrona (criados sob demanda)
+    USOS_POR_CONTEXTO: int = 50
+    CONCORRENCIA: int = 4  # páginas consultando ao mesmo tempo em extrair_lote
+    BACKEND_CONSULTA: str = "auto"  # "auto" (HTTP e navegador se preciso), "http" ou "navegador"
+    CONSULTAR_2GRAU: bool = True  # busca recursos no cposg em paralelo à consulta do 1º grau
+    BAIXAR_DOCUMENTOS: bool = False  # PDFs das movimentações em DIR_PDFS, com texto na análise
+    CONCORRENCIA_DOWNLOADS: int = 4
+    LIMITE_BANDA_KBPS: float = 1024  # banda somada dos downloads (0 = sem limite)
+    MAX_DOCUMENTOS_POR_PROCESSO: int = 30
+    WORKERS_TEXTO: int = 0  # processos extraindo texto dos PDFs (0 = todos os núcleos)
     HEADLESS: bool = True
+    # Política de recursos do navegador: só o HTML e os scripts do formulário importam
+    BLOQUEAR_TIPOS: tuple = ("image", "media", "font", "stylesheet")  # tipos de recurso do Playwright
+    BLOQUEAR_URLS: tuple = (r"google-analytics\.com", r"googletagmanager\.com", r"doubleclick\.net",
+                            r"hotjar\.com", r"facebook\.(net|com)")  # regex
+    DOMINIOS_PERMITIDOS: tuple = ("esaj.tjsp.jus.br",)  # demais domínios são bloqueados
+    PERMITIR_URLS: tuple = ()  # regex sempre liberadas, acima de qualquer bloqueio
+    ARGS_NAVEGADOR: tuple = (
+        "--disable-blink-features=AutomationControlled", "--disable-extensions",
+        "--disable-background-networking", "--disable-component-update", "--disable-default-apps",
+        "--disable-sync", "--no-first-run", "--mute-audio", "--disable-features=Translate,MediaRouter",
+    )
     DIR_SAIDA: str = "/home/ubuntu/projeto_extracao/resultados"
     DIR_PDFS: str = "/home/ubuntu/projeto_extracao/resultados/pdfs"
+    DIR_CACHE: str = "/home/ubuntu/projeto_extracao/resultados/cache"
+    USAR_CACHE: bool = True
+    CACHE_TTL_HORAS: float = 24.0  # 0 = páginas nunca expiram
+    CACHE_MAX_MB: float = 2048
+    MODO_OFFLINE: bool = False  # reconstrói processos só a partir do cache, sem rede
+    WORKERS_ANALISE: int = 0  # processos na reanálise do cache (0 = todos os núcleos)
+    TAMANHO_LOTE_ANALISE: int = 64  # processos enviados a cada worker por vez
+    USAR_DIARIO: bool = False  # retoma lotes interrompidos; o diário é apagado quando o lote termina
+    ARQUIVO_DIARIO: str = "/home/ubuntu/projeto_extracao/resultados/diario_execucao.jsonl"
+    REPETIR_STATUS: tuple = ("Erro",)  # status do diário consultados de novo ao retomar
+    MAX_TENTATIVAS: int = 3  # tentativas por processo somando execuções (0 = sem limite)
+    LEASE_FILA_S: float = 300  # validade da concessão de um item da fila de trabalho, renovada enquanto roda
+    MAX_PAGINAS_PESQUISA: int = 0  # páginas de resultados lidas por pesquisa de descoberta (0 = todas)
+    FILA_DESCOBERTA: int = 100  # números descobertos à frente da extração (limita a paginação antecipada)
+    TEXTO_COMPLETO: str = "comprimido"  # após a análise: "manter", "comprimido" ou "descartar"
+    METRICAS: bool = True  # grava tempos por etapa e contadores ao fim de cada lote
+    ARQUIVO_METRICAS: str = "/home/ubuntu/projeto_extracao/resultados/metricas"  # sem extensão: .json e .prom
 
 
 # =============================================================================
 # ESTRUTURA DE DADOS
 # =============================================================================
 
-@dataclass
+class Movimentacoes:
+    """Movimentações de um processo em colunas paralelas
+    
+    Guarda datas e descrições em duas listas paralelas em vez de um
+    dicionário por movimentação. Só as datas são internadas: repetem-se
+    entre processos, enquanto as descrições quase nunca se repetem e
+    internadas ficariam na tabela de strings até o fim da execução. Itera,
+    indexa e aceita `append` no formato antigo,
+    `{"data": ..., "descricao": ...}`.
+    """
+    __slots__ = ("datas", "descricoes")
+    
+    def __init__(self, itens: Iterable[Dict] = ()):
+        self.datas: List[str] = []
+        self.descricoes: List[str] = []
+        for item in itens:
+            self.append(item)
+    
+    def append(self, item: Dict) -> None:
+        self.datas.append(sys.intern(item.get("data", "")))
+        self.descricoes.append(item.get("descricao", ""))
+    
+    def __len__(self) -> int:
+        return len(self.datas)
+    
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        return ({"data": d, "descricao": t} for d, t in zip(self.datas, self.descricoes))
+    
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [{"data": d, "descricao": t} for d, t in zip(self.datas[i], self.descricoes[i])]
+        return {"data": self.datas[i], "descricao": self.descricoes[i]}
+    
+    def __eq__(self, outro) -> bool:
+        if isinstance(outro, Movimentacoes):
+            return self.datas == outro.datas and self.descricoes == outro.descricoes
+        if isinstance(outro, list):
+            return list(self) == outro
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"Movimentacoes({list(self)!r})"
+
+
+@dataclass(slots=True)
 class Processo:
-    """Dados completos de um processo"""
+    """Dados completos de um processo
+    
+    `texto_completo` e `texto_documentos` podem ser guardados comprimidos
+    após a análise (ver `compactar`); use `texto()` e
+    `texto_dos_documentos()` para lê-los em qualquer caso.
+    """
     numero: str = ""
     classe: str = ""
     assunto: str = ""
@@ -78,8 +207,18 @@ class Processo:
     perito: str = ""
     
     # Movimentações
-    movimentacoes: List[Dict] = field(default_factory=list)
+    movimentacoes: Movimentacoes = field(default_factory=Movimentacoes)
     texto_completo: str = ""
+    texto_comprimido: bytes = b""
+    
+    # Recursos no 2º grau (cposg): numero, classe, situacao, orgao_julgador,
+    # relator e ultima_movimentacao
+    recursos: List[Dict] = field(default_factory=list)
+    
+    # Documentos das movimentações: URLs e texto extraído dos PDFs
+    documentos: List[str] = field(default_factory=list)
+    texto_documentos: str = ""
+    texto_documentos_comprimido: bytes = b""
     
     # Status
     status: str = "Pendente"
@@ -100,6 +239,486 @@ class Processo:
     q12_executar_garantias: str = ""
     q13_plano_rj: str = ""
     q14_agc_mediacao: str = ""
+    
+    def __post_init__(self):
+        if not isinstance(self.movimentacoes, Movimentacoes):
+            self.movimentacoes = Movimentacoes(self.movimentacoes)
+        self._internar()
+    
+    def _internar(self) -> None:
+        """Interna os campos categóricos, que se repetem entre processos"""
+        for nome in _CAMPOS_CATEGORICOS:
+            setattr(self, nome, sys.intern(getattr(self, nome)))
+    
+    def texto(self) -> str:
+        """Texto completo da página, descomprimido se preciso"""
+        if self.texto_comprimido:
+            return zlib.decompress(self.texto_comprimido).decode("utf-8")
+        return self.texto_completo
+    
+    def texto_dos_documentos(self) -> str:
+        """Texto extraído dos PDFs das movimentações, descomprimido se preciso"""
+        if self.texto_documentos_comprimido:
+            return zlib.decompress(self.texto_documentos_comprimido).decode("utf-8")
+        return self.texto_documentos
+    
+    def compactar(self, modo: str = "comprimido") -> "Processo":
+        """Reduz a memória do processo depois da análise
+        
+        `modo`: "manter" só interna os campos categóricos; "comprimido"
+        também comprime os textos da página e dos documentos (lidos de volta
+        por `texto()` e `texto_dos_documentos()`); "descartar" os apaga.
+        """
+        if modo not in ("manter", "comprimido", "descartar"):
+            raise ValueError(f"Modo de texto desconhecido: {modo!r}")
+        self._internar()
+        if modo == "comprimido":
+            if self.texto_completo:
+                self.texto_comprimido = zlib.compress(self.texto_completo.encode("utf-8"), 6)
+                self.texto_completo = ""
+            if self.texto_documentos:
+                self.texto_documentos_comprimido = zlib.compress(self.texto_documentos.encode("utf-8"), 6)
+                self.texto_documentos = ""
+        elif modo == "descartar":
+            self.texto_completo = ""
+            self.texto_comprimido = b""
+            self.texto_documentos = ""
+            self.texto_documentos_comprimido = b""
+        return self
+
+
+# Campos com poucos valores distintos, internados para não repetir as strings
+_CAMPOS_CATEGORICOS = [
+    "classe", "assunto", "foro", "vara", "juiz", "status",
+    *(f.name for f in fields(Processo) if f.name[:1] == "q" and f.name[1:3].isdigit()),
+]
+
+
+_ORDEM_CAMPOS = tuple(f.name for f in fields(Processo))
+_CAMPOS_PROCESSO = frozenset(_ORDEM_CAMPOS)
+
+
+def processo_para_dict(p: Processo, manter_texto: bool = True) -> Dict[str, Any]:
+    """Processo como dicionário serializável em JSON (texto descomprimido)"""
+    dados = {nome: getattr(p, nome) for nome in _ORDEM_CAMPOS
+             if nome not in ("texto_comprimido", "texto_documentos_comprimido")}
+    dados["movimentacoes"] = list(p.movimentacoes)
+    if manter_texto:
+        dados["texto_completo"] = p.texto()
+        dados["texto_documentos"] = p.texto_dos_documentos()
+    else:
+        dados.pop("texto_completo")
+        dados.pop("texto_documentos")
+    return dados
+
+
+def processo_de_dict(dados: Dict[str, Any]) -> Processo:
+    """Reconstrói o processo de `processo_para_dict` (chaves extras são ignoradas)"""
+    return Processo(**{k: v for k, v in dados.items() if k in _CAMPOS_PROCESSO})
+
+
+# Colunas do relatório, compartilhadas por gerar_relatorio e pelas saídas em fluxo
+COLUNAS_RELATORIO = [
+    "Processo", "Status", "Classe", "Assunto", "Foro", "Vara", "Juiz", "Requerente",
+    "Advogados", "Interessados", "Credores", "Perito/Administrador",
+    "Q1 - Bancos/Veículos", "Q2 - Pedidos", "Q3 - Garantias Extraconcursais",
+    "Q4 - Essencialidade", "Q5 - Teses", "Q6 - Entendimento Tribunal", "Q7 - Escritório",
+    "Q8 - Crédito Extraconcursal", "Q9 - Recursos", "Q10 - Bens vs Busca/Apreensão",
+    "Q11 - Stay Period", "Q12 - Executar Garantias", "Q13 - Plano RJ",
+    "Q14 - AGC/Mediação", "Erro"
+]
+
+
+def linha_relatorio(p: Processo) -> Dict[str, str]:
+    """Linha do relatório de um processo (colunas de `COLUNAS_RELATORIO`)"""
+    return {
+        "Processo": p.numero,
+        "Status": p.status,
+        "Classe": p.classe,
+        "Assunto": p.assunto,
+        "Foro": p.foro,
+        "Vara": p.vara,
+        "Juiz": p.juiz,
+        "Requerente": p.requerente,
+        "Advogados": ", ".join(p.advogados_requerente[:2]),
+        "Interessados": ", ".join(p.interessados[:2]),
+        "Credores": ", ".join(p.credores[:2]),
+        "Perito/Administrador": p.perito,
+        "Q1 - Bancos/Veículos": p.q01_bancos_veiculos,
+        "Q2 - Pedidos": p.q02_pedidos,
+        "Q3 - Garantias Extraconcursais": p.q03_garantias_extraconcursais,
+        "Q4 - Essencialidade": p.q04_essencialidade,
+        "Q5 - Teses": p.q05_teses,
+        "Q6 - Entendimento Tribunal": p.q06_entendimento,
+        "Q7 - Escritório": p.q07_escritorio,
+        "Q8 - Crédito Extraconcursal": p.q08_credito_extraconcursal,
+        "Q9 - Recursos": p.q09_recursos,
+        "Q10 - Bens vs Busca/Apreensão": p.q10_bens_busca,
+        "Q11 - Stay Period": p.q11_stay_period,
+        "Q12 - Executar Garantias": p.q12_executar_garantias,
+        "Q13 - Plano RJ": p.q13_plano_rj,
+        "Q14 - AGC/Mediação": p.q14_agc_mediacao,
+        "Erro": p.erro
+    }
+
+
+# =============================================================================
+# BUSCA DE PALAVRAS-CHAVE
+# =============================================================================
+
+_RE_DIACRITICOS = re.compile("[\u0300-\u036f]")
+# Acentos do português: removidos com str.replace, bem mais rápido que o regex
+_DIACRITICOS_COMUNS = ("\u0301", "\u0303", "\u0327", "\u0302", "\u0300", "\u0308")
+
+
+@lru_cache(maxsize=1024)
+def _termo_normalizado(termo: str) -> str:
+    return normalizar_busca(termo)
+
+
+def normalizar_busca(texto: str) -> str:
+    """Minúsculas e sem acentos: forma usada em todas as buscas por termos"""
+    texto = unicodedata.normalize("NFKD", texto.lower())
+    for marca in _DIACRITICOS_COMUNS:
+        texto = texto.replace(marca, "")
+    try:
+        # Sem caracteres acima de U+00FF não resta marca combinante (U+0300-U+036F);
+        # a codificação é uma cópia em C, bem mais barata que varrer com o regex
+        texto.encode("latin-1")
+    except UnicodeEncodeError:
+        texto = _RE_DIACRITICOS.sub("", texto)
+    return texto
+
+
+class BuscadorTermos:
+    """Encontra quais termos de uma lista ocorrem no texto, em uma visita por texto
+    
+    O resultado é exatamente o conjunto de termos `t` para os quais
+    `t in texto`. Cada termo é procurado pela busca de substrings do próprio
+    `str` (em C, sem a interpretação por posição de uma expressão regular,
+    que nos textos longos dos processos chegava a ser 3x mais lenta mesmo
+    com os termos em árvore de prefixos); os termos contidos em um termo
+    encontrado entram por fechamento pré-calculado, sem nova busca.
+    
+    O texto deve chegar já normalizado por `normalizar_busca`.
+    """
+    
+    def __init__(self, termos: Iterable[str]):
+        self.termos: FrozenSet[str] = frozenset(_termo_normalizado(t) for t in termos)
+        # Termos contidos em cada termo (incluindo ele mesmo)
+        self._contidos: Dict[str, FrozenSet[str]] = {
+            t: frozenset(u for u in self.termos if u in t) for t in self.termos
+        }
+        # Mais longos primeiro: um acerto dispensa a busca dos termos contidos nele
+        self._ordem: Tuple[str, ...] = tuple(sorted(self.termos, key=lambda t: (-len(t), t)))
+    
+    def buscar(self, texto: str) -> Set[str]:
+        """Conjunto dos termos (normalizados) presentes no texto"""
+        encontrados: Set[str] = set()
+        for termo in self._ordem:
+            if termo not in encontrados and termo in texto:
+                encontrados |= self._contidos[termo]
+        return encontrados
+
+
+def _escolher(opcoes: List[tuple], padrao: Any) -> Any:
+    """Primeira resposta cuja condição é verdadeira (escalar ou vetorizado)"""
+    if all(isinstance(cond, (bool, np.bool_)) for cond, _ in opcoes):
+        for cond, valor in opcoes:
+            if cond:
+                return valor
+        return padrao
+    return np.select([np.asarray(cond, dtype=bool) for cond, _ in opcoes],
+                     [np.asarray(valor, dtype=object) for _, valor in opcoes],
+                     default=padrao)
+
+
+def _juntar(itens: List[tuple], padrao: str) -> Any:
+    """Rótulos com condição verdadeira separados por vírgula (escalar ou vetorizado)"""
+    if all(isinstance(cond, (bool, np.bool_)) for cond, _ in itens):
+        rotulos = [rotulo for cond, rotulo in itens if cond]
+        return ", ".join(rotulos) if rotulos else padrao
+    juntos = reduce(operator.add, (np.where(np.asarray(cond, dtype=bool), ", " + rotulo, "").astype(object)
+                                   for cond, rotulo in itens))
+    juntos = pd.Series(juntos).str[2:]
+    return np.where(juntos == "", padrao, juntos)
+
+
+# =============================================================================
+# LINHA DO TEMPO DAS MOVIMENTAÇÕES
+# =============================================================================
+
+# Códigos dos eventos reconhecidos nas movimentações (uma movimentação pode ter vários)
+EVENTO_DEFERIMENTO = 1  # deferido o processamento da recuperação judicial
+EVENTO_PRORROGACAO = 2  # prorrogação do stay period concedida (não o simples pedido)
+EVENTO_PLANO_APRESENTADO = 3
+EVENTO_PLANO_APROVADO = 4
+EVENTO_PLANO_HOMOLOGADO = 5
+EVENTO_AGC = 6
+EVENTO_MEDIACAO = 7
+EVENTO_ENCERRAMENTO = 8
+EVENTO_FALENCIA = 9
+
+NOMES_EVENTOS = {
+    EVENTO_DEFERIMENTO: "deferimento", EVENTO_PRORROGACAO: "prorrogacao",
+    EVENTO_PLANO_APRESENTADO: "plano_apresentado", EVENTO_PLANO_APROVADO: "plano_aprovado",
+    EVENTO_PLANO_HOMOLOGADO: "plano_homologado", EVENTO_AGC: "agc", EVENTO_MEDIACAO: "mediacao",
+    EVENTO_ENCERRAMENTO: "encerramento", EVENTO_FALENCIA: "falencia",
+}
+
+# Stay period: 180 dias contados do deferimento do processamento (art. 6º, § 4º, da Lei 11.101/2005)
+STAY_PERIOD_DIAS = 180
+
+# Prazo para apresentar o plano: não é apresentação do plano nem prorrogação do stay period
+_RE_PRAZO_PLANO = re.compile(r"prazo (?:para|de) (?:a )?(?:apresentacao|juntada) do plano")
+
+# Padrões sobre a descrição normalizada (`normalizar_busca`): a movimentação recebe todos os
+# eventos cujo padrão ocorre, desde que ocorra o contexto e não ocorra a exclusão (se houver)
+_PADROES_EVENTOS = [
+    (EVENTO_PLANO_HOMOLOGADO,
+     re.compile(r"homolog\w*.{0,40}\bplano\b|\bplano\b.{0,60}homologad|conce(?:did[oa]|ssao d[ao]) (?:a )?recuperacao"),
+     None, None),
+    (EVENTO_PLANO_APROVADO, re.compile(r"aprova\w*.{0,40}\bplano\b|\bplano\b.{0,60}aprovad"), None, None),
+    (EVENTO_PLANO_APRESENTADO,
+     re.compile(r"(?:apresenta|junta|protocol)\w*.{0,40}\bplano\b|\bplano\b.{0,60}apresentad"), None, _RE_PRAZO_PLANO),
+    (EVENTO_PRORROGACAO,
+     re.compile(r"\bprorrogo\b|prorrogad[oa]|\b(?:defiro|deferid[oa]|concedo|concedid[oa])\b.{0,60}prorrogac"),
+     re.compile(r"stay|suspens|blindagem|prazo|art\.? ?6"), _RE_PRAZO_PLANO),
+    (EVENTO_DEFERIMENTO, re.compile(r"\b(?:defiro|deferid[oa])\b.{0,40}processamento|processamento.{0,60}\bdeferid"),
+     None, None),
+    (EVENTO_FALENCIA, re.compile(r"(?:decret|convol)\w*.{0,40}falencia|falencia.{0,30}decretad"), None, None),
+    (EVENTO_ENCERRAMENTO, re.compile(r"encerr\w*.{0,40}(?:recuperacao|processo|feito)"), None, None),
+    (EVENTO_AGC, re.compile(r"assembleia"), None, None),
+    (EVENTO_MEDIACAO, re.compile(r"mediacao"), None, None),
+]
+# Negação na mesma oração, antes do termo ("não homologado o plano", "indeferida a
+# homologação do plano") ou dentro dele ("plano de recuperação rejeitado, não aprovado")
+_RE_NEGACAO = re.compile(r"\bnao\b|\bnego\b|\bnegad[oa]\b|indefer|indefir")
+_RE_NEGACAO_TERMO = re.compile(r"\bnao\b|\bnego\b|\bnegad[oa]\b|indefer|indefir|rejeit|desaprov")
+_RE_FIM_ORACAO = re.compile(r"[.;:!?]")
+_JANELA_NEGACAO = 30
+_RE_DIAS = re.compile(r"(\d{2,3}) ?dias")
+
+# Marcos de cada processo: data do primeiro evento de cada grupo
+MARCOS_EVENTOS = {
+    "deferimento": (EVENTO_DEFERIMENTO,),
+    "encerramento": (EVENTO_ENCERRAMENTO, EVENTO_FALENCIA),
+    "plano_apresentado": (EVENTO_PLANO_APRESENTADO,),
+    "plano_aprovado": (EVENTO_PLANO_APROVADO,),
+    "plano_homologado": (EVENTO_PLANO_HOMOLOGADO,),
+    "agc": (EVENTO_AGC,),
+    "mediacao": (EVENTO_MEDIACAO,),
+}
+# Colunas de marcos exigidas por `Analisador.analisar_df`; `eventos` e `negados` são máscaras
+# de bits (`mascara_eventos`) dos eventos de todas as movimentações, datadas ou não
+COLUNAS_MARCOS = [*MARCOS_EVENTOS, "prorrogacao_dias", "vencimento_stay", "datado", "eventos", "negados"]
+
+_NAT = np.datetime64("NaT", "D")
+
+
+@lru_cache(maxsize=64)
+def mascara_eventos(eventos: FrozenSet[int]) -> int:
+    """Máscara de bits de um conjunto de códigos `EVENTO_*`"""
+    return reduce(operator.or_, (1 << codigo for codigo in eventos), 0)
+
+
+_MASCARA_PLANO = mascara_eventos(frozenset({EVENTO_PLANO_APRESENTADO, EVENTO_PLANO_APROVADO,
+                                            EVENTO_PLANO_HOMOLOGADO}))
+_MASCARA_AGC_MEDIACAO = mascara_eventos(frozenset({EVENTO_AGC, EVENTO_MEDIACAO}))
+
+
+def _afirmado(padrao: re.Pattern, texto: str) -> bool:
+    """O padrão ocorre ao menos uma vez sem negação na mesma oração"""
+    for achado in padrao.finditer(texto):
+        antes = _RE_FIM_ORACAO.split(texto[max(0, achado.start() - _JANELA_NEGACAO):achado.start()])[-1]
+        if not _RE_NEGACAO.search(antes) and not _RE_NEGACAO_TERMO.search(achado.group()):
+            return True
+    return False
+
+
+@lru_cache(maxsize=65536)
+def classificar_movimentacao(descricao: str) -> Tuple[FrozenSet[int], FrozenSet[int], int]:
+    """Eventos da movimentação, eventos só negados ou referidos nela e os dias de prorrogação
+    
+    "Homologado o plano aprovado pela assembleia" tem três eventos (plano
+    homologado, plano aprovado e AGC); em "Não homologado o plano" e em
+    "Prorrogado o prazo para apresentação do plano" os eventos ficam entre
+    os negados, que só servem para não cair na busca por termos.
+    """
+    texto = normalizar_busca(descricao)
+    eventos, negados = set(), set()
+    for codigo, padrao, contexto, exclusao in _PADROES_EVENTOS:
+        if not padrao.search(texto) or (contexto is not None and not contexto.search(texto)):
+            continue
+        if exclusao is None or not exclusao.search(texto):
+            (eventos if _afirmado(padrao, texto) else negados).add(codigo)
+        else:
+            negados.add(codigo)
+    dias = 0
+    if EVENTO_PRORROGACAO in eventos:
+        achado = _RE_DIAS.search(texto)
+        dias = int(achado.group(1)) if achado else STAY_PERIOD_DIAS
+    return frozenset(eventos), frozenset(negados), dias
+
+
+@lru_cache(maxsize=8192)
+def data_movimentacao(data: str) -> Optional[np.datetime64]:
+    """"dd/mm/aaaa" como datetime64[D] (None se não for uma data válida)"""
+    if len(data) < 10 or data[2] != "/" or data[5] != "/":
+        return None
+    try:
+        return np.datetime64(f"{data[6:10]}-{data[3:5]}-{data[:2]}", "D")
+    except ValueError:
+        return None
+
+
+def _completar_marcos(marcos: Dict[str, Any]) -> Dict[str, Any]:
+    """Acrescenta o vencimento do stay period: 180 dias do deferimento mais as prorrogações"""
+    dias = np.asarray(STAY_PERIOD_DIAS + marcos["prorrogacao_dias"]).astype("timedelta64[D]")
+    marcos["vencimento_stay"] = marcos["deferimento"] + dias
+    return marcos
+
+
+def marcos_processo(movimentacoes: Movimentacoes) -> Dict[str, Any]:
+    """Marcos de um processo (escalares), iguais aos de `LinhaTempo.marcos`"""
+    primeiros: Dict[int, np.datetime64] = {}
+    prorrogacoes: Dict[np.datetime64, int] = {}
+    eventos = negados = 0
+    datado = False
+    for data, descricao in zip(movimentacoes.datas, movimentacoes.descricoes):
+        achados, recusados, dias = classificar_movimentacao(descricao)
+        eventos |= mascara_eventos(achados)
+        negados |= mascara_eventos(recusados)
+        dia = data_movimentacao(data)
+        if dia is None:
+            continue
+        datado = True
+        for codigo in achados:
+            if codigo not in primeiros or dia < primeiros[codigo]:
+                primeiros[codigo] = dia
+        if EVENTO_PRORROGACAO in achados:
+            # A mesma prorrogação costuma aparecer em várias movimentações do mesmo dia
+            prorrogacoes[dia] = max(dias, prorrogacoes.get(dia, 0))
+    marcos: Dict[str, Any] = {}
+    for nome, codigos in MARCOS_EVENTOS.items():
+        datas = [primeiros[c] for c in codigos if c in primeiros]
+        marcos[nome] = min(datas) if datas else _NAT
+    marcos["prorrogacao_dias"] = sum(prorrogacoes.values())
+    marcos["datado"] = np.bool_(datado)
+    marcos["eventos"] = eventos
+    marcos["negados"] = negados
+    return _completar_marcos(marcos)
+
+
+def _referencia(referencia: Any = None) -> np.datetime64:
+    return np.datetime64(referencia if referencia is not None else "today", "D")
+
+
+class LinhaTempo:
+    """Movimentações de um corpus inteiro em colunas numpy tipadas
+    
+    Uma posição por movimentação: `processo` (índice em `numeros`), `data`
+    (datetime64[D], NaT se inválida), `evento` e `negado` (máscaras de bits
+    dos eventos da movimentação, ver `mascara_eventos`) e `dias` (dias de
+    prorrogação concedidos). Datas e descrições repetidas entre processos
+    são convertidas e classificadas uma única vez; os marcos e prazos de
+    todos os processos são calculados de uma só vez.
+    """
+    __slots__ = ("numeros", "processo", "data", "evento", "negado", "dias")
+    
+    def __init__(self, numeros: List[str], processo: np.ndarray, data: np.ndarray,
+                 evento: np.ndarray, negado: np.ndarray, dias: np.ndarray):
+        self.numeros = numeros
+        self.processo = processo
+        self.data = data
+        self.evento = evento
+        self.negado = negado
+        self.dias = dias
+    
+    def __len__(self) -> int:
+        return len(self.evento)
+    
+    @classmethod
+    def de_processos(cls, processos: Iterable[Processo]) -> "LinhaTempo":
+        numeros, tamanhos, datas, descricoes = [], [], [], []
+        for proc in processos:
+            numeros.append(proc.numero)
+            tamanhos.append(len(proc.movimentacoes))
+            datas.extend(proc.movimentacoes.datas)
+            descricoes.extend(proc.movimentacoes.descricoes)
+        processo = np.repeat(np.arange(len(numeros), dtype=np.int32), tamanhos)
+        
+        codigos, unicas = pd.factorize(np.asarray(datas, dtype=object))
+        convertidas = [data_movimentacao(d) for d in unicas]
+        data = np.array([_NAT if d is None else d for d in convertidas], dtype="datetime64[D]")[codigos]
+        
+        codigos, unicas = pd.factorize(np.asarray(descricoes, dtype=object))
+        classificadas = [classificar_movimentacao(d) for d in unicas]
+        evento = np.array([mascara_eventos(e) for e, _, _ in classificadas], dtype=np.int16)[codigos]
+        negado = np.array([mascara_eventos(n) for _, n, _ in classificadas], dtype=np.int16)[codigos]
+        dias = np.array([d for _, _, d in classificadas], dtype=np.int16)[codigos]
+        return cls(numeros, processo, data, evento, negado, dias)
+    
+    def _com(self, *eventos: int) -> np.ndarray:
+        """Movimentações com algum dos `eventos`"""
+        return (self.evento & mascara_eventos(frozenset(eventos))) != 0
+    
+    def primeira(self, *eventos: int) -> np.ndarray:
+        """Data do primeiro evento dentre `eventos` em cada processo (NaT se não houver)"""
+        mascara = self._com(*eventos) & ~np.isnat(self.data)
+        vazio = np.iinfo(np.int64).max
+        primeiras = np.full(len(self.numeros), vazio, dtype=np.int64)
+        np.minimum.at(primeiras, self.processo[mascara], self.data[mascara].astype(np.int64))
+        datas = primeiras.astype("datetime64[D]")
+        datas[primeiras == vazio] = _NAT
+        return datas
+    
+    def marcos(self) -> Dict[str, np.ndarray]:
+        """Marcos de todos os processos, um vetor por marco (ver `MARCOS_EVENTOS`)"""
+        marcos: Dict[str, Any] = {nome: self.primeira(*codigos) for nome, codigos in MARCOS_EVENTOS.items()}
+        mascara = self._com(EVENTO_PRORROGACAO) & ~np.isnat(self.data)
+        por_dia = (pd.DataFrame({"processo": self.processo[mascara], "data": self.data[mascara],
+                                 "dias": self.dias[mascara]})
+                   .groupby(["processo", "data"])["dias"].max())
+        prorrogacao = np.zeros(len(self.numeros), dtype=np.int64)
+        np.add.at(prorrogacao, por_dia.index.get_level_values(0).to_numpy(), por_dia.to_numpy())
+        marcos["prorrogacao_dias"] = prorrogacao
+        marcos["datado"] = np.bincount(self.processo[~np.isnat(self.data)], minlength=len(self.numeros)) > 0
+        for nome, bits in (("eventos", self.evento), ("negados", self.negado)):
+            marcos[nome] = np.zeros(len(self.numeros), dtype=np.int64)
+            com_bits = bits != 0
+            np.bitwise_or.at(marcos[nome], self.processo[com_bits], bits[com_bits])
+        return _completar_marcos(marcos)
+    
+    def prazos(self, referencia: Any = None) -> pd.DataFrame:
+        """Marcos e durações de cada processo em dias, na data de `referencia` (padrão: hoje)
+        
+        - dias_desde_deferimento: da decisão que deferiu o processamento;
+        - vencimento_stay / dias_ate_vencimento_stay: 180 dias do deferimento
+          mais as prorrogações concedidas (negativo se já venceu);
+        - stay_vigente: deferido, não encerrado e dentro do prazo;
+        - dias_ate_aprovacao_plano: do deferimento à aprovação (ou, sem ela,
+          à homologação) do plano.
+        """
+        ref = _referencia(referencia)
+        m = self.marcos()
+        um_dia = np.timedelta64(1, "D")
+        aprovacao = np.where(np.isnat(m["plano_aprovado"]), m["plano_homologado"], m["plano_aprovado"])
+        prazos = pd.DataFrame({nome: m[nome] for nome in MARCOS_EVENTOS}, index=pd.Index(self.numeros, name="numero"))
+        prazos["prorrogacao_dias"] = m["prorrogacao_dias"]
+        prazos["vencimento_stay"] = m["vencimento_stay"]
+        prazos["dias_desde_deferimento"] = (ref - m["deferimento"]) / um_dia
+        prazos["dias_ate_vencimento_stay"] = (m["vencimento_stay"] - ref) / um_dia
+        prazos["stay_vigente"] = _stay_vigente(m, ref)
+        prazos["dias_ate_aprovacao_plano"] = (aprovacao - m["deferimento"]) / um_dia
+        return prazos
+
+
+def _stay_vigente(marcos: Dict[str, Any], ref: np.datetime64) -> Any:
+    """Deferido até `ref`, sem encerramento até `ref` e antes do vencimento (escalar ou vetorizado)"""
+    # Comparações com NaT são sempre falsas
+    return (~(marcos["encerramento"] <= ref) & (marcos["deferimento"] <= ref)
+            & (ref <= marcos["vencimento_stay"]))
 
 
 # =============================================================================
@@ -132,389 +751,1857 @@ class Analisador:
         "stay period", "suspensão", "180 dias", "art. 6", "blindagem"
     ]
     
-    def analisar(self, proc: Processo) -> Processo:
-        """Analisa o processo e preenche as 14 questões"""
-        texto = proc.texto_completo.lower()
-        movs = " ".join([m.get("descricao", "") for m in proc.movimentacoes]).lower()
-        partes = f"{proc.requerente} {' '.join(proc.interessados)} {' '.join(proc.credores)}".lower()
+    # Termos procurados no texto completo, além das listas acima
+    TERMOS_TEXTO = [
+        "suspensão", "essencial", "extraconcursal", "reconhec", "busca e apreensão"
+    ]
+    
+    # Classes de recurso e situações de recurso ainda em curso no 2º grau
+    RECURSOS_2GRAU = [
+        "agravo", "apelação", "embargos", "recurso", "mandado de segurança", "reclamação", "remessa"
+    ]
+    
+    SITUACOES_PENDENTES = ["em andamento", "suspenso", "sobrestado", "aguardando"]
+    
+    # Termos procurados nas descrições das movimentações
+    TERMOS_MOVIMENTACOES = [
+        "deferido", "deferida", "indeferido", "indeferida", "essencial",
+        "agravo", "apelação", "recurso", "prorrogação", "prazo", "processamento",
+        "encerr", "falência", "homologação", "aprovação", "apresentação", "plano",
+        "assembleia", "mediação"
+    ]
+    
+    def __init__(self, referencia: Any = None):
+        # Data em que o stay period é avaliado (None = hoje, a cada análise)
+        self.referencia = referencia
+        self._buscadores = {
+            "texto": BuscadorTermos(self.BANCOS + self.VEICULOS + self.ESSENCIALIDADE
+                                    + self.GARANTIAS + self.STAY + self.TERMOS_TEXTO),
+            "movs": BuscadorTermos(self.TERMOS_MOVIMENTACOES),
+            "partes": BuscadorTermos(self.BANCOS + self.VEICULOS),
+            "classe": BuscadorTermos(["tutela"]),
+            "assunto": BuscadorTermos(["recuperação"]),
+            "recursos": BuscadorTermos(self.RECURSOS_2GRAU + self.SITUACOES_PENDENTES),
+        }
+    
+    # Campos de texto pesquisados e colunas esperadas por `analisar_df`
+    CAMPOS = ["texto", "movs", "partes", "classe", "assunto", "recursos"]
+    
+    @staticmethod
+    def campos_texto(proc: Processo) -> Dict[str, str]:
+        """Textos do processo em que os termos são procurados"""
+        return {
+            "texto": f"{proc.texto()}\n{proc.texto_dos_documentos()}" if proc.documentos else proc.texto(),
+            "movs": " ".join(proc.movimentacoes.descricoes),
+            "partes": f"{proc.requerente} {' '.join(proc.interessados)} {' '.join(proc.credores)}",
+            "classe": proc.classe,
+            "assunto": proc.assunto,
+            "recursos": "; ".join(f"{r.get('classe', '')} ({r.get('situacao', '')})" for r in proc.recursos),
+        }
+    
+    def ocorrencias(self, proc: Processo) -> Dict[str, Set[str]]:
+        """Termos encontrados em cada campo do processo (uma passada por campo)"""
+        return {campo: self._buscadores[campo].buscar(normalizar_busca(valor))
+                for campo, valor in self.campos_texto(proc).items()}
+    
+    def _responder(self, tem: Callable[[str, str], Any], advogado: Any,
+                   marcos: Dict[str, Any]) -> Dict[str, Any]:
+        """Regras das 14 questões
+        
+        Escritas uma única vez para os dois caminhos: com `tem` devolvendo
+        bool e `marcos` escalares (um processo, em `analisar`) ou Series
+        booleanas e vetores de datas (um corpus, em `analisar_df`). Por isso
+        as condições usam `|`/`&` e as escolhas passam por
+        `_escolher`/`_juntar`. A questão 11 usa as datas da linha do tempo
+        (os termos só decidem quando o processo não tem movimentações
+        datadas); as questões 13 e 14 usam os eventos das movimentações, e os
+        termos decidem quando nenhum evento do plano (ou de AGC e mediação)
+        foi reconhecido, nem mesmo negado.
+        """
+        def algum(campo: str, termos: List[str]) -> Any:
+            return reduce(operator.or_, (tem(campo, t) for t in termos))
+        
+        tem_essencialidade = algum("texto", self.ESSENCIALIDADE)
+        tem_garantias = algum("texto", self.GARANTIAS)
+        r = {}
         
         # Q1: Bancos + Veículos
-        tem_banco = any(b in partes or b in texto for b in self.BANCOS)
-        tem_veiculo = any(v in partes or v in texto for v in self.VEICULOS)
-        
-        if tem_banco and tem_veiculo:
-            proc.q01_bancos_veiculos = "SIM - Bancos E Veículos"
-        elif tem_banco:
-            proc.q01_bancos_veiculos = "Apenas Bancos"
-        elif tem_veiculo:
-            proc.q01_bancos_veiculos = "Apenas Veículos/Equipamentos"
-        else:
-            proc.q01_bancos_veiculos = "Não identificado"
+        tem_banco = algum("partes", self.BANCOS) | algum("texto", self.BANCOS)
+        tem_veiculo = algum("partes", self.VEICULOS) | algum("texto", self.VEICULOS)
+        r["q01_bancos_veiculos"] = _escolher([
+            (tem_banco & tem_veiculo, "SIM - Bancos E Veículos"),
+            (tem_banco, "Apenas Bancos"),
+            (tem_veiculo, "Apenas Veículos/Equipamentos"),
+        ], "Não identificado")
         
         # Q2: Pedidos
-        pedidos = []
-        if "tutela" in proc.classe.lower():
-            pedidos.append("Tutela Cautelar")
-        if "recuperação" in proc.assunto.lower():
-            pedidos.append("Recuperação Judicial")
-        if "suspensão" in texto:
-            pedidos.append("Suspensão de execuções")
-        if "essencial" in texto:
-            pedidos.append("Essencialidade de bens")
-        proc.q02_pedidos = ", ".join(pedidos) if pedidos else "Verificar petição inicial"
+        r["q02_pedidos"] = _juntar([
+            (tem("classe", "tutela"), "Tutela Cautelar"),
+            (tem("assunto", "recuperação"), "Recuperação Judicial"),
+            (tem("texto", "suspensão"), "Suspensão de execuções"),
+            (tem("texto", "essencial"), "Essencialidade de bens"),
+        ], "Verificar petição inicial")
         
         # Q3: Garantias extraconcursais
-        proc.q03_garantias_extraconcursais = "SIM" if any(g in texto for g in self.GARANTIAS) else "Não identificado"
+        r["q03_garantias_extraconcursais"] = _escolher([(tem_garantias, "SIM")], "Não identificado")
         
         # Q4: Essencialidade
-        proc.q04_essencialidade = "SIM" if any(e in texto for e in self.ESSENCIALIDADE) else "Não identificado"
+        r["q04_essencialidade"] = _escolher([(tem_essencialidade, "SIM")], "Não identificado")
         
         # Q5: Teses
-        teses = []
-        if any(e in texto for e in self.ESSENCIALIDADE):
-            teses.append("Essencialidade de bens")
-        if any(g in texto for g in self.GARANTIAS):
-            teses.append("Crédito extraconcursal")
-        if any(s in texto for s in self.STAY):
-            teses.append("Stay period")
-        proc.q05_teses = ", ".join(teses) if teses else "Verificar decisões"
+        r["q05_teses"] = _juntar([
+            (tem_essencialidade, "Essencialidade de bens"),
+            (tem_garantias, "Crédito extraconcursal"),
+            (algum("texto", self.STAY), "Stay period"),
+        ], "Verificar decisões")
         
         # Q6: Entendimento tribunal
-        if "deferido" in movs or "deferida" in movs:
-            if "essencial" in movs:
-                proc.q06_entendimento = "Favorável à empresa"
-            else:
-                proc.q06_entendimento = "Decisão deferida - verificar teor"
-        elif "indeferido" in movs or "indeferida" in movs:
-            proc.q06_entendimento = "Desfavorável à empresa"
-        else:
-            proc.q06_entendimento = "Aguardando decisão"
+        deferido = tem("movs", "deferido") | tem("movs", "deferida")
+        r["q06_entendimento"] = _escolher([
+            (deferido & tem("movs", "essencial"), "Favorável à empresa"),
+            (deferido, "Decisão deferida - verificar teor"),
+            (tem("movs", "indeferido") | tem("movs", "indeferida"), "Desfavorável à empresa"),
+        ], "Aguardando decisão")
         
         # Q7: Escritório
-        if proc.advogados_requerente:
-            proc.q07_escritorio = proc.advogados_requerente[0]
-        else:
-            proc.q07_escritorio = "Não identificado"
+        r["q07_escritorio"] = _escolher([(advogado != "", advogado)], "Não identificado")
         
         # Q8: Crédito extraconcursal reconhecido
-        if "extraconcursal" in texto and "reconhec" in texto:
-            proc.q08_credito_extraconcursal = "SIM"
-        elif "extraconcursal" in texto:
-            proc.q08_credito_extraconcursal = "Em discussão"
-        else:
-            proc.q08_credito_extraconcursal = "Não identificado"
+        r["q08_credito_extraconcursal"] = _escolher([
+            (tem("texto", "extraconcursal") & tem("texto", "reconhec"), "SIM"),
+            (tem("texto", "extraconcursal"), "Em discussão"),
+        ], "Não identificado")
         
-        # Q9: Recursos
-        if "agravo" in movs or "apelação" in movs or "recurso" in movs:
-            proc.q09_recursos = "SIM - Verificar tipo"
-        else:
-            proc.q09_recursos = "Não identificado"
+        # Q9: Recursos (no 2º grau quando consultado; senão, menções nas movimentações)
+        recurso_2grau = algum("recursos", self.RECURSOS_2GRAU)
+        r["q09_recursos"] = _escolher([
+            (recurso_2grau & algum("recursos", self.SITUACOES_PENDENTES), "SIM - Recurso pendente no TJSP"),
+            (recurso_2grau, "Recursos julgados no TJSP"),
+            (tem("movs", "agravo") | tem("movs", "apelação") | tem("movs", "recurso"), "SIM - Verificar tipo"),
+        ], "Não identificado")
         
         # Q10: Bens essenciais vs busca/apreensão
-        if "busca e apreensão" in texto and any(e in texto for e in self.ESSENCIALIDADE):
-            proc.q10_bens_busca = "Conflito identificado"
-        elif "busca e apreensão" in texto:
-            proc.q10_bens_busca = "Há pedido de busca/apreensão"
-        else:
-            proc.q10_bens_busca = "Não identificado"
-        
-        # Q11: Stay period
-        if "prorrogação" in movs and "prazo" in movs:
-            proc.q11_stay_period = "Prorrogado"
-        elif "processamento" in movs and "deferido" in movs:
-            proc.q11_stay_period = "Ativo"
-        elif "encerr" in movs or "falência" in movs:
-            proc.q11_stay_period = "Encerrado"
-        else:
-            proc.q11_stay_period = "Verificar manualmente"
+        r["q10_bens_busca"] = _escolher([
+            (tem("texto", "busca e apreensão") & tem_essencialidade, "Conflito identificado"),
+            (tem("texto", "busca e apreensão"), "Há pedido de busca/apreensão"),
+        ], "Não identificado")
         
-        # Q12: Executar garantias
-        if proc.q11_stay_period in ["Ativo", "Prorrogado"]:
-            proc.q12_executar_garantias = "NÃO (Stay Period vigente)"
-        else:
-            proc.q12_executar_garantias = "Possivelmente SIM"
-        
-        # Q13: Plano RJ
-        if "homologação" in movs and "plano" in movs:
-            proc.q13_plano_rj = "Homologado"
-        elif "aprovação" in movs and "plano" in movs:
-            proc.q13_plano_rj = "Aprovado"
-        elif "apresentação" in movs and "plano" in movs:
-            proc.q13_plano_rj = "Apresentado"
-        else:
-            proc.q13_plano_rj = "Aguardando/Em elaboração"
+        # Q11: Stay period (180 dias do deferimento mais as prorrogações, na data de referência)
+        ref = _referencia(self.referencia)
+        sem_datas = ~marcos["datado"]
+        vigente = _stay_vigente(marcos, ref)
+        r["q11_stay_period"] = _escolher([
+            (marcos["encerramento"] <= ref, "Encerrado"),
+            (vigente & (marcos["prorrogacao_dias"] > 0), "Prorrogado"),
+            (vigente, "Ativo"),
+            (marcos["deferimento"] <= ref, "Vencido"),
+            (sem_datas & tem("movs", "prorrogação") & tem("movs", "prazo"), "Prorrogado"),
+            (sem_datas & tem("movs", "processamento") & tem("movs", "deferido"), "Ativo"),
+            (sem_datas & (tem("movs", "encerr") | tem("movs", "falência")), "Encerrado"),
+        ], "Verificar manualmente")
+        
+        # Q12: Executar garantias (stay period "Ativo" ou "Prorrogado")
+        q11 = r["q11_stay_period"]
+        r["q12_executar_garantias"] = _escolher([
+            ((q11 == "Ativo") | (q11 == "Prorrogado"), "NÃO (Stay Period vigente)"),
+        ], "Possivelmente SIM")
+        
+        def houve(evento: int) -> Any:
+            return (marcos["eventos"] & (1 << evento)) != 0
+        
+        def sem_evento(mascara: int) -> Any:
+            return ((marcos["eventos"] | marcos["negados"]) & mascara) == 0
+        
+        # Q13: Plano RJ (fase mais avançada registrada)
+        plano = sem_evento(_MASCARA_PLANO) & tem("movs", "plano")
+        r["q13_plano_rj"] = _escolher([
+            (houve(EVENTO_PLANO_HOMOLOGADO), "Homologado"),
+            (houve(EVENTO_PLANO_APROVADO), "Aprovado"),
+            (houve(EVENTO_PLANO_APRESENTADO), "Apresentado"),
+            (plano & tem("movs", "homologação"), "Homologado"),
+            (plano & tem("movs", "aprovação"), "Aprovado"),
+            (plano & tem("movs", "apresentação"), "Apresentado"),
+        ], "Aguardando/Em elaboração")
         
         # Q14: AGC/Mediação
-        if "assembleia" in movs:
-            proc.q14_agc_mediacao = "AGC realizada/marcada"
-        elif "mediação" in movs:
-            proc.q14_agc_mediacao = "Mediação em andamento"
-        else:
-            proc.q14_agc_mediacao = "Não identificado"
+        sem_agc_mediacao = sem_evento(_MASCARA_AGC_MEDIACAO)
+        r["q14_agc_mediacao"] = _escolher([
+            (houve(EVENTO_AGC), "AGC realizada/marcada"),
+            (houve(EVENTO_MEDIACAO), "Mediação em andamento"),
+            (sem_agc_mediacao & tem("movs", "assembleia"), "AGC realizada/marcada"),
+            (sem_agc_mediacao & tem("movs", "mediação"), "Mediação em andamento"),
+        ], "Não identificado")
+        
+        return r
+    
+    def analisar(self, proc: Processo) -> Processo:
+        """Analisa o processo e preenche as 14 questões"""
+        achados = self.ocorrencias(proc)
+        
+        def tem(campo: str, termo: str) -> bool:
+            return _termo_normalizado(termo) in achados[campo]
+        
+        advogado = proc.advogados_requerente[0] if proc.advogados_requerente else ""
+        marcos = marcos_processo(proc.movimentacoes)
+        for questao, resposta in self._responder(tem, advogado, marcos).items():
+            setattr(proc, questao, resposta)
         
         return proc
+    
+    @classmethod
+    def dataframe(cls, processos: Iterable[Processo]) -> pd.DataFrame:
+        """Monta o DataFrame de entrada de `analisar_df` a partir de processos
+        
+        Inclui as colunas de `COLUNAS_MARCOS`, calculadas de uma vez pela
+        `LinhaTempo` do corpus.
+        """
+        processos = list(processos)
+        linhas = []
+        for proc in processos:
+            linha = {"numero": proc.numero}
+            linha.update(cls.campos_texto(proc))
+            linha["advogado"] = proc.advogados_requerente[0] if proc.advogados_requerente else ""
+            linhas.append(linha)
+        df = pd.DataFrame(linhas, columns=["numero"] + cls.CAMPOS + ["advogado"])
+        for nome, valores in LinhaTempo.de_processos(processos).marcos().items():
+            df[nome] = valores
+        return df
+    
+    def prazos(self, processos: Iterable[Processo]) -> pd.DataFrame:
+        """Marcos e prazos do stay period e do plano de todos os processos (ver `LinhaTempo.prazos`)"""
+        return LinhaTempo.de_processos(processos).prazos(self.referencia)
+    
+    def analisar_df(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Responde às 14 questões para um corpus inteiro de uma só vez
+        
+        `df` deve ter as colunas de `CAMPOS` (texto, movs, partes, classe,
+        assunto, recursos), já no formato de `campos_texto` (colunas
+        ausentes contam como vazias), as colunas de `COLUNAS_MARCOS`
+        (marcos da linha do tempo, sem os quais as questões 11 a 14 não têm
+        como coincidir com `analisar`) e opcionalmente `advogado` (primeiro
+        advogado do requerente). `dataframe` monta esse formato a partir de
+        processos. Devolve um DataFrame com as colunas q01...q14 no mesmo
+        índice, com resultados idênticos aos de `analisar` processo a
+        processo.
+        """
+        faltando = [c for c in COLUNAS_MARCOS if c not in df]
+        if faltando:
+            raise ValueError(f"Colunas de marcos ausentes: {', '.join(faltando)} "
+                             f"(monte o DataFrame com Analisador.dataframe)")
+        # Uma passada do `BuscadorTermos` por campo; cada termo vira uma coluna
+        # de uma matriz booleana (processos x termos do campo)
+        matrizes: Dict[str, Tuple[Dict[str, int], np.ndarray]] = {}
+        for campo in self.CAMPOS:
+            buscador = self._buscadores[campo]
+            colunas = {t: j for j, t in enumerate(sorted(buscador.termos))}
+            matriz = np.zeros((len(df), len(colunas)), dtype=bool)
+            if campo in df:
+                for i, valor in enumerate(df[campo].fillna("").astype(str)):
+                    for termo in buscador.buscar(normalizar_busca(valor)):
+                        matriz[i, colunas[termo]] = True
+            matrizes[campo] = (colunas, matriz)
+        ausente = pd.Series(False, index=df.index)
+        
+        def tem(campo: str, termo: str) -> pd.Series:
+            colunas, matriz = matrizes[campo]
+            j = colunas.get(_termo_normalizado(termo))
+            return ausente if j is None else pd.Series(matriz[:, j], index=df.index)
+        
+        if "advogado" in df:
+            advogado = df["advogado"].fillna("").astype(str)
+        else:
+            advogado = pd.Series("", index=df.index)
+        
+        marcos = {c: df[c].to_numpy() for c in COLUNAS_MARCOS}
+        respostas = self._responder(tem, advogado, marcos)
+        return pd.DataFrame({q: pd.Series(v, index=df.index, dtype=object) for q, v in respostas.items()},
+                            index=df.index)
+
+
+# =============================================================================
+# RESUMO ESTATÍSTICO
+# =============================================================================
+
+# Questões do resumo e se a resposta pode listar várias categorias separadas por vírgula
+QUESTOES_RESUMO = {
+    "q01_bancos_veiculos": False,
+    "q02_pedidos": True,
+    "q03_garantias_extraconcursais": False,
+    "q04_essencialidade": False,
+    "q05_teses": True,
+    "q06_entendimento": False,
+    "q07_escritorio": False,
+    "q08_credito_extraconcursal": False,
+    "q09_recursos": False,
+    "q10_bens_busca": False,
+    "q11_stay_period": False,
+    "q12_executar_garantias": False,
+    "q13_plano_rj": False,
+    "q14_agc_mediacao": False,
+}
+
+# Recortes do resumo
+DIMENSOES_RESUMO = ("foro", "vara", "juiz")
+
+
+class AgregadorResumo:
+    """Resumo estatístico incremental das 14 questões
+    
+    Atualizado uma vez por processo concluído (`adicionar`, que pode ser
+    passado como `ao_concluir` de `extrair_lote`), sem guardar os processos.
+    Agregadores de workers diferentes são combinados com `mesclar`, e
+    `resumo()` pode ser chamado a qualquer momento da execução.
+    """
+    
+    def __init__(self):
+        self.total = 0
+        self.sucesso = 0
+        self.respostas: Dict[str, Counter] = {q: Counter() for q in QUESTOES_RESUMO}
+        # dimensão -> valor (ex.: nome do foro) -> questão -> Counter
+        self.recortes: Dict[str, Dict[str, Dict[str, Counter]]] = {
+            d: defaultdict(lambda: {q: Counter() for q in QUESTOES_RESUMO}) for d in DIMENSOES_RESUMO
+        }
+        self.totais_recorte: Dict[str, Counter] = {d: Counter() for d in DIMENSOES_RESUMO}
+    
+    @staticmethod
+    def _categorias(questao: str, resposta: str) -> List[str]:
+        if QUESTOES_RESUMO[questao]:
+            return [c.strip() for c in resposta.split(",") if c.strip()]
+        return [resposta]
+    
+    def adicionar(self, proc: Processo) -> None:
+        """Contabiliza um processo concluído"""
+        self.total += 1
+        if proc.status != "Sucesso":
+            return
+        self.sucesso += 1
+        recortes = [(d, getattr(proc, d) or "Não informado") for d in DIMENSOES_RESUMO]
+        for dimensao, valor in recortes:
+            self.totais_recorte[dimensao][valor] += 1
+        for questao in QUESTOES_RESUMO:
+            for categoria in self._categorias(questao, getattr(proc, questao)):
+                self.respostas[questao][categoria] += 1
+                for dimensao, valor in recortes:
+                    self.recortes[dimensao][valor][questao][categoria] += 1
+    
+    def mesclar(self, outro: "AgregadorResumo") -> "AgregadorResumo":
+        """Soma as contagens de outro agregador a este"""
+        self.total += outro.total
+        self.sucesso += outro.sucesso
+        for questao, contagem in outro.respostas.items():
+            self.respostas[questao].update(contagem)
+        for dimensao in DIMENSOES_RESUMO:
+            self.totais_recorte[dimensao].update(outro.totais_recorte[dimensao])
+            for valor, questoes in outro.recortes[dimensao].items():
+                for questao, contagem in questoes.items():
+                    self.recortes[dimensao][valor][questao].update(contagem)
+        return self
+    
+    def __getstate__(self) -> Dict:
+        # defaultdict com lambda não é serializável: envia dicionários comuns
+        estado = dict(self.__dict__)
+        estado["recortes"] = {d: dict(v) for d, v in self.recortes.items()}
+        return estado
+    
+    def __setstate__(self, estado: Dict) -> None:
+        recortes = estado.pop("recortes")
+        self.__dict__.update(estado)
+        self.recortes = {d: defaultdict(lambda: {q: Counter() for q in QUESTOES_RESUMO}, v)
+                         for d, v in recortes.items()}
+    
+    def _percentual(self, n: int) -> str:
+        return f"{n/self.sucesso*100:.1f}%"
+    
+    def resumo(self) -> Dict:
+        """Estrutura do resumo.json com as contagens acumuladas até agora"""
+        if self.sucesso == 0:
+            return {"total": 0, "sucesso": 0}
+        
+        q1_sim = sum(n for c, n in self.respostas["q01_bancos_veiculos"].items() if "SIM" in c)
+        q3_sim = self.respostas["q03_garantias_extraconcursais"]["SIM"]
+        q4_sim = self.respostas["q04_essencialidade"]["SIM"]
+        q11_ativo = (self.respostas["q11_stay_period"]["Ativo"]
+                     + self.respostas["q11_stay_period"]["Prorrogado"])
+        
+        return {
+            "total_processos": self.total,
+            "extraidos_sucesso": self.sucesso,
+            "questoes": {
+                "Q1_bancos_veiculos": {"sim": q1_sim, "percentual": self._percentual(q1_sim)},
+                "Q3_garantias": {"sim": q3_sim, "percentual": self._percentual(q3_sim)},
+                "Q4_essencialidade": {"sim": q4_sim, "percentual": self._percentual(q4_sim)},
+                "Q11_stay_period": {"ativo": q11_ativo, "percentual": self._percentual(q11_ativo)},
+            },
+            "respostas": {
+                questao: {c: {"n": n, "percentual": self._percentual(n)} for c, n in contagem.most_common()}
+                for questao, contagem in self.respostas.items()
+            },
+            **{
+                f"por_{dimensao}": {
+                    valor: {
+                        "total": self.totais_recorte[dimensao][valor],
+                        "respostas": {q: dict(c.most_common()) for q, c in questoes.items() if c},
+                    }
+                    for valor, questoes in sorted(self.recortes[dimensao].items())
+                }
+                for dimensao in DIMENSOES_RESUMO
+            },
+        }
+    
+    def salvar(self, caminho: str) -> str:
+        """Grava o resumo atual em JSON (substituição atômica do arquivo)"""
+        temporario = caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(self.resumo(), f, ensure_ascii=False, indent=2)
+        os.replace(temporario, caminho)
+        return caminho
+
+
+# =============================================================================
+# SESSÃO DE NAVEGADOR
+# =============================================================================
+
+# Tamanho típico de cada tipo de recurso bloqueado, usado para estimar a economia
+_TAMANHO_TIPICO_RECURSO = {
+    "image": 20_000, "media": 250_000, "font": 40_000, "stylesheet": 30_000, "script": 60_000,
+}
+
+
+class PoliticaRecursos:
+    """Decide quais requisições do navegador são abortadas
+    
+    Bloqueia os tipos de `BLOQUEAR_TIPOS`, as URLs de `BLOQUEAR_URLS` e
+    tudo que não vem de `DOMINIOS_PERMITIDOS` (vazio = qualquer domínio);
+    as URLs de `PERMITIR_URLS` passam sempre. Documentos (navegações) nunca
+    são bloqueados.
+    """
+    
+    def __init__(self, config: Config):
+        self.tipos = frozenset(config.BLOQUEAR_TIPOS)
+        self.dominios = tuple(d.lower() for d in config.DOMINIOS_PERMITIDOS)
+        self._bloqueadas = re.compile("|".join(config.BLOQUEAR_URLS)) if config.BLOQUEAR_URLS else None
+        self._permitidas = re.compile("|".join(config.PERMITIR_URLS)) if config.PERMITIR_URLS else None
+    
+    @property
+    def ativa(self) -> bool:
+        return bool(self.tipos or self.dominios or self._bloqueadas)
+    
+    def bloquear(self, url: str, tipo: str) -> bool:
+        if tipo == "document" or (self._permitidas is not None and self._permitidas.search(url)):
+            return False
+        if tipo in self.tipos or (self._bloqueadas is not None and self._bloqueadas.search(url)):
+            return True
+        if self.dominios:
+            host = urlsplit(url).hostname or ""
+            return not any(host == d or host.endswith("." + d) for d in self.dominios)
+        return False
+
+
+@dataclass
+class EstatisticasRede:
+    """Tráfego de uma consulta: requisições feitas, bloqueadas e bytes recebidos"""
+    requisicoes: int = 0
+    bloqueadas: Counter = field(default_factory=Counter)
+    bytes_recebidos: int = 0
+    
+    @property
+    def bytes_economizados(self) -> int:
+        """Estimativa, pelo tamanho típico de cada tipo de recurso bloqueado"""
+        return sum(_TAMANHO_TIPICO_RECURSO.get(tipo, 5_000) * n for tipo, n in self.bloqueadas.items())
+    
+    def receber(self, resposta) -> None:
+        """Soma o tamanho declarado (Content-Length) de uma resposta do navegador"""
+        try:
+            self.bytes_recebidos += int(resposta.headers.get("content-length", 0))
+        except (TypeError, ValueError):
+            pass
+    
+    def somar(self, outra: "EstatisticasRede") -> None:
+        self.requisicoes += outra.requisicoes
+        self.bloqueadas.update(outra.bloqueadas)
+        self.bytes_recebidos += outra.bytes_recebidos
+    
+    def descricao(self) -> str:
+        return (f"{self.requisicoes} requisições, {sum(self.bloqueadas.values())} bloqueadas, "
+                f"{self.bytes_recebidos / 1024:.0f} KB recebidos, "
+                f"~{self.bytes_economizados / 1024:.0f} KB economizados")
+
+
+@dataclass
+class _ContextoPool:
+    """Contexto do pool com sua página e contagem de usos"""
+    context: BrowserContext
+    page: Page
+    usos: int = 0
+    rede: EstatisticasRede = field(default_factory=EstatisticasRede)
+
+
+@dataclass
+class _ContextoPoolAsync:
+    """Equivalente assíncrono de `_ContextoPool`"""
+    context: BrowserContextAsync
+    page: PageAsync
+    usos: int = 0
+    rede: EstatisticasRede = field(default_factory=EstatisticasRede)
+
+
+class SessaoNavegador:
+    """Mantém um único Chromium aberto e um pool de contextos reaproveitáveis
+    
+    Serve as consultas avulsas (`extrair_processo`); os lotes usam
+    `SessaoNavegadorAsync`. Os contextos são criados sob demanda, no
+    primeiro empréstimo em que não há um livre, e até
+    `TAMANHO_POOL_CONTEXTOS` deles ficam guardados entre consultas. Cada
+    contexto é descartado após `USOS_POR_CONTEXTO` consultas ou após
+    qualquer erro durante o uso, evitando acúmulo de estado no e-SAJ.
+    As requisições passam pela `PoliticaRecursos` da configuração e o
+    tráfego de cada consulta é somado em `rede`.
+    """
+    
+    def __init__(self, config: Config = None):
+        self.config = config or Config()
+        self.politica = PoliticaRecursos(self.config)
+        self.rede = EstatisticasRede()
+        self._playwright = None
+        self._browser: Optional[Browser] = None
+        self._livres: List[_ContextoPool] = []
+    
+    def __enter__(self) -> "SessaoNavegador":
+        # O navegador só é aberto na primeira página emprestada
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+    
+    def iniciar(self) -> None:
+        """Abre o Playwright e o navegador; os contextos vêm com o uso"""
+        if self._browser is not None:
+            return
+        self._playwright = sync_playwright().start()
+        self._browser = self._playwright.chromium.launch(
+            headless=self.config.HEADLESS,
+            args=list(self.config.ARGS_NAVEGADOR)
+        )
+    
+    def _novo_contexto(self) -> _ContextoPool:
+        context = self._browser.new_context(
+            viewport={"width": 1366, "height": 768},
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            service_workers="block"
+        )
+        context.set_default_timeout(self.config.TIMEOUT_ELEMENTO)
+        item = _ContextoPool(context=context, page=context.new_page())
+        
+        def rotear(route):
+            item.rede.requisicoes += 1
+            if self.politica.bloquear(route.request.url, route.request.resource_type):
+                item.rede.bloqueadas[route.request.resource_type] += 1
+                route.abort()
+            else:
+                route.continue_()
+        
+        # Com rotas ativas o Playwright também desliga o cache HTTP do contexto
+        if self.politica.ativa:
+            context.route("**/*", rotear)
+        context.on("response", lambda resposta: item.rede.receber(resposta))
+        return item
+    
+    def _descartar(self, item: _ContextoPool) -> None:
+        try:
+            item.context.close()
+        except Exception:
+            pass
+    
+    @contextmanager
+    def pagina(self) -> Iterator[Page]:
+        """Empresta uma página do pool, criando um contexto se não houver livre
+        
+        O contexto é descartado ao atingir o limite de usos ou se o bloco
+        levantar uma exceção; o substituto só é criado no próximo empréstimo.
+        """
+        if self._browser is None:
+            self.iniciar()
+        item = self._livres.pop(0) if self._livres else self._novo_contexto()
+        item.usos += 1
+        item.rede = EstatisticasRede()
+        erro = False
+        try:
+            yield item.page
+        except Exception:
+            erro = True
+            raise
+        finally:
+            self._registrar_rede(item.rede)
+            if (erro or item.usos >= self.config.USOS_POR_CONTEXTO or item.page.is_closed()
+                    or len(self._livres) >= max(1, self.config.TAMANHO_POOL_CONTEXTOS)):
+                self._descartar(item)
+            else:
+                self._livres.append(item)
+    
+    def _registrar_rede(self, rede: EstatisticasRede) -> None:
+        self.rede.somar(rede)
+        if rede.requisicoes:
+            print(f"   🛡️ Rede: {rede.descricao()}")
+    
+    def fechar(self) -> None:
+        """Fecha todos os contextos, o navegador e o Playwright"""
+        if self.rede.requisicoes:
+            print(f"🛡️ Rede na sessão: {self.rede.descricao()}")
+            self.rede = EstatisticasRede()
+        for item in self._livres:
+            self._descartar(item)
+        self._livres = []
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+
+class SessaoNavegadorAsync:
+    """Versão assíncrona de `SessaoNavegador` usada pela extração em lote
+    
+    O pool tem uma página por trabalhador (`CONCORRENCIA`), com as mesmas
+    regras de reciclagem por número de usos e por erro. Uma vaga cujo
+    contexto não pôde ser recriado volta ao pool vazia (None) e é
+    preenchida no próximo empréstimo, reabrindo o navegador se ele caiu.
+    """
+    
+    def __init__(self, config: Config = None):
+        self.config = config or Config()
+        self.politica = PoliticaRecursos(self.config)
+        self.rede = EstatisticasRede()
+        self._playwright = None
+        self._browser: Optional[BrowserAsync] = None
+        self._livres: Optional[asyncio.Queue] = None
+        self._trava_inicio = asyncio.Lock()
+    
+    async def __aenter__(self) -> "SessaoNavegadorAsync":
+        # O navegador só é aberto na primeira página emprestada
+        return self
+    
+    async def __aexit__(self, *exc) -> None:
+        await self.fechar()
+    
+    async def iniciar(self) -> None:
+        """Abre o Playwright, o navegador e aquece o pool de páginas"""
+        async with self._trava_inicio:
+            if self._browser is not None:
+                return
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(
+                headless=self.config.HEADLESS,
+                args=list(self.config.ARGS_NAVEGADOR)
+            )
+            livres = asyncio.Queue()
+            for _ in range(max(1, self.config.CONCORRENCIA)):
+                livres.put_nowait(await self._novo_contexto())
+            self._livres = livres
+    
+    async def _reabrir_navegador(self) -> None:
+        """Relança o Chromium depois de uma queda (os contextos antigos morreram com ele)"""
+        async with self._trava_inicio:
+            if self._browser is not None and self._browser.is_connected():
+                return
+            print("   🔄 Navegador desconectado, abrindo de novo")
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = await self._playwright.chromium.launch(
+                headless=self.config.HEADLESS,
+                args=list(self.config.ARGS_NAVEGADOR)
+            )
+    
+    async def _novo_contexto(self) -> "_ContextoPoolAsync":
+        context = await self._browser.new_context(
+            viewport={"width": 1366, "height": 768},
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            service_workers="block"
+        )
+        context.set_default_timeout(self.config.TIMEOUT_ELEMENTO)
+        item = _ContextoPoolAsync(context=context, page=await context.new_page())
+        
+        async def rotear(route):
+            item.rede.requisicoes += 1
+            if self.politica.bloquear(route.request.url, route.request.resource_type):
+                item.rede.bloqueadas[route.request.resource_type] += 1
+                await route.abort()
+            else:
+                await route.continue_()
+        
+        if self.politica.ativa:
+            await context.route("**/*", rotear)
+        context.on("response", lambda resposta: item.rede.receber(resposta))
+        return item
+    
+    @asynccontextmanager
+    async def pagina(self) -> AsyncIterator[PageAsync]:
+        """Empresta uma página do pool, aguardando se todas estiverem em uso"""
+        if self._browser is None:
+            await self.iniciar()
+        item = await self._livres.get()
+        if item is None:
+            item = await self._preencher_vaga()
+        item.usos += 1
+        item.rede = EstatisticasRede()
+        erro = False
+        try:
+            yield item.page
+        except Exception:
+            erro = True
+            raise
+        finally:
+            self.rede.somar(item.rede)
+            if item.rede.requisicoes:
+                print(f"   🛡️ Rede: {item.rede.descricao()}")
+            devolvido = item
+            try:
+                if erro or item.usos >= self.config.USOS_POR_CONTEXTO or item.page.is_closed():
+                    devolvido = None
+                    try:
+                        await item.context.close()
+                    except Exception:
+                        pass
+                    devolvido = await self._novo_contexto()
+            except Exception as e:
+                print(f"   ⚠️ Contexto do navegador não recriado ({e}): nova tentativa no próximo uso")
+            finally:
+                # A vaga sempre volta ao pool, mesmo vazia, para nenhum trabalhador esperar para sempre
+                self._livres.put_nowait(devolvido)
+    
+    async def _preencher_vaga(self) -> "_ContextoPoolAsync":
+        """Contexto para uma vaga vazia do pool; em caso de erro a vaga volta vazia"""
+        try:
+            if not self._browser.is_connected():
+                await self._reabrir_navegador()
+            return await self._novo_contexto()
+        except BaseException:
+            self._livres.put_nowait(None)
+            raise
+    
+    async def fechar(self) -> None:
+        """Fecha todos os contextos, o navegador e o Playwright"""
+        if self.rede.requisicoes:
+            print(f"🛡️ Rede na sessão: {self.rede.descricao()}")
+            self.rede = EstatisticasRede()
+        while self._livres is not None and not self._livres.empty():
+            item = self._livres.get_nowait()
+            if item is None:
+                continue
+            try:
+                await item.context.close()
+            except Exception:
+                pass
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
 
 
 # =============================================================================
 # EXTRATOR PRINCIPAL
 # =============================================================================
 
+# Lê a página do processo inteira em uma só ida ao navegador, no formato de
+# `busca_http.interpretar_pagina`: expande partes e movimentações e devolve o
+# cabeçalho, o innerText de cada linha das tabelas e o texto visível.
+_JS_DADOS_PAGINA = """
+() => {
+    const visivel = el => !!el && el.getClientRects().length > 0;
+    const texto = id => {
+        const el = document.getElementById(id);
+        return el ? el.innerText.trim() : "";
+    };
+    const rotulado = (id, rotulo) => {
+        if (document.getElementById(id)) return texto(id);
+        const span = Array.from(document.querySelectorAll("span"))
+            .find(s => s.children.length === 0 && s.textContent.includes(rotulo));
+        const spans = span ? span.parentElement.querySelectorAll("span") : [];
+        return spans.length ? spans[spans.length - 1].innerText.trim() : "";
+    };
+    const linhas = ids => {
+        const tabela = ids.map(id => document.getElementById(id)).find(visivel);
+        return tabela ? Array.from(tabela.querySelectorAll("tr"), tr => tr.innerText) : [];
+    };
+    const expandir = el => { if (visivel(el)) el.click(); };
+    
+    expandir(document.getElementById("linkpartes")
+             || Array.from(document.querySelectorAll("a")).find(a => a.innerText.trim().startsWith("Mais")));
+    expandir(document.getElementById("linkTodasMovimentacoes"));
+    
+    return {
+        encontrado: visivel(document.getElementById("classeProcesso")),
+        mensagem: texto("mensagemRetorno"),
+        classe: texto("classeProcesso"),
+        assunto: texto("assuntoProcesso"),
+        juiz: texto("juizProcesso"),
+        foro: rotulado("foroProcesso", "Foro"),
+        vara: rotulado("varaProcesso", "Vara"),
+        data_distribuicao: texto("dataHoraDistribuicaoProcesso"),
+        partes: linhas(["tablePartesPrincipais", "tableTodasPartes"]),
+        movimentacoes: linhas(["tabelaTodasMovimentacoes", "tabelaUltimasMovimentacoes"]),
+        texto: document.body.innerText,
+        links_processos: Array.from(document.querySelectorAll("a[href*='processo.codigo']"), a => a.href),
+        documentos: Array.from(document.querySelectorAll(
+            "#tabelaTodasMovimentacoes a[href], #tabelaUltimasMovimentacoes a[href]"), a => a.href),
+    };
+}
+"""
+
+
+# Chave do cache com os recursos do 2º grau encontrados na busca por um número
+_SUFIXO_RECURSOS = "#recursos"
+
+# Números CNJ de processos originários do 2º grau do TJSP (agravos etc.)
+_RE_NUMERO_2GRAU = re.compile(r"\b\d{7}-\d{2}\.\d{4}\.8\.26\.0000\b")
+
+# Mensagens de #mensagemRetorno que indicam portal instável, e não processo inexistente
+_RE_MENSAGEM_FALHA = re.compile(r"erro|indispon|tente novamente|excedid|bloquead|manuten", re.IGNORECASE)
+
+# Qualquer um destes elementos indica que a resposta da busca chegou
+_SELETOR_RESULTADO = "#classeProcesso, #mensagemRetorno, a[href*='processo.codigo']"
+
+
 class ExtratorTJSP:
     """Extrator de dados do TJSP"""
     
     def __init__(self, config: Config = None):
         self.config = config or Config()
         self.analisador = Analisador()
+        self.metricas = Metricas()
+        self.controle = ControladorTaxa(
+            1 / self.config.DELAY_ENTRE_PROCESSOS if self.config.DELAY_ENTRE_PROCESSOS > 0 else None,
+            taxa_minima=self.config.TAXA_MINIMA,
+            taxa_maxima=self.config.TAXA_MAXIMA,
+            latencia_alvo=self.config.LATENCIA_ALVO_S,
+            adaptativo=self.config.TAXA_ADAPTATIVA,
+            disjuntor=Disjuntor(self.config.DISJUNTOR_FALHAS, self.config.DISJUNTOR_PAUSA_S)
+        )
+        self.cliente_http = ClienteESAJ(
+            self.config.URL_TJSP_1GRAU,
+            tamanho_pool=self.config.CONCORRENCIA,
+            timeout=self.config.TIMEOUT_PAGINA / 1000
+        )
+        # As consultas do 1º grau passam pelo controle uma vez por tentativa
+        # (`_consultar_portal`); as do cposg e os downloads, a cada requisição
+        self.cliente_2grau = ClienteESAJ(
+            self.config.URL_TJSP_2GRAU,
+            tamanho_pool=self.config.CONCORRENCIA,
+            timeout=self.config.TIMEOUT_PAGINA / 1000,
+            segundo_grau=True,
+            controle=self.controle
+        )
+        self.documentos: Optional[ColetorDocumentos] = None
+        if self.config.BAIXAR_DOCUMENTOS:
+            self.documentos = ColetorDocumentos(
+                self.config.DIR_PDFS,
+                concorrencia=self.config.CONCORRENCIA_DOWNLOADS,
+                limite_kbps=self.config.LIMITE_BANDA_KBPS,
+                workers_texto=self.config.WORKERS_TEXTO,
+                timeout=self.config.TIMEOUT_PAGINA / 1000,
+                controle=self.controle
+            )
+        # Threads das consultas ao 2º grau e dos downloads, que correm junto com as do 1º grau
+        self._pool_2grau = ThreadPoolExecutor(max_workers=max(2, 2 * self.config.CONCORRENCIA),
+                                              thread_name_prefix="cposg")
         os.makedirs(self.config.DIR_SAIDA, exist_ok=True)
         os.makedirs(self.config.DIR_PDFS, exist_ok=True)
+        self.cache: Optional[CachePaginas] = None
+        if self.config.USAR_CACHE or self.config.MODO_OFFLINE:
+            self.cache = CachePaginas(
+                self.config.DIR_CACHE,
+                ttl_horas=self.config.CACHE_TTL_HORAS,
+                tamanho_maximo_mb=self.config.CACHE_MAX_MB
+            )
     
-    def _extrair_partes(self, page: Page, proc: Processo) -> Processo:
-        """Extrai informações das partes do processo"""
-        try:
-            # Clica em "Mais" para expandir partes se disponível
-            try:
-                mais_btn = page.locator("text=Mais").first
-                if mais_btn.is_visible():
-                    mais_btn.click()
-                    time.sleep(0.5)
-            except:
-                pass
+    @classmethod
+    def leitor_cache(cls, config: Config) -> "ExtratorTJSP":
+        """Extrator que só reconstrói e reanalisa processos do cache
+        
+        Sem controle de taxa, clientes HTTP, threads do 2º grau nem
+        downloads: abre o cache e o índice dos documentos já baixados somente
+        para leitura, sem atualizar o último acesso das páginas. É o que
+        cada worker de `reanalisar_cache` cria.
+        """
+        extrator = cls.__new__(cls)
+        extrator.config = replace(config, MODO_OFFLINE=True)
+        extrator.analisador = Analisador()
+        extrator.metricas = Metricas()
+        extrator.controle = None
+        extrator.cliente_http = extrator.cliente_2grau = None
+        extrator._pool_2grau = None
+        extrator.cache = CachePaginas(config.DIR_CACHE, ttl_horas=config.CACHE_TTL_HORAS, somente_leitura=True)
+        extrator.documentos = None
+        if config.BAIXAR_DOCUMENTOS and os.path.exists(os.path.join(config.DIR_PDFS, "indice.sqlite")):
+            extrator.documentos = ColetorDocumentos(config.DIR_PDFS, somente_leitura=True)
+        return extrator
+    
+    def __enter__(self) -> "ExtratorTJSP":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+    
+    def fechar(self) -> None:
+        """Encerra as threads do 2º grau e fecha documentos, conexões e cache"""
+        if self._pool_2grau is not None:
+            self._pool_2grau.shutdown(wait=True)
+            self._pool_2grau = None
+        if self.documentos is not None:
+            self.documentos.fechar()
+            self.documentos = None
+        for cliente in (self.cliente_http, self.cliente_2grau):
+            if cliente is not None:
+                cliente.fechar()
+        self.cliente_http = self.cliente_2grau = None
+        if self.cache is not None:
+            self.cache.fechar()
+            self.cache = None
+    
+    @staticmethod
+    def _interpretar_partes(linhas: List[str], proc: Processo) -> Processo:
+        """Interpreta o texto das linhas da tabela de partes"""
+        tipo_atual = ""
+        for texto in linhas:
+            texto = texto.strip()
             
-            tabela = page.locator("#tablePartesPrincipais")
-            if tabela.is_visible():
-                linhas = tabela.locator("tr").all()
-                
-                tipo_atual = ""
-                for linha in linhas:
-                    texto = linha.inner_text().strip()
-                    
-                    if "Reqte" in texto or "Requerente" in texto:
-                        tipo_atual = "requerente"
-                        # Extrai nome após ":"
-                        partes = texto.split("\n")
-                        for p in partes:
-                            if ":" in p and "Advogado" not in p:
-                                nome = p.split(":")[-1].strip()
-                                if nome and len(nome) > 2:
-                                    proc.requerente = nome
-                                    break
-                    
-                    elif "Interessado" in texto or "Interessd" in texto:
-                        tipo_atual = "interessado"
-                        partes = texto.split("\n")
-                        for p in partes:
-                            if ":" in p and "Advogado" not in p:
-                                nome = p.split(":")[-1].strip()
-                                if nome and len(nome) > 2:
-                                    proc.interessados.append(nome)
-                                    break
-                    
-                    elif "Credor" in texto:
-                        tipo_atual = "credor"
-                        partes = texto.split("\n")
-                        for p in partes:
-                            if ":" in p and "Advogado" not in p:
-                                nome = p.split(":")[-1].strip()
-                                if nome and len(nome) > 2:
-                                    proc.credores.append(nome)
-                                    break
-                    
-                    elif "Perito" in texto:
-                        partes = texto.split("\n")
-                        for p in partes:
-                            if ":" in p and "Advogado" not in p:
-                                nome = p.split(":")[-1].strip()
-                                if nome and len(nome) > 2:
-                                    proc.perito = nome
-                                    break
-                    
-                    # Extrai advogados
-                    if "Advogado:" in texto or "Advogada:" in texto:
-                        for p in texto.split("\n"):
-                            if "Advogado:" in p or "Advogada:" in p:
-                                nome = p.replace("Advogado:", "").replace("Advogada:", "").strip()
-                                if nome and len(nome) > 3:
-                                    if tipo_atual == "requerente":
-                                        proc.advogados_requerente.append(nome)
-        except Exception as e:
-            print(f"   ⚠️ Erro ao extrair partes: {e}")
+            if "Reqte" in texto or "Requerente" in texto:
+                tipo_atual = "requerente"
+                # Extrai nome após ":"
+                partes = texto.split("\n")
+                for p in partes:
+                    if ":" in p and "Advogado" not in p:
+                        nome = p.split(":")[-1].strip()
+                        if nome and len(nome) > 2:
+                            proc.requerente = nome
+                            break
+            
+            elif "Interessado" in texto or "Interessd" in texto:
+                tipo_atual = "interessado"
+                partes = texto.split("\n")
+                for p in partes:
+                    if ":" in p and "Advogado" not in p:
+                        nome = p.split(":")[-1].strip()
+                        if nome and len(nome) > 2:
+                            proc.interessados.append(nome)
+                            break
+            
+            elif "Credor" in texto:
+                tipo_atual = "credor"
+                partes = texto.split("\n")
+                for p in partes:
+                    if ":" in p and "Advogado" not in p:
+                        nome = p.split(":")[-1].strip()
+                        if nome and len(nome) > 2:
+                            proc.credores.append(nome)
+                            break
+            
+            elif "Perito" in texto:
+                partes = texto.split("\n")
+                for p in partes:
+                    if ":" in p and "Advogado" not in p:
+                        nome = p.split(":")[-1].strip()
+                        if nome and len(nome) > 2:
+                            proc.perito = nome
+                            break
+            
+            # Extrai advogados
+            if "Advogado:" in texto or "Advogada:" in texto:
+                for p in texto.split("\n"):
+                    if "Advogado:" in p or "Advogada:" in p:
+                        nome = p.replace("Advogado:", "").replace("Advogada:", "").strip()
+                        if nome and len(nome) > 3:
+                            if tipo_atual == "requerente":
+                                proc.advogados_requerente.append(nome)
+        
+        return proc
+    
+    @staticmethod
+    def _interpretar_movimentacoes(linhas: List[str], proc: Processo) -> Processo:
+        """Interpreta o texto das linhas da tabela de movimentações"""
+        for texto in linhas:
+            texto = texto.strip()
+            if texto and len(texto) > 5:
+                # Tenta extrair data e descrição
+                partes = texto.split("\n")
+                if len(partes) >= 2:
+                    proc.movimentacoes.append({
+                        "data": partes[0].strip()[:10],
+                        "descricao": " ".join(partes[1:]).strip()
+                    })
+                else:
+                    proc.movimentacoes.append({
+                        "data": "",
+                        "descricao": texto
+                    })
+        
+        return proc
+    
+    def _preencher(self, proc: Processo, dados: Dict) -> Processo:
+        """Preenche o processo a partir dos dados estruturados de uma página
+        
+        `dados` segue o formato de `busca_http.interpretar_pagina`.
+        """
+        if not dados.get("encontrado"):
+            proc.erro = dados.get("mensagem", "")
+            # Mensagens de falha do portal (não de processo inexistente) contam como erro
+            proc.status = "Erro" if _RE_MENSAGEM_FALHA.search(proc.erro) else "Não encontrado"
+            return proc
         
+        proc.status = "Sucesso"
+        proc.classe = dados.get("classe", "")
+        proc.assunto = dados.get("assunto", "")
+        proc.juiz = dados.get("juiz", "")
+        proc.foro = dados.get("foro", "")
+        proc.vara = dados.get("vara", "")
+        proc.data_distribuicao = dados.get("data_distribuicao", "")
+        with self.metricas.etapa("interpretar_partes"):
+            proc = self._interpretar_partes(dados.get("partes", []), proc)
+        with self.metricas.etapa("interpretar_movimentacoes"):
+            proc = self._interpretar_movimentacoes(dados.get("movimentacoes", []), proc)
+        proc.texto_completo = dados.get("texto", "")
+        proc.documentos = links_documentos(dados.get("documentos", []),
+                                           self.config.URL_TJSP_1GRAU)[:self.config.MAX_DOCUMENTOS_POR_PROCESSO]
+        if self.documentos is not None:
+            with self.metricas.etapa("texto_documentos_disco"):
+                proc.texto_documentos = self.documentos.texto_em_disco(proc.documentos)
+        return self._analisar(proc)
+    
+    def _analisar(self, proc: Processo) -> Processo:
+        with self.metricas.etapa("analise"):
+            return self.analisador.analisar(proc)
+    
+    def _consultar_http(self, proc: Processo) -> Optional[Processo]:
+        """Consulta o processo sem navegador
+        
+        Devolve None quando a resposta não pôde ser interpretada e a consulta
+        precisa ser refeita pelo Playwright.
+        """
+        with self.metricas.etapa("consulta_http"):
+            resposta = self.cliente_http.consultar(proc.numero)
+        if resposta is None:
+            return None
+        html, dados = resposta
+        proc = self._preencher(proc, dados)
+        if proc.status == "Sucesso":
+            self._guardar_cache(proc.numero, html, proc.texto_completo)
         return proc
     
-    def _extrair_movimentacoes(self, page: Page, proc: Processo) -> Processo:
-        """Extrai movimentações do processo"""
+    def _guardar_cache(self, numero: str, html: str, texto: str) -> None:
+        if self.cache is None or self.config.MODO_OFFLINE:
+            return
         try:
-            # Tenta expandir todas as movimentações
+            with self.metricas.etapa("gravar_cache"):
+                self.cache.guardar(numero, html, texto)
+        except Exception as e:
+            print(f"   ⚠️ Erro ao gravar cache: {e}")
+    
+    def _preencher_do_cache(self, proc: Processo, pagina: PaginaCache) -> Processo:
+        """Reconstrói o processo (e seus recursos) a partir do cache"""
+        with self.metricas.etapa("interpretar_html"):
+            dados = interpretar_pagina(pagina.html)
+        dados["texto"] = pagina.texto
+        proc.recursos = self._juntar_recursos(
+            self._recursos_do_cache(n) or [] for n in self._numeros_2grau(proc.numero, pagina.texto)
+        )
+        return self._preencher(proc, dados)
+    
+    # -- 2º grau ---------------------------------------------------------------
+    
+    @staticmethod
+    def _numeros_2grau(numero: str, texto: str) -> List[str]:
+        """Números a buscar no cposg: o do processo e os recursos citados na página"""
+        return list(dict.fromkeys([numero] + _RE_NUMERO_2GRAU.findall(texto)))
+    
+    @staticmethod
+    def _juntar_recursos(listas: Iterable[List[Dict]]) -> List[Dict]:
+        """Une listas de recursos, sem repetir o mesmo número de recurso"""
+        recursos: Dict[str, Dict] = {}
+        for lista in listas:
+            for recurso in lista:
+                recursos.setdefault(recurso.get("numero") or f"#{len(recursos)}", recurso)
+        return list(recursos.values())
+    
+    def _recursos_do_cache(self, numero: str) -> Optional[List[Dict]]:
+        if self.cache is None:
+            return None
+        pagina = self.cache.obter(numero + _SUFIXO_RECURSOS, ignorar_ttl=self.config.MODO_OFFLINE)
+        return json.loads(pagina.html) if pagina is not None else None
+    
+    def _buscar_recursos(self, numero: str) -> List[Dict]:
+        """Recursos do 2º grau achados na busca por `numero` (cache ou cposg)"""
+        recursos = self._recursos_do_cache(numero)
+        if recursos is None:
+            with self.metricas.etapa("consulta_2grau"):
+                recursos = self.cliente_2grau.consultar_recursos(numero)
+            self._guardar_cache(numero + _SUFIXO_RECURSOS, json.dumps(recursos, ensure_ascii=False), "")
+        return recursos
+    
+    def _iniciar_busca_2grau(self, numero: str) -> Optional[Future]:
+        """Dispara a busca no cposg em paralelo à consulta do 1º grau"""
+        if not self.config.CONSULTAR_2GRAU or self.config.MODO_OFFLINE:
+            return None
+        return self._pool_2grau.submit(self._buscar_recursos, numero)
+    
+    def _anexar_recursos(self, proc: Processo, busca: Optional[Future]) -> bool:
+        """Espera as buscas no 2º grau e junta os recursos; True se mudaram
+        
+        Os recursos citados na página do 1º grau (agravos têm número próprio)
+        são buscados em paralelo entre si depois que a página chega.
+        """
+        if busca is None:
+            return False
+        vinculados = self._numeros_2grau(proc.numero, proc.texto())[1:]
+        futuros = [busca] + [self._pool_2grau.submit(self._buscar_recursos, n) for n in vinculados]
+        listas = [proc.recursos]
+        for futuro in futuros:
             try:
-                link_todas = page.locator("#linkTodasMovimentacoes")
-                if link_todas.is_visible():
-                    link_todas.click()
-                    time.sleep(1)
-            except:
-                pass
-            
-            # Busca tabela de movimentações
-            tabela = page.locator("#tabelaTodasMovimentacoes, #tabelaUltimasMovimentacoes").first
-            if tabela.is_visible():
-                linhas = tabela.locator("tr").all()
-                
-                for linha in linhas:
-                    try:
-                        texto = linha.inner_text().strip()
-                        if texto and len(texto) > 5:
-                            # Tenta extrair data e descrição
-                            partes = texto.split("\n")
-                            if len(partes) >= 2:
-                                proc.movimentacoes.append({
-                                    "data": partes[0].strip()[:10],
-                                    "descricao": " ".join(partes[1:]).strip()
-                                })
-                            else:
-                                proc.movimentacoes.append({
-                                    "data": "",
-                                    "descricao": texto
-                                })
-                    except:
-                        pass
+                listas.append(futuro.result())
+            except Exception as e:
+                print(f"   ⚠️ Erro ao consultar o 2º grau de {proc.numero}: {e}")
+        recursos = self._juntar_recursos(listas)
+        if recursos == proc.recursos:
+            return False
+        proc.recursos = recursos
+        print(f"   ⚖️ {len(recursos)} recurso(s) no 2º grau")
+        return True
+    
+    def _completar(self, proc: Processo, busca_2grau: Optional[Future]) -> Processo:
+        """Junta os recursos do 2º grau e o texto dos documentos ao processo
+        
+        Os PDFs são baixados enquanto as buscas no 2º grau terminam; a
+        análise é refeita uma única vez se algo mudou.
+        """
+        if proc.status != "Sucesso":
+            return proc
+        downloads = None
+        if self.documentos is not None and proc.documentos and not self.config.MODO_OFFLINE:
+            downloads = self._pool_2grau.submit(self._baixar_documentos, proc.documentos)
+        mudou = self._anexar_recursos(proc, busca_2grau)
+        if downloads is not None:
+            try:
+                texto = downloads.result()
+            except Exception as e:
+                print(f"   ⚠️ Erro nos documentos de {proc.numero}: {e}")
+                texto = proc.texto_documentos
+            if texto != proc.texto_documentos:
+                proc.texto_documentos = texto
+                mudou = True
+                print(f"   📄 Texto dos documentos incluído na análise")
+        if mudou:
+            proc = self._analisar(proc)
+        return proc
+    
+    def _baixar_documentos(self, urls: List[str]) -> str:
+        with self.metricas.etapa("documentos"):
+            return self.documentos.processar(urls)
+    
+    def _obter_do_cache(self, numero: str) -> Optional[Processo]:
+        """Processo reconstruído do cache, sem rede
+        
+        Devolve None quando o portal precisa ser consultado.
+        """
+        if self.cache is not None:
+            with self.metricas.etapa("leitura_cache"):
+                pagina = self.cache.obter(numero, ignorar_ttl=self.config.MODO_OFFLINE)
+            if pagina is not None:
+                self.metricas.contar("acertos_cache")
+                print(f"   💾 {numero} obtido do cache")
+                return self._preencher_do_cache(Processo(numero=numero), pagina)
+        
+        if self.config.MODO_OFFLINE:
+            return Processo(numero=numero, status="Erro",
+                            erro="Processo ausente do cache (modo offline)")
+        return None
+    
+    def _repetir(self, proc: Processo, tentativa: int, inicio: float) -> Optional[float]:
+        """Informa o resultado de uma tentativa ao controle de taxa
+        
+        Devolve a espera (backoff com jitter) antes de tentar de novo, ou
+        None se o processo terminou ou esgotou `TENTATIVAS_POR_PROCESSO`.
+        """
+        falhou = proc.status == "Erro"
+        self.controle.registrar(not falhou, time.perf_counter() - inicio)
+        if not falhou or tentativa >= max(1, self.config.TENTATIVAS_POR_PROCESSO):
+            return None
+        espera = atraso_backoff(tentativa, self.config.BACKOFF_BASE_S, self.config.BACKOFF_MAX_S)
+        self.metricas.contar("retentativas", motivo="erro")
+        print(f"   🔁 {proc.numero}: tentativa {tentativa} falhou, nova tentativa em {espera:.1f}s")
+        return espera
+    
+    def reconstruir_do_cache(self, numeros: Optional[Iterable[str]] = None) -> Iterator[Processo]:
+        """Reconstrói os processos guardados no cache, sem acessar a rede
+        
+        Sem `numeros`, percorre todo o cache. Útil para reaplicar o
+        `Analisador` depois de mudanças nas regras.
+        """
+        if self.cache is None:
+            raise RuntimeError("Cache desativado (USAR_CACHE=False)")
+        if numeros is None:
+            numeros = [n for n in self.cache.numeros() if not n.endswith(_SUFIXO_RECURSOS)]
+        for numero in numeros:
+            pagina = self.cache.obter(numero, ignorar_ttl=True, tocar=False)
+            if pagina is None:
+                yield Processo(numero=numero, status="Erro",
+                               erro="Processo ausente do cache (modo offline)")
+            else:
+                proc = self._preencher_do_cache(Processo(numero=numero), pagina)
+                yield proc.compactar(self.config.TEXTO_COMPLETO)
+    
+    def reanalisar_cache(self, numeros: Optional[Iterable[str]] = None, ordenado: bool = True,
+                         workers: Optional[int] = None, manter_texto: bool = False) -> Iterator[Processo]:
+        """Reconstrói e reanalisa processos do cache usando todos os núcleos
+        
+        A interpretação do HTML e o `Analisador` rodam em um
+        `ProcessPoolExecutor`, em lotes de `TAMANHO_LOTE_ANALISE` números.
+        Os resultados são entregues à medida que os lotes terminam: na ordem
+        de entrada (`ordenado=True`) ou na ordem de conclusão. Por padrão o
+        `texto_completo` não volta dos workers, para não trafegar o corpo das
+        páginas entre processos.
+        """
+        if self.cache is None:
+            raise RuntimeError("Cache desativado (USAR_CACHE=False)")
+        if numeros is None:
+            numeros = [n for n in self.cache.numeros() if not n.endswith(_SUFIXO_RECURSOS)]
+        workers = workers or self.config.WORKERS_ANALISE or os.cpu_count() or 1
+        lotes = _em_lotes(numeros, max(1, self.config.TAMANHO_LOTE_ANALISE))
+        # Mantém no máximo dois lotes por worker em voo, para memória constante
+        limite = 2 * workers
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_worker_analise,
+                                 initargs=(self.config,)) as pool:
+            if ordenado:
+                fila: deque = deque()
+                for lote in lotes:
+                    fila.append(pool.submit(_reanalisar_lote, lote, manter_texto))
+                    if len(fila) >= limite:
+                        yield from fila.popleft().result()
+                while fila:
+                    yield from fila.popleft().result()
+            else:
+                em_voo: Set[Future] = set()
+                for lote in lotes:
+                    em_voo.add(pool.submit(_reanalisar_lote, lote, manter_texto))
+                    if len(em_voo) >= limite:
+                        prontos, em_voo = wait(em_voo, return_when=FIRST_COMPLETED)
+                        for futuro in prontos:
+                            yield from futuro.result()
+                for futuro in wait(em_voo).done:
+                    yield from futuro.result()
+    
+    def _tentar_http(self, proc: Processo) -> Optional[Processo]:
+        """Aplica `BACKEND_CONSULTA`: None indica que o navegador deve ser usado"""
+        if self.config.BACKEND_CONSULTA == "navegador":
+            return None
+        try:
+            # Trabalha sobre uma cópia limpa para não sujar o fallback
+            resultado = self._consultar_http(Processo(numero=proc.numero))
         except Exception as e:
-            print(f"   ⚠️ Erro ao extrair movimentações: {e}")
+            if self.config.BACKEND_CONSULTA == "http":
+                raise
+            print(f"   ⚠️ Consulta HTTP falhou ({e}), usando navegador")
+            self.metricas.contar("retentativas", motivo="http_para_navegador")
+            return None
+        if resultado is None:
+            if self.config.BACKEND_CONSULTA == "http":
+                raise RuntimeError("Página do e-SAJ não reconhecida na consulta HTTP")
+            print("   ⚠️ Página não reconhecida via HTTP, usando navegador")
+            self.metricas.contar("retentativas", motivo="http_para_navegador")
+        elif resultado.status == "Sucesso":
+            print(f"   ✅ Processo encontrado! ({proc.numero}, via HTTP)")
+        else:
+            print(f"   ❌ {proc.numero}: {resultado.erro}")
+        return resultado
+    
+    def _preencher_formulario(self, page: Page, numero: str) -> None:
+        """Pesquisa pelo formulário de open.do
+        
+        `fill` já espera o campo ficar visível e editável; com `ESPERAS_FIXAS`
+        volta às pausas fixas e à digitação caractere a caractere, para
+        máscaras de campo que ignorem o `fill`.
+        """
+        num_limpo = re.sub(r'\D', '', numero)
+        parte1 = num_limpo[:-4]
+        parte2 = num_limpo[-4:]
+        
+        page.goto(self.config.URL_TJSP_1GRAU, timeout=self.config.TIMEOUT_PAGINA, wait_until="domcontentloaded")
+        page.locator("#radioNumeroUnificado").click()
+        
+        if self.config.ESPERAS_FIXAS:
+            time.sleep(0.5)
+            page.locator("#numeroDigitoAnoUnificado").clear()
+            page.locator("#numeroDigitoAnoUnificado").press_sequentially(parte1, delay=self.config.DELAY_DIGITACAO)
+            time.sleep(0.3)
+            page.locator("#foroNumeroUnificado").clear()
+            page.locator("#foroNumeroUnificado").press_sequentially(parte2, delay=self.config.DELAY_DIGITACAO)
+            time.sleep(0.5)
+        else:
+            page.locator("#numeroDigitoAnoUnificado").fill(parte1)
+            page.locator("#foroNumeroUnificado").fill(parte2)
+        
+        page.locator("#botaoConsultarProcessos").click()
+    
+    def _ler_pagina(self, page: Page) -> Dict:
+        """Espera o resultado da busca e lê a página do processo
+        
+        Numa lista de resultados (processo com incidentes), abre o link do
+        processo pesquisado, como faz o `ClienteESAJ`.
+        """
+        inicio = time.perf_counter()
+        try:
+            page.wait_for_selector(_SELETOR_RESULTADO, timeout=self.config.TIMEOUT_ELEMENTO)
+        except Exception:
+            self.metricas.contar("esperas_esgotadas")
+        self.metricas.observar("espera_resultado", time.perf_counter() - inicio)
+        with self.metricas.etapa("leitura_pagina"):
+            dados = page.evaluate(_JS_DADOS_PAGINA)
+        if not dados["encontrado"] and not dados["mensagem"] and dados["links_processos"]:
+            self.metricas.contar("listas_resultados")
+            with self.metricas.etapa("navegacao"):
+                page.goto(dados["links_processos"][0], timeout=self.config.TIMEOUT_PAGINA,
+                          wait_until="domcontentloaded")
+            with self.metricas.etapa("leitura_pagina"):
+                dados = page.evaluate(_JS_DADOS_PAGINA)
+        return dados
+    
+    def _consultar(self, page: Page, proc: Processo) -> Processo:
+        """Pesquisa o processo na página recebida e preenche os dados
+        
+        Sem pausas fixas: a navegação direta abre search.do já com o número
+        e a leitura espera o cabeçalho, a mensagem ou a lista de resultados.
+        """
+        if self.config.NAVEGACAO == "direta":
+            with self.metricas.etapa("navegacao"):
+                page.goto(self.cliente_http.url_busca(proc.numero), timeout=self.config.TIMEOUT_PAGINA,
+                          wait_until="domcontentloaded")
+        else:
+            with self.metricas.etapa("formulario"):
+                self._preencher_formulario(page, proc.numero)
+        
+        # Cabeçalho, partes, movimentações e texto em uma única avaliação na página
+        dados = self._ler_pagina(page)
+        proc = self._preencher(proc, dados)
+        
+        if proc.status == "Sucesso":
+            print("   ✅ Processo encontrado!")
+            if self.cache is not None and not self.config.MODO_OFFLINE:
+                with self.metricas.etapa("html_pagina"):
+                    html = page.content()
+                self._guardar_cache(proc.numero, html, proc.texto_completo)
+            print("   🧠 Análise jurimétrica concluída")
+        else:
+            print(f"   ❌ {proc.erro}")
         
         return proc
     
-    def extrair_processo(self, numero: str) -> Processo:
-        """Extrai dados completos de um processo"""
+    def extrair_processo(self, numero: str, sessao: Optional[SessaoNavegador] = None) -> Processo:
+        """Extrai dados completos de um processo
+        
+        Sem `sessao`, abre e fecha um navegador só para esta consulta.
+        """
+        if sessao is None:
+            with SessaoNavegador(self.config) as sessao_avulsa:
+                return self.extrair_processo(numero, sessao_avulsa)
+        
         proc = Processo(numero=numero)
+        print(f"\n🔍 Processando: {numero}")
+        inicio = time.perf_counter()
+        busca_2grau = self._iniciar_busca_2grau(numero)
         
-        with sync_playwright() as p:
-            browser = p.chromium.launch(
-                headless=self.config.HEADLESS,
-                args=["--disable-blink-features=AutomationControlled"]
-            )
-            context = browser.new_context(
-                viewport={"width": 1366, "height": 768},
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            )
-            page = context.new_page()
-            
+        try:
+            proc = self._obter_do_cache(numero) or self._consultar_portal(numero, sessao)
+        except Exception as e:
+            proc.status = "Erro"
+            proc.erro = str(e)
+            self.metricas.erro("processo", e)
+            print(f"   ❌ Erro: {e}")
+        
+        proc = self._completar(proc, busca_2grau).compactar(self.config.TEXTO_COMPLETO)
+        self._registrar_processo(proc, inicio)
+        return proc
+    
+    def _consultar_portal(self, numero: str, sessao: SessaoNavegador) -> Processo:
+        """Consulta o e-SAJ (HTTP e, se preciso, navegador) com novas tentativas
+        
+        Cada tentativa passa pelo controle de taxa e pelo disjuntor; erros são
+        repetidos com backoff exponencial até `TENTATIVAS_POR_PROCESSO`.
+        """
+        tentativa = 0
+        while True:
+            tentativa += 1
+            inicio = time.perf_counter()
+            self.controle.aguardar()
+            self.metricas.observar("espera_taxa", time.perf_counter() - inicio)
+            inicio = time.perf_counter()
+            proc = Processo(numero=numero)
             try:
-                print(f"\n🔍 Processando: {numero}")
-                
-                # Acessa portal
-                page.goto(self.config.URL_TJSP_1GRAU, timeout=self.config.TIMEOUT_PAGINA)
-                
-                # Seleciona busca por número
-                page.locator("#radioNumeroUnificado").click()
-                time.sleep(0.5)
-                
-                # Prepara número
-                num_limpo = re.sub(r'\D', '', numero)
-                parte1 = num_limpo[:-4]
-                parte2 = num_limpo[-4:]
-                
-                # Preenche campos
-                page.locator("#numeroDigitoAnoUnificado").clear()
-                page.locator("#numeroDigitoAnoUnificado").press_sequentially(parte1, delay=self.config.DELAY_DIGITACAO)
-                time.sleep(0.3)
-                page.locator("#foroNumeroUnificado").clear()
-                page.locator("#foroNumeroUnificado").press_sequentially(parte2, delay=self.config.DELAY_DIGITACAO)
-                time.sleep(0.5)
-                
-                # Consulta
-                page.locator("#botaoConsultarProcessos").click()
-                
-                # Aguarda resultado
-                try:
-                    page.wait_for_selector("#classeProcesso, #mensagemRetorno", timeout=self.config.TIMEOUT_ELEMENTO)
-                except:
-                    pass
-                
-                # Verifica sucesso
-                if page.locator("#classeProcesso").is_visible():
-                    print("   ✅ Processo encontrado!")
-                    proc.status = "Sucesso"
-                    
-                    # Dados básicos
-                    proc.classe = page.locator("#classeProcesso").inner_text().strip()
-                    
-                    try:
-                        proc.assunto = page.locator("#assuntoProcesso").inner_text().strip()
-                    except:
-                        pass
-                    
-                    try:
-                        proc.juiz = page.locator("#juizProcesso").inner_text().strip()
-                    except:
-                        pass
-                    
-                    try:
-                        # Foro
-                        foro_elem = page.locator("span:has-text('Foro')").locator("..").locator("span").last
-                        if foro_elem.is_visible():
-                            proc.foro = foro_elem.inner_text().strip()
-                    except:
-                        pass
-                    
-                    try:
-                        # Vara
-                        vara_elem = page.locator("span:has-text('Vara')").locator("..").locator("span").last
-                        if vara_elem.is_visible():
-                            proc.vara = vara_elem.inner_text().strip()
-                    except:
-                        pass
-                    
-                    try:
-                        proc.data_distribuicao = page.locator("#dataHoraDistribuicaoProcesso").inner_text().strip()
-                    except:
-                        pass
-                    
-                    # Extrai partes
-                    proc = self._extrair_partes(page, proc)
-                    
-                    # Extrai movimentações
-                    proc = self._extrair_movimentacoes(page, proc)
-                    
-                    # Texto completo para análise
-                    proc.texto_completo = page.locator("body").inner_text()
-                    
-                    # Análise jurimétrica
-                    proc = self.analisador.analisar(proc)
-                    print("   🧠 Análise jurimétrica concluída")
-                    
+                resultado = self._tentar_http(proc)
+                if resultado is not None:
+                    proc = resultado
                 else:
-                    if page.locator("#mensagemRetorno").is_visible():
-                        proc.erro = page.locator("#mensagemRetorno").inner_text().strip()
-                    proc.status = "Não encontrado"
-                    print(f"   ❌ {proc.erro}")
-                
+                    with sessao.pagina() as page:
+                        proc = self._consultar(page, proc)
             except Exception as e:
                 proc.status = "Erro"
                 proc.erro = str(e)
+                self.metricas.erro("processo", e)
                 print(f"   ❌ Erro: {e}")
+            espera = self._repetir(proc, tentativa, inicio)
+            if espera is None:
+                return proc
+            time.sleep(espera)
+    
+    async def _consultar_portal_async(self, numero: str, sessao: SessaoNavegadorAsync) -> Processo:
+        """Versão assíncrona de `_consultar_portal`"""
+        tentativa = 0
+        while True:
+            tentativa += 1
+            inicio = time.perf_counter()
+            await self.controle.aguardar_async()
+            self.metricas.observar("espera_taxa", time.perf_counter() - inicio)
+            inicio = time.perf_counter()
+            proc = Processo(numero=numero)
+            try:
+                resultado = await asyncio.to_thread(self._tentar_http, proc)
+                if resultado is not None:
+                    proc = resultado
+                else:
+                    inicio_espera = time.perf_counter()
+                    async with sessao.pagina() as page:
+                        self.metricas.observar("espera_pagina", time.perf_counter() - inicio_espera)
+                        proc = await self._consultar_async(page, proc)
+            except Exception as e:
+                proc.status = "Erro"
+                proc.erro = str(e)
+                self.metricas.erro("processo", e)
+                print(f"   ❌ Erro em {numero}: {e}")
+            espera = self._repetir(proc, tentativa, inicio)
+            if espera is None:
+                return proc
+            await asyncio.sleep(espera)
+    
+    def _registrar_processo(self, proc: Processo, inicio: float) -> None:
+        self.metricas.observar("processo", time.perf_counter() - inicio)
+        self.metricas.contar("processos", status=proc.status)
+    
+    def perfilar_processo(self, numero: str, caminho: Optional[str] = None, linhas: int = 30) -> Processo:
+        """Extrai um único processo sob o cProfile e imprime as funções mais custosas
+        
+        Com `caminho`, grava também as estatísticas brutas (.prof). As
+        consultas ao 2º grau e os downloads correm em threads e aparecem
+        apenas como espera.
+        """
+        with perfilar(caminho, linhas):
+            return self.extrair_processo(numero)
+    
+    async def _preencher_formulario_async(self, page: PageAsync, numero: str) -> None:
+        """Versão assíncrona de `_preencher_formulario`"""
+        num_limpo = re.sub(r'\D', '', numero)
+        parte1 = num_limpo[:-4]
+        parte2 = num_limpo[-4:]
+        
+        await page.goto(self.config.URL_TJSP_1GRAU, timeout=self.config.TIMEOUT_PAGINA,
+                        wait_until="domcontentloaded")
+        await page.locator("#radioNumeroUnificado").click()
+        
+        if self.config.ESPERAS_FIXAS:
+            await asyncio.sleep(0.5)
+            await page.locator("#numeroDigitoAnoUnificado").clear()
+            await page.locator("#numeroDigitoAnoUnificado").press_sequentially(parte1, delay=self.config.DELAY_DIGITACAO)
+            await asyncio.sleep(0.3)
+            await page.locator("#foroNumeroUnificado").clear()
+            await page.locator("#foroNumeroUnificado").press_sequentially(parte2, delay=self.config.DELAY_DIGITACAO)
+            await asyncio.sleep(0.5)
+        else:
+            await page.locator("#numeroDigitoAnoUnificado").fill(parte1)
+            await page.locator("#foroNumeroUnificado").fill(parte2)
+        
+        await page.locator("#botaoConsultarProcessos").click()
+    
+    async def _ler_pagina_async(self, page: PageAsync) -> Dict:
+        """Versão assíncrona de `_ler_pagina`"""
+        inicio = time.perf_counter()
+        try:
+            await page.wait_for_selector(_SELETOR_RESULTADO, timeout=self.config.TIMEOUT_ELEMENTO)
+        except Exception:
+            self.metricas.contar("esperas_esgotadas")
+        self.metricas.observar("espera_resultado", time.perf_counter() - inicio)
+        with self.metricas.etapa("leitura_pagina"):
+            dados = await page.evaluate(_JS_DADOS_PAGINA)
+        if not dados["encontrado"] and not dados["mensagem"] and dados["links_processos"]:
+            self.metricas.contar("listas_resultados")
+            with self.metricas.etapa("navegacao"):
+                await page.goto(dados["links_processos"][0], timeout=self.config.TIMEOUT_PAGINA,
+                                wait_until="domcontentloaded")
+            with self.metricas.etapa("leitura_pagina"):
+                dados = await page.evaluate(_JS_DADOS_PAGINA)
+        return dados
+    
+    async def _consultar_async(self, page: PageAsync, proc: Processo) -> Processo:
+        """Versão assíncrona de `_consultar`"""
+        if self.config.NAVEGACAO == "direta":
+            with self.metricas.etapa("navegacao"):
+                await page.goto(self.cliente_http.url_busca(proc.numero), timeout=self.config.TIMEOUT_PAGINA,
+                                wait_until="domcontentloaded")
+        else:
+            with self.metricas.etapa("formulario"):
+                await self._preencher_formulario_async(page, proc.numero)
+        
+        dados = await self._ler_pagina_async(page)
+        proc = self._preencher(proc, dados)
+        
+        if proc.status == "Sucesso":
+            print(f"   ✅ Processo encontrado! ({proc.numero})")
+            if self.cache is not None and not self.config.MODO_OFFLINE:
+                with self.metricas.etapa("html_pagina"):
+                    html = await page.content()
+                await asyncio.to_thread(self._guardar_cache, proc.numero, html, proc.texto_completo)
+        else:
+            print(f"   ❌ {proc.numero}: {proc.erro}")
+        
+        return proc
+    
+    async def extrair_processo_async(self, numero: str, sessao: SessaoNavegadorAsync) -> Processo:
+        """Versão assíncrona de `extrair_processo` sobre uma sessão já aberta"""
+        proc = Processo(numero=numero)
+        print(f"\n🔍 Processando: {numero}")
+        inicio = time.perf_counter()
+        busca_2grau = self._iniciar_busca_2grau(numero)
+        
+        try:
+            proc = (await asyncio.to_thread(self._obter_do_cache, numero)
+                    or await self._consultar_portal_async(numero, sessao))
+        except Exception as e:
+            proc.status = "Erro"
+            proc.erro = str(e)
+            self.metricas.erro("processo", e)
+            print(f"   ❌ Erro em {numero}: {e}")
+        
+        proc = await asyncio.to_thread(self._completar, proc, busca_2grau)
+        proc = proc.compactar(self.config.TEXTO_COMPLETO)
+        self._registrar_processo(proc, inicio)
+        return proc
+    
+    async def extrair_lote_async(self, processos: Union[Iterable[str], AsyncIterable[str]],
+                                 ao_concluir: Optional[Callable[[Processo], None]] = None,
+                                 saidas: Iterable[SaidaRelatorio] = (),
+                                 armazenamento: Optional[Any] = None,
+                                 manter_resultados: bool = True) -> List[Processo]:
+        """Extrai vários processos com até `CONCORRENCIA` páginas em paralelo
+        
+        Cada consulta ao portal passa pelo controle de taxa compartilhado
+        (`self.controle`: intervalo inicial `DELAY_ENTRE_PROCESSOS`, ajustado
+        com `TAXA_ADAPTATIVA`, e disjuntor) e, se falhar, é repetida com
+        backoff até `TENTATIVAS_POR_PROCESSO`; `ao_concluir` é chamado assim que cada
+        processo termina, na ordem de conclusão, e cada processo é gravado
+        nas `saidas` em fluxo no mesmo momento. O retorno segue a ordem de
+        entrada. `processos` também pode ser um iterável assíncrono (por
+        exemplo, `descobrir_async`): os números são consumidos à medida que
+        chegam. Com `manter_resultados=False` nada é acumulado e o retorno é
+        vazio: os processos só chegam por `ao_concluir` e pelas `saidas`,
+        com memória constante em entradas de qualquer tamanho.
+        
+        `armazenamento` (um `armazenamento.ArmazenamentoProcessos`) recebe
+        cada processo concluído e o grava no banco em lotes transacionais.
+        
+        Com `USAR_DIARIO`, cada processo concluído também é acrescentado ao
+        diário de execução; processos já concluídos em execuções anteriores
+        são restaurados do diário (e repassados a `ao_concluir` e às
+        `saidas`) sem nova consulta, exceto os de `REPETIR_STATUS`. Uma lista
+        de números tem um diário próprio (`ARQUIVO_DIARIO` com o hash da
+        lista no nome); uma entrada em fluxo usa `ARQUIVO_DIARIO` como está.
+        O diário é apagado quando o lote termina sem interrupção.
+        
+        Com `METRICAS`, os tempos por etapa e os contadores de `self.metricas`
+        são gravados em `ARQUIVO_METRICAS` (.json e .prom) ao fim do lote.
+        """
+        total = len(processos) if hasattr(processos, "__len__") else "?"
+        assincrona = hasattr(processos, "__aiter__")
+        entrada = aiter(processos) if assincrona else iter(processos)
+        indices = count()
+        trava_entrada = asyncio.Lock()
+        resultados: Dict[int, Processo] = {}
+        concluidos = 0
+        diario = self._abrir_diario(processos)
+        completo = False
+        
+        print(f"\n{'='*60}")
+        print(f"🚀 EXTRAÇÃO EM LOTE - {total} processos ({self.config.CONCORRENCIA} em paralelo)")
+        print(f"{'='*60}")
+        
+        async def proximo() -> Optional[Tuple[int, str]]:
+            # Todos os trabalhadores consomem a mesma entrada, síncrona ou assíncrona
+            async with trava_entrada:
+                try:
+                    num = await anext(entrada) if assincrona else next(entrada)
+                except (StopIteration, StopAsyncIteration):
+                    return None
+                return next(indices), num
+        
+        async with SessaoNavegadorAsync(self.config) as sessao:
+            async def trabalhador():
+                nonlocal concluidos
+                while (pendente := await proximo()) is not None:
+                    i, num = pendente
+                    anterior = diario.concluido(num) if diario is not None else None
+                    if anterior is not None:
+                        proc = processo_de_dict(anterior)
+                        if manter_resultados:
+                            resultados[i] = proc
+                        concluidos += 1
+                        self.metricas.contar("restaurados_diario", status=proc.status)
+                        print(f"   [{concluidos}/{total}] {num}: {proc.status} (diário)")
+                        self._entregar(proc, saidas, None, ao_concluir)
+                        continue
+                    proc = await self.extrair_processo_async(num, sessao)
+                    if manter_resultados:
+                        resultados[i] = proc
+                    concluidos += 1
+                    if diario is not None:
+                        diario.registrar(processo_para_dict(proc, manter_texto=False))
+                    print(f"   [{concluidos}/{total}] {num}: {proc.status}")
+                    self._entregar(proc, saidas, armazenamento, ao_concluir)
             
+            try:
+                await asyncio.gather(*(trabalhador() for _ in range(max(1, self.config.CONCORRENCIA))))
+                completo = True
             finally:
-                browser.close()
+                if armazenamento is not None:
+                    armazenamento.descarregar()
+                if diario is not None and completo:
+                    diario.descartar()
+                elif diario is not None:
+                    diario.fechar()
+                self._salvar_metricas()
         
-        return proc
+        return [resultados[i] for i in sorted(resultados)]
+    
+    async def descobrir_async(self, pesquisas: Iterable[Pesquisa],
+                              max_paginas: Optional[int] = None) -> AsyncIterator[str]:
+        """Números de processo encontrados pelas `pesquisas`, à medida que as listas chegam
+        
+        Cada `busca_http.Pesquisa` (por parte, advogado, OAB ou documento,
+        com filtros de classe e assunto) é paginada em uma thread, sob o
+        mesmo controle de taxa e disjuntor das consultas, que recebem o
+        resultado de cada página. Os números já entregues são
+        ignorados, e até `FILA_DESCOBERTA` deles ficam à frente do consumidor:
+        as páginas seguintes são baixadas enquanto os primeiros processos
+        são extraídos. Sem `max_paginas`, vale `MAX_PAGINAS_PESQUISA`.
+        """
+        max_paginas = max_paginas or self.config.MAX_PAGINAS_PESQUISA or None
+        loop = asyncio.get_running_loop()
+        fila: asyncio.Queue = asyncio.Queue(maxsize=max(1, self.config.FILA_DESCOBERTA))
+        parar = threading.Event()
+        
+        def colocar(numero: Optional[str]) -> None:
+            asyncio.run_coroutine_threadsafe(fila.put(numero), loop).result()
+        
+        def produzir() -> None:
+            try:
+                for pesquisa in pesquisas:
+                    print(f"🔎 Pesquisa por {pesquisa.criterio}: {pesquisa.valor}")
+                    try:
+                        for resultado in self.cliente_http.descobrir(pesquisa, max_paginas, controle=self.controle):
+                            if parar.is_set():
+                                return
+                            colocar(resultado["numero"])
+                    except Exception as e:
+                        self.metricas.erro("descoberta", e)
+                        print(f"   ⚠️ Erro na pesquisa por {pesquisa.criterio} {pesquisa.valor!r}: {e}")
+            finally:
+                if not parar.is_set():
+                    colocar(None)
+        
+        produtor = asyncio.ensure_future(asyncio.to_thread(produzir))
+        vistos: Set[str] = set()
+        try:
+            while (numero := await fila.get()) is not None:
+                if numero in vistos:
+                    continue
+                vistos.add(numero)
+                self.metricas.contar("descobertos")
+                yield numero
+        finally:
+            # Consumidor encerrado antes do fim: libera o produtor e espera a thread sair
+            parar.set()
+            while not fila.empty():
+                fila.get_nowait()
+            await produtor
+            print(f"🔎 {len(vistos)} processos descobertos")
     
-    def extrair_lote(self, processos: List[str]) -> List[Processo]:
-        """Extrai múltiplos processos"""
-        resultados = []
-        total = len(processos)
+    def extrair_descobertos(self, pesquisas: Iterable[Pesquisa], max_paginas: Optional[int] = None,
+                            ao_concluir: Optional[Callable[[Processo], None]] = None,
+                            saidas: Iterable[SaidaRelatorio] = (),
+                            armazenamento: Optional[Any] = None) -> List[Processo]:
+        """Descobre processos pelas `pesquisas` e os extrai na mesma passada
+        
+        A paginação das listas (`descobrir_async`) corre junto com a
+        extração em lote, que começa assim que chegam os primeiros números.
+        """
+        async def executar() -> List[Processo]:
+            numeros = self.descobrir_async(list(pesquisas), max_paginas)
+            return await self.extrair_lote_async(numeros, ao_concluir, list(saidas), armazenamento)
+        return asyncio.run(executar())
+    
+    @staticmethod
+    def _entregar(proc: Processo, saidas: Iterable[SaidaRelatorio], armazenamento: Optional[Any],
+                  ao_concluir: Optional[Callable[[Processo], None]]) -> None:
+        """Repassa um processo concluído às saídas, ao banco e ao callback"""
+        for saida in saidas:
+            saida.escrever(linha_relatorio(proc))
+        if armazenamento is not None:
+            armazenamento.adicionar(proc)
+        if ao_concluir is not None:
+            ao_concluir(proc)
+    
+    async def extrair_fila_async(self, fila: FilaTrabalho, worker: Optional[str] = None,
+                                 ao_concluir: Optional[Callable[[Processo], None]] = None,
+                                 saidas: Iterable[SaidaRelatorio] = (),
+                                 armazenamento: Optional[Any] = None) -> int:
+        """Consome uma fila de trabalho compartilhada até ela se esgotar
+        
+        Vários workers (processos ou máquinas) podem chamar este método
+        sobre a mesma fila. Cada um pede itens em lotes de `CONCORRENCIA`,
+        com concessões de `LEASE_FILA_S` segundos renovadas enquanto os
+        processos rodam; o início de cada processo reserva um horário no
+        limite global de taxa da própria fila, espaçado pela taxa atual de
+        `self.controle` (que parte de `DELAY_ENTRE_PROCESSOS`). Processos com status de `REPETIR_STATUS` voltam à fila até
+        `MAX_TENTATIVAS`. O worker só termina quando não há itens pendentes
+        nem em andamento em outros workers (cujas concessões podem expirar).
+        
+        Devolve quantos processos este worker concluiu.
+        """
+        worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+        lease = self.config.LEASE_FILA_S
+        concorrencia = max(1, self.config.CONCORRENCIA)
+        locais: deque = deque()
+        em_voo: Set[ItemFila] = set()
+        trava_obter = asyncio.Lock()
+        concluidos = 0
         
         print(f"\n{'='*60}")
-        print(f"🚀 EXTRAÇÃO EM LOTE - {total} processos")
+        print(f"🚀 WORKER {worker} - fila {fila.contagem()} ({concorrencia} em paralelo)")
         print(f"{'='*60}")
         
-        for i, num in enumerate(processos, 1):
-            print(f"\n[{i}/{total}]", end="")
-            proc = self.extrair_processo(num)
-            resultados.append(proc)
+        async def proximo() -> Optional[ItemFila]:
+            async with trava_obter:
+                while not locais:
+                    novos = await asyncio.to_thread(fila.obter, worker, concorrencia, lease)
+                    if novos:
+                        locais.extend(novos)
+                        em_voo.update(novos)
+                        break
+                    contagem = await asyncio.to_thread(fila.contagem)
+                    if contagem.get("pendente", 0):
+                        # Outro worker levou os pendentes entre a concessão e a contagem
+                        continue
+                    if contagem.get("em_andamento", 0) <= len(em_voo):
+                        return None
+                    # Itens com outros workers: espera concluírem ou a concessão expirar
+                    await asyncio.sleep(min(5.0, lease / 4))
+                return locais.popleft()
+        
+        async def renovar_concessoes():
+            while True:
+                await asyncio.sleep(lease / 3)
+                perdidos = await asyncio.to_thread(fila.renovar, list(em_voo), lease)
+                for item in perdidos:
+                    self.metricas.contar("concessoes_perdidas")
+                    print(f"   ⚠️ Concessão de {item.numero} perdida (outro worker pode refazê-lo)")
+        
+        async with SessaoNavegadorAsync(self.config) as sessao:
+            async def trabalhador():
+                nonlocal concluidos
+                while (item := await proximo()) is not None:
+                    try:
+                        intervalo = 1 / self.controle.taxa if self.controle.taxa else 0.0
+                        espera = await asyncio.to_thread(fila.reservar_consulta, intervalo)
+                        if espera > 0:
+                            self.metricas.observar("espera_fila", espera)
+                            await asyncio.sleep(espera)
+                        proc = await self.extrair_processo_async(item.numero, sessao)
+                        registro = processo_para_dict(proc, manter_texto=False)
+                        if proc.status in self.config.REPETIR_STATUS:
+                            self.metricas.contar("retentativas", motivo="fila")
+                            aceito = await asyncio.to_thread(fila.devolver, item, proc.erro, registro)
+                        else:
+                            aceito = await asyncio.to_thread(fila.concluir, item, registro)
+                    finally:
+                        em_voo.discard(item)
+                    if not aceito:
+                        # Outro worker assumiu o item depois que a concessão expirou
+                        print(f"   ⚠️ {item.numero}: concessão perdida, resultado descartado")
+                        continue
+                    concluidos += 1
+                    print(f"   [{concluidos}] {item.numero}: {proc.status} (tentativa {item.tentativa})")
+                    self._entregar(proc, saidas, armazenamento, ao_concluir)
             
-            if i < total:
-                print(f"   ⏳ Aguardando {self.config.DELAY_ENTRE_PROCESSOS}s...")
-                time.sleep(self.config.DELAY_ENTRE_PROCESSOS)
+            renovacao = asyncio.create_task(renovar_concessoes())
+            try:
+                await asyncio.gather(*(trabalhador() for _ in range(concorrencia)))
+            finally:
+                renovacao.cancel()
+                if armazenamento is not None:
+                    armazenamento.descarregar()
+                self._salvar_metricas()
         
-        return resultados
+        print(f"\n✅ Worker {worker}: {concluidos} processos, fila {fila.contagem()}")
+        return concluidos
+    
+    def extrair_fila(self, fila: FilaTrabalho, worker: Optional[str] = None,
+                     ao_concluir: Optional[Callable[[Processo], None]] = None,
+                     saidas: Iterable[SaidaRelatorio] = (),
+                     armazenamento: Optional[Any] = None) -> int:
+        """Invólucro síncrono de `extrair_fila_async`"""
+        return asyncio.run(self.extrair_fila_async(fila, worker, ao_concluir, list(saidas), armazenamento))
+    
+    def _salvar_metricas(self) -> None:
+        """Grava o relatório JSON e o arquivo do Prometheus com as métricas até agora"""
+        print(f"\n⚙️ Controle de taxa: {self.controle.descricao()}")
+        if not self.config.METRICAS:
+            return
+        try:
+            caminho_json, caminho_prom = self.metricas.salvar(self.config.ARQUIVO_METRICAS)
+        except OSError as e:
+            print(f"   ⚠️ Erro ao gravar métricas: {e}")
+            return
+        print(f"\n⏱️ Etapas mais lentas: {self.metricas.descricao()}")
+        print(f"⏱️ Métricas: {caminho_json} e {caminho_prom}")
+    
+    def _abrir_diario(self, processos: Any) -> Optional[DiarioExecucao]:
+        if not self.config.USAR_DIARIO:
+            return None
+        caminho = self.config.ARQUIVO_DIARIO
+        if isinstance(processos, (list, tuple)):
+            # Um diário por lista: retomar outro lote não herda resultados deste
+            lote = hashlib.sha1("\n".join(processos).encode()).hexdigest()[:12]
+            raiz, extensao = os.path.splitext(caminho)
+            caminho = f"{raiz}_{lote}{extensao}"
+        diario = DiarioExecucao(
+            caminho,
+            repetir_status=self.config.REPETIR_STATUS,
+            max_tentativas=self.config.MAX_TENTATIVAS
+        )
+        if len(diario):
+            print(f"📓 Diário de execução com {len(diario)} processos: {diario.contagem()}")
+        return diario
+    
+    def extrair_lote(self, processos: Iterable[str],
+                     ao_concluir: Optional[Callable[[Processo], None]] = None,
+                     saidas: Iterable[SaidaRelatorio] = (),
+                     armazenamento: Optional[Any] = None) -> List[Processo]:
+        """Extrai múltiplos processos (invólucro síncrono de `extrair_lote_async`)"""
+        return asyncio.run(self.extrair_lote_async(processos, ao_concluir, list(saidas), armazenamento))
     
     def gerar_relatorio(self, processos: List[Processo], nome: str = None) -> str:
         """Gera relatório Excel"""
@@ -523,76 +2610,66 @@ class ExtratorTJSP:
         
         caminho = os.path.join(self.config.DIR_SAIDA, nome)
         
-        dados = []
-        for p in processos:
-            dados.append({
-                "Processo": p.numero,
-                "Status": p.status,
-                "Classe": p.classe,
-                "Assunto": p.assunto,
-                "Foro": p.foro,
-                "Vara": p.vara,
-                "Juiz": p.juiz,
-                "Requerente": p.requerente,
-                "Advogados": ", ".join(p.advogados_requerente[:2]),
-                "Interessados": ", ".join(p.interessados[:2]),
-                "Credores": ", ".join(p.credores[:2]),
-                "Perito/Administrador": p.perito,
-                "Q1 - Bancos/Veículos": p.q01_bancos_veiculos,
-                "Q2 - Pedidos": p.q02_pedidos,
-                "Q3 - Garantias Extraconcursais": p.q03_garantias_extraconcursais,
-                "Q4 - Essencialidade": p.q04_essencialidade,
-                "Q5 - Teses": p.q05_teses,
-                "Q6 - Entendimento Tribunal": p.q06_entendimento,
-                "Q7 - Escritório": p.q07_escritorio,
-                "Q8 - Crédito Extraconcursal": p.q08_credito_extraconcursal,
-                "Q9 - Recursos": p.q09_recursos,
-                "Q10 - Bens vs Busca/Apreensão": p.q10_bens_busca,
-                "Q11 - Stay Period": p.q11_stay_period,
-                "Q12 - Executar Garantias": p.q12_executar_garantias,
-                "Q13 - Plano RJ": p.q13_plano_rj,
-                "Q14 - AGC/Mediação": p.q14_agc_mediacao,
-                "Erro": p.erro
-            })
-        
-        df = pd.DataFrame(dados)
+        dados = [linha_relatorio(p) for p in processos]
+        
+        df = pd.DataFrame(dados, columns=COLUNAS_RELATORIO)
         df.to_excel(caminho, index=False)
         print(f"\n💾 Relatório salvo: {caminho}")
         
         return caminho
     
-    def gerar_resumo(self, processos: List[Processo]) -> Dict:
-        """Gera resumo estatístico das 14 questões"""
-        sucesso = [p for p in processos if p.status == "Sucesso"]
-        total = len(sucesso)
-        
-        if total == 0:
-            return {"total": 0, "sucesso": 0}
-        
-        resumo = {
-            "total_processos": len(processos),
-            "extraidos_sucesso": total,
-            "questoes": {
-                "Q1_bancos_veiculos": {
-                    "sim": len([p for p in sucesso if "SIM" in p.q01_bancos_veiculos]),
-                    "percentual": f"{len([p for p in sucesso if 'SIM' in p.q01_bancos_veiculos])/total*100:.1f}%"
-                },
-                "Q3_garantias": {
-                    "sim": len([p for p in sucesso if p.q03_garantias_extraconcursais == "SIM"]),
-                    "percentual": f"{len([p for p in sucesso if p.q03_garantias_extraconcursais == 'SIM'])/total*100:.1f}%"
-                },
-                "Q4_essencialidade": {
-                    "sim": len([p for p in sucesso if p.q04_essencialidade == "SIM"]),
-                    "percentual": f"{len([p for p in sucesso if p.q04_essencialidade == 'SIM'])/total*100:.1f}%"
-                },
-                "Q11_stay_period": {
-                    "ativo": len([p for p in sucesso if p.q11_stay_period in ["Ativo", "Prorrogado"]]),
-                    "percentual": f"{len([p for p in sucesso if p.q11_stay_period in ['Ativo', 'Prorrogado']])/total*100:.1f}%"
-                }
-            }
-        }
+    def abrir_saida(self, formato: str = "xlsx", nome: str = None) -> SaidaRelatorio:
+        """Abre uma saída em fluxo do relatório em `DIR_SAIDA`
         
-        return resumo
+        Formatos: "xlsx", "csv", "jsonl" ou "parquet". Passe a saída em
+        `extrair_lote(..., saidas=[...])` para gravar cada processo assim que
+        ele termina.
+        """
+        if not nome:
+            nome = f"relatorio_jurimetria_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{formato}"
+        caminho = os.path.join(self.config.DIR_SAIDA, nome)
+        print(f"\n💾 Relatório em fluxo: {caminho}")
+        return abrir_saida(caminho, COLUNAS_RELATORIO, formato)
+    
+    def gerar_resumo(self, processos: Iterable[Processo]) -> Dict:
+        """Gera resumo estatístico das 14 questões"""
+        agregador = AgregadorResumo()
+        for p in processos:
+            agregador.adicionar(p)
+        return agregador.resumo()
+
+
+# =============================================================================
+# REANÁLISE EM PARALELO
+# =============================================================================
+
+# Extrator de cada processo worker, criado uma vez em `_iniciar_worker_analise`
+_extrator_worker: Optional[ExtratorTJSP] = None
+
+
+def _em_lotes(itens: Iterable[str], tamanho: int) -> Iterator[List[str]]:
+    """Divide um iterável em listas de até `tamanho` itens, sob demanda"""
+    iterador = iter(itens)
+    while True:
+        lote = list(islice(iterador, tamanho))
+        if not lote:
+            return
+        yield lote
+
+
+def _iniciar_worker_analise(config: Config) -> None:
+    global _extrator_worker
+    _extrator_worker = ExtratorTJSP.leitor_cache(config)
+
+
+def _reanalisar_lote(numeros: List[str], manter_texto: bool) -> List[Processo]:
+    """Executado no worker: reconstrói e analisa um lote a partir do cache"""
+    resultado = []
+    for proc in _extrator_worker.reconstruir_do_cache(numeros):
+        if not manter_texto:
+            proc.compactar("descartar")
+        resultado.append(proc)
+    return resultado
 
 
 # =============================================================================
@@ -610,22 +2687,19 @@ def main():
     # Configuração
     config = Config(HEADLESS=True)
     
-    # Extrator
-    extrator = ExtratorTJSP(config)
-    
     print("\n" + "="*60)
     print("   EXTRATOR JURIMÉTRICO v2.0 - RECUPERAÇÃO JUDICIAL")
     print("   Respondendo às 14 Questões do Plano de Estudo")
     print("="*60)
     
-    # Extração
-    resultados = extrator.extrair_lote(PROCESSOS)
-    
-    # Relatório
-    arquivo = extrator.gerar_relatorio(resultados)
+    # Extração (resumo atualizado a cada processo concluído) e relatório
+    agregador = AgregadorResumo()
+    with ExtratorTJSP(config) as extrator:
+        resultados = extrator.extrair_lote(PROCESSOS, ao_concluir=agregador.adicionar)
+        arquivo = extrator.gerar_relatorio(resultados)
     
     # Resumo
-    resumo = extrator.gerar_resumo(resultados)
+    resumo = agregador.resumo()
     
     print("\n" + "="*60)
     print("   📊 RESUMO")
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+FILA DE TRABALHO - BACKLOG COMPARTILHADO ENTRE VÁRIOS WORKERS
+================================================================================
+Vários extratores, em processos ou máquinas diferentes, consomem o mesmo
+backlog de números de processo:
+
+- `obter` entrega itens com uma concessão (lease) por tempo limitado e um
+  token; um worker que morre deixa a concessão expirar e o item volta para
+  a fila automaticamente;
+- `concluir` só vale com o token da concessão atual e ignora repetições,
+  de modo que um item é concluído uma única vez mesmo se dois workers o
+  processarem;
+- `devolver` recoloca na fila um item que falhou, até `max_tentativas`
+  (contando também as concessões expiradas), e depois o marca como falho;
+- `reservar_consulta` distribui no tempo o início das consultas de todos os
+  workers, impondo um único limite global de taxa ao portal.
+
+O backend é plugável: `FilaTrabalho` define o contrato e `FilaSQLite`, a
+implementação local (processos de uma máquina ou um diretório compartilhado
+com locks confiáveis). Outros backends (Redis, Postgres) entram em `FILAS`.
+
+    fila = abrir_fila("sqlite:///resultados/fila.sqlite")
+    fila.enfileirar(numeros)
+    extrator.extrair_fila(fila)   # em cada worker
+================================================================================
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+# Estados de um item
+PENDENTE = "pendente"
+EM_ANDAMENTO = "em_andamento"
+CONCLUIDO = "concluido"
+FALHOU = "falhou"
+
+_LOTE_INSERCAO = 1000
+
+
+@dataclass(frozen=True)
+class ItemFila:
+    """Item concedido a um worker: vale enquanto o token for o atual"""
+    numero: str
+    token: str
+    tentativa: int
+
+
+class FilaTrabalho:
+    """Contrato dos backends da fila de trabalho
+
+    Todas as operações devem ser atômicas entre workers concorrentes.
+    """
+
+    def __init__(self, max_tentativas: int = 3):
+        self.max_tentativas = max_tentativas
+
+    def __enter__(self) -> "FilaTrabalho":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    def enfileirar(self, numeros: Iterable[str]) -> int:
+        """Acrescenta números ainda desconhecidos da fila; devolve quantos entraram"""
+        raise NotImplementedError
+
+    def obter(self, worker: str, quantidade: int = 1, lease_s: float = 300) -> List[ItemFila]:
+        """Concede até `quantidade` itens pendentes ou com concessão expirada"""
+        raise NotImplementedError
+
+    def renovar(self, itens: Iterable[ItemFila], lease_s: float = 300) -> List[ItemFila]:
+        """Estende as concessões; devolve os itens cuja concessão já foi perdida"""
+        raise NotImplementedError
+
+    def concluir(self, item: ItemFila, resultado: Optional[Dict] = None) -> bool:
+        """Marca o item como concluído; False se a concessão não é mais deste worker"""
+        raise NotImplementedError
+
+    def devolver(self, item: ItemFila, erro: str = "", resultado: Optional[Dict] = None) -> bool:
+        """Devolve o item que falhou à fila (ou o marca como falho após `max_tentativas`)"""
+        raise NotImplementedError
+
+    def reservar_consulta(self, intervalo: float) -> float:
+        """Reserva o próximo horário livre de consulta; devolve quantos segundos esperar"""
+        raise NotImplementedError
+
+    def contagem(self) -> Dict[str, int]:
+        """Quantidade de itens em cada estado"""
+        raise NotImplementedError
+
+    def resultados(self) -> Iterator[Dict]:
+        """Resultados gravados pelos workers nos itens concluídos ou falhos"""
+        raise NotImplementedError
+
+    def fechar(self) -> None:
+        pass
+
+
+class FilaSQLite(FilaTrabalho):
+    """Fila de trabalho em um arquivo SQLite (WAL), segura entre processos
+
+    Cada operação que muda a fila roda em uma transação `BEGIN IMMEDIATE`,
+    que serializa os workers no lock de escrita do banco.
+    """
+
+    def __init__(self, caminho: str, max_tentativas: int = 3, timeout: float = 30.0):
+        super().__init__(max_tentativas)
+        self.caminho = caminho
+        if os.path.dirname(caminho):
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        self._trava = threading.Lock()
+        self._db = sqlite3.connect(caminho, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._db.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS itens (
+                numero TEXT PRIMARY KEY,
+                estado TEXT NOT NULL DEFAULT 'pendente',
+                tentativas INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                token TEXT,
+                lease_ate REAL,
+                atualizado_em REAL,
+                erro TEXT,
+                resultado TEXT
+            );
+            CREATE INDEX IF NOT EXISTS itens_estado ON itens (estado, lease_ate);
+            CREATE TABLE IF NOT EXISTS taxa (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                proxima REAL NOT NULL
+            );
+        """)
+
+    def _transacao(self, operacao):
+        with self._trava:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                resultado = operacao(self._db)
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+            return resultado
+
+    def enfileirar(self, numeros: Iterable[str]) -> int:
+        iterador = iter(numeros)
+        inseridos = 0
+        while True:
+            lote = [(n.strip(),) for n in islice(iterador, _LOTE_INSERCAO) if n.strip()]
+            if not lote:
+                return inseridos
+
+            def inserir(db):
+                antes = db.total_changes
+                agora = time.time()
+                db.executemany("INSERT OR IGNORE INTO itens (numero, atualizado_em) VALUES (?, ?)",
+                               [(numero, agora) for numero, in lote])
+                return db.total_changes - antes
+            inseridos += self._transacao(inserir)
+
+    def obter(self, worker: str, quantidade: int = 1, lease_s: float = 300) -> List[ItemFila]:
+        def conceder(db):
+            agora = time.time()
+            itens = []
+            # Itens esgotados saem da seleção como falhos: continua até conceder
+            # `quantidade` itens ou não restar nada pendente nem expirado
+            while len(itens) < max(1, quantidade):
+                linhas = db.execute(
+                    "SELECT numero, tentativas FROM itens "
+                    "WHERE estado = ? OR (estado = ? AND lease_ate < ?) ORDER BY rowid LIMIT ?",
+                    (PENDENTE, EM_ANDAMENTO, agora, max(1, quantidade) - len(itens))
+                ).fetchall()
+                if not linhas:
+                    break
+                for numero, tentativas in linhas:
+                    if 0 < self.max_tentativas <= tentativas:
+                        # Concessões expiradas em excesso: o worker morre sempre neste item
+                        db.execute("UPDATE itens SET estado = ?, token = NULL, atualizado_em = ?, "
+                                   "erro = 'Concessão expirada em todas as tentativas' WHERE numero = ?",
+                                   (FALHOU, agora, numero))
+                        continue
+                    token = uuid.uuid4().hex
+                    db.execute("UPDATE itens SET estado = ?, tentativas = tentativas + 1, worker = ?, token = ?, "
+                               "lease_ate = ?, atualizado_em = ? WHERE numero = ?",
+                               (EM_ANDAMENTO, worker, token, agora + lease_s, agora, numero))
+                    itens.append(ItemFila(numero, token, tentativas + 1))
+            return itens
+        return self._transacao(conceder)
+
+    def renovar(self, itens: Iterable[ItemFila], lease_s: float = 300) -> List[ItemFila]:
+        itens = list(itens)
+        if not itens:
+            return []
+
+        def estender(db):
+            ate = time.time() + lease_s
+            perdidos = []
+            for item in itens:
+                cursor = db.execute("UPDATE itens SET lease_ate = ? WHERE numero = ? AND token = ? AND estado = ?",
+                                    (ate, item.numero, item.token, EM_ANDAMENTO))
+                if cursor.rowcount == 0:
+                    perdidos.append(item)
+            return perdidos
+        return self._transacao(estender)
+
+    def concluir(self, item: ItemFila, resultado: Optional[Dict] = None) -> bool:
+        def marcar(db):
+            cursor = db.execute(
+                "UPDATE itens SET estado = ?, token = NULL, lease_ate = NULL, atualizado_em = ?, erro = NULL, "
+                "resultado = ? WHERE numero = ? AND token = ? AND estado = ?",
+                (CONCLUIDO, time.time(), _json(resultado), item.numero, item.token, EM_ANDAMENTO))
+            return cursor.rowcount == 1
+        return self._transacao(marcar)
+
+    def devolver(self, item: ItemFila, erro: str = "", resultado: Optional[Dict] = None) -> bool:
+        def marcar(db):
+            esgotado = 0 < self.max_tentativas <= item.tentativa
+            cursor = db.execute(
+                "UPDATE itens SET estado = ?, token = NULL, lease_ate = NULL, atualizado_em = ?, erro = ?, "
+                "resultado = ? WHERE numero = ? AND token = ? AND estado = ?",
+                (FALHOU if esgotado else PENDENTE, time.time(), erro, _json(resultado),
+                 item.numero, item.token, EM_ANDAMENTO))
+            return cursor.rowcount == 1
+        return self._transacao(marcar)
+
+    def reservar_consulta(self, intervalo: float) -> float:
+        if intervalo <= 0:
+            return 0.0
+
+        def reservar(db):
+            agora = time.time()
+            linha = db.execute("SELECT proxima FROM taxa WHERE id = 1").fetchone()
+            horario = max(agora, linha[0] if linha else agora)
+            db.execute("INSERT OR REPLACE INTO taxa (id, proxima) VALUES (1, ?)", (horario + intervalo,))
+            return horario - agora
+        return self._transacao(reservar)
+
+    def contagem(self) -> Dict[str, int]:
+        with self._trava:
+            return dict(self._db.execute("SELECT estado, COUNT(*) FROM itens GROUP BY estado").fetchall())
+
+    def resultados(self) -> Iterator[Dict]:
+        with self._trava:
+            linhas = self._db.execute(
+                "SELECT numero, resultado FROM itens WHERE estado IN (?, ?) AND resultado IS NOT NULL "
+                "ORDER BY rowid", (CONCLUIDO, FALHOU)).fetchall()
+        for numero, resultado in linhas:
+            yield json.loads(resultado)
+
+    def fechar(self) -> None:
+        with self._trava:
+            self._db.close()
+
+
+def _json(resultado: Optional[Dict]) -> Optional[str]:
+    return json.dumps(resultado, ensure_ascii=False) if resultado is not None else None
+
+
+FILAS = {
+    "sqlite": FilaSQLite,
+}
+
+
+def abrir_fila(endereco: str, max_tentativas: int = 3) -> FilaTrabalho:
+    """Abre a fila de um endereço `<backend>://<destino>` (ou caminho de um arquivo SQLite)"""
+    backend, separador, destino = endereco.partition("://")
+    if not separador:
+        return FilaSQLite(endereco, max_tentativas=max_tentativas)
+    if backend not in FILAS:
+        raise ValueError(f"Backend de fila desconhecido: {backend!r} (use {', '.join(FILAS)})")
+    if backend == "sqlite" and destino.startswith("/"):
+        # Como no SQLAlchemy: sqlite:///relativo.sqlite e sqlite:////absoluto.sqlite
+        destino = destino[1:]
+    return FILAS[backend](destino, max_tentativas=max_tentativas)
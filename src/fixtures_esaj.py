@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+FIXTURES DO E-SAJ - PÁGINAS SINTÉTICAS E SERVIDOR LOCAL
+================================================================================
+Gera páginas de processo no formato do cpopg (mesmos ids de cabeçalho e de
+tabelas lidos por `busca_http.ParserPaginaESAJ` e pelo script da página),
+com número de movimentações, de partes e tamanho do corpo configuráveis, e
+as serve por HTTP em 127.0.0.1 para medir o extrator sem acessar o TJSP.
+
+A página de cada número é determinística (semente derivada do número), de
+modo que o servidor responde a qualquer número sintético sem guardá-lo.
+Páginas reais salvas (`<numero>.html` em um diretório) têm precedência. As
+pesquisas por parte, advogado, OAB ou documento devolvem listas de
+resultados paginadas, também determinísticas para o valor pesquisado (com
+um único resultado, o servidor redireciona à página do processo, como o
+cpopg). Com
+`recursos_por_processo`, o servidor também imita o cposg: a busca por um
+número sintético devolve a página do recurso (se houver um só) ou a lista
+dos recursos, cujas páginas são abertas por show.do.
+
+    with ServidorESAJ(PerfilSintetico(movimentacoes=200)) as servidor:
+        cliente = ClienteESAJ(servidor.url_1grau)
+        html, dados = cliente.consultar(numero_sintetico(1))
+================================================================================
+"""
+
+import html as html_lib
+import os
+import random
+import threading
+import zlib
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import parse_qs, quote_plus, urlsplit
+
+
+@dataclass(frozen=True)
+class PerfilSintetico:
+    """Escala das páginas geradas"""
+    movimentacoes: int = 50
+    partes: int = 10  # requerente + interessados/credores
+    corpo_kb: float = 20  # texto extra do corpo da página (petições, decisões)
+
+
+PERFIL_PADRAO = PerfilSintetico()
+
+_CLASSES = ["Recuperação Judicial", "Tutela Cautelar Antecedente", "Falência de Empresários",
+            "Recuperação Extrajudicial"]
+_ASSUNTOS = ["Recuperação judicial e Falência", "Concurso de Credores", "Administração judicial"]
+_FOROS = ["Foro Central Cível", "Foro de Osasco", "Foro de Campinas", "Foro de Guarulhos",
+          "Foro de Ribeirão Preto", "Foro de Barueri"]
+_VARAS = ["1ª Vara de Falências e Recuperações Judiciais", "2ª Vara de Falências e Recuperações Judiciais",
+          "1ª Vara Cível", "2ª Vara Cível", "3ª Vara Cível"]
+_JUIZES = ["Ana Paula Souza", "Carlos Eduardo Lima", "Marcia Ferreira", "João Batista Rocha"]
+_EMPRESAS = ["Metalcore", "Transportes Rodovia", "Locadora Pesados", "Agro Norte", "Construtora Alfa",
+             "Logística Sul", "Frota Brasil", "Mineração Serra"]
+_CREDORES = ["Banco Bradesco S/A", "Itaú Unibanco S/A", "Banco Santander (Brasil) S/A",
+             "Caixa Econômica Federal", "Banco Safra S/A", "FIDC Crédito Pesado",
+             "Scania Banco S/A", "Volvo Financial Services", "Mercedes-Benz Leasing", "Mills Pesados S/A"]
+_ADVOGADOS = ["Gustavo Bismarchi Motta", "Renata Almeida", "Paulo Henrique Dias", "Luiza Martins"]
+_MOVIMENTOS = [
+    ("Decisão", "Deferido o processamento da recuperação judicial. Stay period de 180 dias."),
+    ("Decisão", "Reconhecida a essencialidade dos caminhões e equipamentos da frota."),
+    ("Decisão", "Indeferida a busca e apreensão dos veículos alienados fiduciariamente."),
+    ("Despacho", "Manifeste-se a recuperanda sobre o pedido de prorrogação do prazo de suspensão."),
+    ("Juntada de Petição", "Apresentação do plano de recuperação judicial."),
+    ("Edital", "Convocação da assembleia geral de credores."),
+    ("Decisão", "Homologação do plano de recuperação judicial aprovado pelos credores."),
+    ("Certidão", "Interposição de agravo de instrumento pelo credor fiduciário."),
+    ("Ato Ordinatório", "Designada sessão de mediação entre a recuperanda e os bancos."),
+    ("Conclusos", "Conclusos para decisão."),
+]
+_FRASES = [
+    "A recuperanda sustenta a essencialidade dos bens para a continuidade da atividade empresarial.",
+    "O credor alega crédito extraconcursal garantido por alienação fiduciária, nos termos do art. 49, § 3º.",
+    "Requer a suspensão das execuções pelo prazo de 180 dias previsto no art. 6º da Lei 11.101/2005.",
+    "Os contratos de locação de equipamentos e caminhões estão vinculados a cessão fiduciária de recebíveis.",
+    "A trava bancária impede o acesso ao fluxo de caixa necessário ao cumprimento do plano.",
+    "O administrador judicial apresentou relatório mensal das atividades da devedora.",
+    "Não há nos autos comprovação de que os veículos sejam indispensáveis à operação.",
+]
+
+
+def numero_sintetico(i: int, foro: str = "0100") -> str:
+    """Número CNJ válido (dígitos verificadores corretos) do i-ésimo processo sintético"""
+    sequencial, ano = f"{i % 10_000_000:07d}", "2024"
+    base = int(f"{sequencial}{ano}826{foro}00")
+    digito = 98 - (base % 97)
+    return f"{sequencial}-{digito:02d}.{ano}.8.26.{foro}"
+
+
+def _e(texto: str) -> str:
+    return html_lib.escape(texto, quote=True)
+
+
+def _cabecalho(numero: str) -> Dict[str, str]:
+    """Classe, assunto, foro, vara e juiz do processo sintético (iguais na lista e na página)"""
+    rng = random.Random(zlib.crc32(b"cabecalho:" + numero.encode()))
+    return {"classe": rng.choice(_CLASSES), "assunto": rng.choice(_ASSUNTOS), "foro": rng.choice(_FOROS),
+            "vara": rng.choice(_VARAS), "juiz": rng.choice(_JUIZES)}
+
+
+def gerar_pagina(numero: str, perfil: PerfilSintetico = PERFIL_PADRAO) -> str:
+    """HTML de uma página de processo do cpopg, determinístico para o número"""
+    rng = random.Random(zlib.crc32(numero.encode()))
+    cabecalho = _cabecalho(numero)
+    empresa = f"{rng.choice(_EMPRESAS)} Ltda"
+    linhas_partes = [
+        f'<tr class="fundoClaro"><td><span class="tipoDeParticipacao">Reqte:</span></td>'
+        f'<td class="nomeParteEAdvogado">{_e(empresa)}<br>'
+        f'<span class="mensagemExibindo">Advogado:</span> {_e(rng.choice(_ADVOGADOS))}</td></tr>'
+    ]
+    for j in range(max(0, perfil.partes - 1)):
+        papel = "Credor" if j % 2 else "Interessado"
+        linhas_partes.append(
+            f'<tr class="fundoClaro"><td><span class="tipoDeParticipacao">{papel}:</span></td>'
+            f'<td class="nomeParteEAdvogado">{_e(rng.choice(_CREDORES))}<br>'
+            f'<span class="mensagemExibindo">Advogado:</span> {_e(rng.choice(_ADVOGADOS))}</td></tr>'
+        )
+    linhas_movs = []
+    for j in range(perfil.movimentacoes):
+        titulo, detalhe = rng.choice(_MOVIMENTOS)
+        data = f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.choice((2023, 2024, 2025))}"
+        documento = (f'<a class="linkMovVincProc" href="/pastadigital/abrirDocumentoVinculadoMovimentacao.do'
+                     f'?nuProcesso={numero}&cdDocumento={j}">{_e(titulo)}</a>'
+                     if j % 7 == 0 else _e(titulo))
+        linhas_movs.append(
+            f'<tr class="containerMovimentacao"><td class="dataMovimentacao">{data}</td><td></td>'
+            f'<td class="descricaoMovimentacao">{documento}<br>'
+            f'<span style="font-style: italic;">{_e(detalhe)}</span></td></tr>'
+        )
+    paragrafos = []
+    tamanho = 0
+    while tamanho < perfil.corpo_kb * 1024:
+        frase = " ".join(rng.choice(_FRASES) for _ in range(4))
+        paragrafos.append(f"<p>{_e(frase)}</p>")
+        tamanho += len(frase)
+    return (
+        '<!DOCTYPE html><html><head><title>Consulta de Processos de 1ºGrau</title>'
+        '<script>var contexto = "/cpopg";</script></head><body>'
+        '<div class="unj-entity-header"><div class="container">'
+        f'<div id="numeroProcesso">{numero}</div>'
+        f'<div id="classeProcesso">{_e(cabecalho["classe"])}</div>'
+        f'<div id="assuntoProcesso">{_e(cabecalho["assunto"])}</div>'
+        f'<div id="foroProcesso">{_e(cabecalho["foro"])}</div>'
+        f'<div id="varaProcesso">{_e(cabecalho["vara"])}</div>'
+        f'<div id="juizProcesso">{_e(cabecalho["juiz"])}</div>'
+        f'<div id="dataHoraDistribuicaoProcesso">{rng.randint(1, 28):02d}/03/2024 às 10:15 - Livre</div>'
+        '</div></div>'
+        f'<table id="tablePartesPrincipais">{"".join(linhas_partes)}</table>'
+        f'<table id="tabelaTodasMovimentacoes"><tbody>{"".join(linhas_movs)}</tbody></table>'
+        f'<div class="peticoes">{"".join(paragrafos)}</div>'
+        '</body></html>'
+    )
+
+
+def gerar_lista(valor: str, pagina: int = 1, total: int = 60, por_pagina: int = 25) -> str:
+    """Página `pagina` da lista de resultados de uma pesquisa, com `total` processos"""
+    primeiro = zlib.crc32(valor.encode()) % 1_000_000
+    inicio = (pagina - 1) * por_pagina
+    itens = []
+    for k in range(inicio, min(total, inicio + por_pagina)):
+        numero = numero_sintetico(primeiro + k)
+        cabecalho = _cabecalho(numero)
+        itens.append(
+            '<li><div class="home__lista-de-processos"><div class="row unj-ai-c">'
+            f'<a href="/cpopg/show.do?processo.codigo=SINT{primeiro + k}&amp;processo.foro=100" '
+            f'class="linkProcesso">{numero}</a>'
+            f'<div class="classeProcesso">{_e(cabecalho["classe"])}</div>'
+            f'<div class="assuntoProcesso">{_e(cabecalho["assunto"])}</div>'
+            f'<div class="dataLocalDistribuicaoProcesso">10/03/2024 - {_e(cabecalho["foro"])}</div>'
+            f'<div class="nomeParte">{_e(valor)}</div>'
+            '</div></div></li>'
+        )
+    proxima = ""
+    if inicio + por_pagina < total:
+        proxima = (f'<a class="unj-pagination__next" title="Próxima página" href="/cpopg/trocarPagina.do?'
+                   f'paginaConsulta={pagina + 1}&amp;dadosConsulta.valorConsulta={quote_plus(valor)}">&gt;</a>')
+    return (
+        '<html><body>'
+        f'<span id="contadorDeProcessos">{total} Processos encontrados</span>'
+        f'<ul class="unj-list-row">{"".join(itens)}</ul>'
+        f'<div id="paginacaoSuperior">{proxima}</div>'
+        '</body></html>'
+    )
+
+
+def numero_recurso(numero: str, k: int) -> str:
+    """Número do k-ésimo recurso sintético do processo no 2º grau (foro 0000)"""
+    return numero_sintetico(zlib.crc32(numero.encode()) % 1_000_000 + k, foro="0000")
+
+
+def gerar_recurso(numero: str, k: int) -> str:
+    """HTML da página do k-ésimo recurso do processo no cposg"""
+    rng = random.Random(zlib.crc32(f"recurso:{numero}:{k}".encode()))
+    return (
+        '<html><body><div class="unj-entity-header">'
+        f'<div id="numeroProcesso">{numero_recurso(numero, k)}</div>'
+        '<div id="classeProcesso">Agravo de Instrumento</div>'
+        f'<div id="situacaoProcesso">{rng.choice(["Em andamento", "Julgado", "Baixado"])}</div>'
+        f'<div id="orgaoJulgadorProcesso">{rng.randint(1, 2)}ª Câmara Reservada de Direito Empresarial</div>'
+        f'<div id="relatorProcesso">{_e(rng.choice(_JUIZES))}</div>'
+        '</div><table id="tabelaTodasMovimentacoes"><tbody>'
+        '<tr class="containerMovimentacao"><td class="dataMovimentacao">10/04/2024</td><td></td>'
+        '<td class="descricaoMovimentacao">Conclusos ao relator</td></tr>'
+        '</tbody></table></body></html>'
+    )
+
+
+def gerar_lista_recursos(numero: str, total: int) -> str:
+    """Lista de resultados do cposg com `total` recursos do processo"""
+    itens = "".join(
+        f'<li><a href="/cposg/show.do?processo.codigo=REC{k}&amp;processo.origem={numero}" '
+        f'class="linkProcesso">{numero_recurso(numero, k)}</a></li>'
+        for k in range(total)
+    )
+    return f'<html><body><ul class="unj-list-row">{itens}</ul></body></html>'
+
+
+def pagina_nao_encontrado() -> str:
+    return ('<html><body><table><tr><td id="mensagemRetorno">'
+            'Não existem informações disponíveis para os parâmetros informados.'
+            '</td></tr></table></body></html>')
+
+
+def paginas_salvas(diretorio: str) -> Dict[str, str]:
+    """Páginas reais salvas como `<numero>.html` no diretório"""
+    paginas = {}
+    for nome in sorted(os.listdir(diretorio)):
+        if nome.endswith(".html"):
+            with open(os.path.join(diretorio, nome), encoding="utf-8", errors="replace") as f:
+                paginas[nome[:-5]] = f.read()
+    return paginas
+
+
+def gerar_paginas(n: int, perfil: PerfilSintetico = PERFIL_PADRAO, inicio: int = 1) -> Iterator[Tuple[str, str]]:
+    """(numero, html) de `n` processos sintéticos, sob demanda"""
+    for i in range(inicio, inicio + n):
+        numero = numero_sintetico(i)
+        yield numero, gerar_pagina(numero, perfil)
+
+
+class ServidorESAJ:
+    """Servidor HTTP local que imita o search.do do cpopg
+
+    Responde à busca por número unificado com a página salva do número,
+    se houver, ou com a página sintética; números que não seguem o padrão
+    sintético (foro 0100, ano 2024) recebem a mensagem de "não encontrado".
+    Conta as requisições atendidas em `requisicoes`.
+    """
+
+    def __init__(self, perfil: PerfilSintetico = PERFIL_PADRAO, salvas: Optional[Dict[str, str]] = None,
+                 porta: int = 0, resultados_por_pesquisa: int = 60, recursos_por_processo: int = 0):
+        self.perfil = perfil
+        self.salvas = dict(salvas or {})
+        self.resultados_por_pesquisa = resultados_por_pesquisa
+        self.recursos_por_processo = recursos_por_processo
+        self.requisicoes = 0
+        self._trava = threading.Lock()
+        servidor = self
+
+        class Manipulador(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            wbufsize = 64 * 1024  # cabeçalho e corpo em um único envio (sem a espera do Nagle)
+
+            def do_GET(self):
+                with servidor._trava:
+                    servidor.requisicoes += 1
+                destino = servidor.redirecionamento(self.path)
+                if destino is not None:
+                    self.send_response(302)
+                    self.send_header("Location", destino)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                corpo = servidor.responder(self.path).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, *args):
+                pass
+
+        self._http = ThreadingHTTPServer(("127.0.0.1", porta), Manipulador)
+        self._http.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url_1grau(self) -> str:
+        host, porta = self._http.server_address[:2]
+        return f"http://{host}:{porta}/cpopg/open.do"
+
+    @property
+    def url_2grau(self) -> str:
+        host, porta = self._http.server_address[:2]
+        return f"http://{host}:{porta}/cposg/open.do"
+
+    def redirecionamento(self, caminho: str) -> Optional[str]:
+        """Destino do redirecionamento de uma pesquisa com um único resultado"""
+        partes = urlsplit(caminho)
+        valor = (parse_qs(partes.query).get("dadosConsulta.valorConsulta") or [""])[0]
+        if not valor or self.resultados_por_pesquisa != 1 or not partes.path.startswith("/cpopg/"):
+            return None
+        return f"/cpopg/show.do?processo.codigo=SINT{zlib.crc32(valor.encode()) % 1_000_000}&processo.foro=100"
+
+    def responder(self, caminho: str) -> str:
+        partes = urlsplit(caminho)
+        consulta = parse_qs(partes.query)
+        if partes.path.startswith("/cposg/"):
+            return self._responder_2grau(partes.path, consulta)
+        if partes.path.endswith("show.do"):
+            # Links das listas de resultados: SINT<i> é o i-ésimo processo sintético
+            codigo = (consulta.get("processo.codigo") or [""])[0]
+            if codigo.startswith("SINT") and codigo[4:].isdigit():
+                return gerar_pagina(numero_sintetico(int(codigo[4:])), self.perfil)
+            return pagina_nao_encontrado()
+        valor = (consulta.get("dadosConsulta.valorConsulta") or [""])[0]
+        if valor:
+            pagina = int((consulta.get("paginaConsulta") or ["1"])[0])
+            return gerar_lista(valor, pagina, self.resultados_por_pesquisa)
+        numero = (consulta.get("dadosConsulta.valorConsultaNuUnificado") or [""])[0]
+        if numero in self.salvas:
+            return self.salvas[numero]
+        if numero.endswith(".2024.8.26.0100"):
+            return gerar_pagina(numero, self.perfil)
+        return pagina_nao_encontrado()
+
+    def _responder_2grau(self, caminho: str, consulta: Dict) -> str:
+        if caminho.endswith("show.do"):
+            codigo = (consulta.get("processo.codigo") or [""])[0]
+            origem = (consulta.get("processo.origem") or [""])[0]
+            if codigo.startswith("REC") and codigo[3:].isdigit():
+                return gerar_recurso(origem, int(codigo[3:]))
+            return pagina_nao_encontrado()
+        numero = (consulta.get("dePesquisaNuUnificado") or [""])[0]
+        if not numero.endswith(".2024.8.26.0100") or not self.recursos_por_processo:
+            return pagina_nao_encontrado()
+        if self.recursos_por_processo == 1:
+            return gerar_recurso(numero, 0)
+        return gerar_lista_recursos(numero, self.recursos_por_processo)
+
+    def __enter__(self) -> "ServidorESAJ":
+        self.iniciar()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    def iniciar(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._http.serve_forever, daemon=True, name="esaj-local")
+            self._thread.start()
+
+    def fechar(self) -> None:
+        if self._thread is not None:
+            self._http.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._http.server_close()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+MÉTRICAS - TEMPO POR ETAPA, CONTADORES E EXPORTAÇÃO DA EXECUÇÃO
+================================================================================
+Mede quanto tempo cada etapa da extração consome (navegação, leitura da
+página, interpretação das partes e movimentações, análise, 2º grau,
+documentos...), conta tentativas repetidas e erros por tipo e guarda um
+histograma de latência por etapa.
+
+Ao fim da execução as métricas são gravadas em dois formatos:
+
+- JSON: relatório da execução, com contagem, total, média, máximo e
+  quantis aproximados (p50/p95/p99) de cada etapa, além dos contadores;
+- texto do Prometheus: histogramas e contadores no formato de exposição,
+  pronto para o textfile collector do node_exporter.
+
+`perfilar` envolve um trecho (por exemplo, um único processo) no cProfile
+para análises detalhadas.
+================================================================================
+"""
+
+import cProfile
+import io
+import json
+import math
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# Limites dos intervalos dos histogramas, em segundos
+LIMITES_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Chave de um contador: nome e rótulos ordenados
+_ChaveContador = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class Histograma:
+    """Histograma cumulativo de latências, no modelo do Prometheus"""
+
+    def __init__(self, limites: Tuple[float, ...] = LIMITES_LATENCIA):
+        self.limites = tuple(limites)
+        self.contagens = [0] * (len(self.limites) + 1)  # o último intervalo é +Inf
+        self.n = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+
+    def observar(self, valor: float) -> None:
+        for i, limite in enumerate(self.limites):
+            if valor <= limite:
+                break
+        else:
+            i = len(self.limites)
+        self.contagens[i] += 1
+        self.n += 1
+        self.soma += valor
+        self.maximo = max(self.maximo, valor)
+
+    def quantil(self, q: float) -> float:
+        """Quantil aproximado por interpolação dentro do intervalo"""
+        if not self.n:
+            return 0.0
+        alvo = q * self.n
+        acumulado = 0
+        for i, contagem in enumerate(self.contagens):
+            if contagem and acumulado + contagem >= alvo:
+                inicio = self.limites[i - 1] if i else 0.0
+                fim = self.limites[i] if i < len(self.limites) else self.maximo
+                return min(self.maximo, inicio + (fim - inicio) * (alvo - acumulado) / contagem)
+            acumulado += contagem
+        return self.maximo
+
+    def mesclar(self, outro: "Histograma") -> None:
+        if outro.limites != self.limites:
+            raise ValueError("Histogramas com limites diferentes")
+        self.contagens = [a + b for a, b in zip(self.contagens, outro.contagens)]
+        self.n += outro.n
+        self.soma += outro.soma
+        self.maximo = max(self.maximo, outro.maximo)
+
+    def resumo(self) -> Dict[str, float]:
+        return {
+            "n": self.n,
+            "total_s": round(self.soma, 4),
+            "media_s": round(self.soma / self.n, 4) if self.n else 0.0,
+            "p50_s": round(self.quantil(0.50), 4),
+            "p95_s": round(self.quantil(0.95), 4),
+            "p99_s": round(self.quantil(0.99), 4),
+            "max_s": round(self.maximo, 4),
+        }
+
+
+class Metricas:
+    """Métricas de uma execução, seguras para threads e corrotinas
+
+    `etapa(nome)` cronometra um bloco e, se ele levantar uma exceção,
+    conta o erro com a etapa e o tipo da exceção. `contar` incrementa
+    contadores com rótulos (ex.: `contar("processos", status="Sucesso")`).
+    """
+
+    def __init__(self, prefixo: str = "jurimetria"):
+        self.prefixo = prefixo
+        self.inicio = time.time()
+        self.etapas: Dict[str, Histograma] = {}
+        self.contadores: Dict[_ChaveContador, float] = {}
+        self._trava = threading.Lock()
+
+    @contextmanager
+    def etapa(self, nome: str) -> Iterator[None]:
+        inicio = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.erro(nome, e)
+            raise
+        finally:
+            self.observar(nome, time.perf_counter() - inicio)
+
+    def observar(self, nome: str, segundos: float) -> None:
+        with self._trava:
+            if nome not in self.etapas:
+                self.etapas[nome] = Histograma()
+            self.etapas[nome].observar(segundos)
+
+    def contar(self, nome: str, n: float = 1, **rotulos: str) -> None:
+        chave = (nome, tuple(sorted((k, str(v)) for k, v in rotulos.items())))
+        with self._trava:
+            self.contadores[chave] = self.contadores.get(chave, 0) + n
+
+    def erro(self, etapa: str, excecao: BaseException) -> None:
+        self.contar("erros", etapa=etapa, tipo=type(excecao).__name__)
+
+    def mesclar(self, outra: "Metricas") -> "Metricas":
+        """Soma as métricas de outra execução (ex.: de outro worker) a esta"""
+        with self._trava:
+            for nome, histograma in outra.etapas.items():
+                self.etapas.setdefault(nome, Histograma(histograma.limites)).mesclar(histograma)
+            for chave, valor in outra.contadores.items():
+                self.contadores[chave] = self.contadores.get(chave, 0) + valor
+        return self
+
+    # -- exportação -----------------------------------------------------------
+
+    def relatorio(self) -> Dict:
+        """Relatório da execução em estrutura serializável em JSON"""
+        with self._trava:
+            etapas = {nome: h.resumo() for nome, h in sorted(self.etapas.items())}
+            contadores: Dict[str, List[Dict]] = {}
+            for (nome, rotulos), valor in sorted(self.contadores.items()):
+                contadores.setdefault(nome, []).append({**dict(rotulos), "valor": valor})
+        return {
+            "inicio": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.inicio)),
+            "duracao_s": round(time.time() - self.inicio, 3),
+            "etapas": etapas,
+            "contadores": contadores,
+        }
+
+    def texto_prometheus(self) -> str:
+        """Métricas no formato de exposição em texto do Prometheus"""
+        linhas = []
+        nome_hist = f"{self.prefixo}_etapa_segundos"
+        with self._trava:
+            if self.etapas:
+                linhas.append(f"# HELP {nome_hist} Duração de cada etapa da extração.")
+                linhas.append(f"# TYPE {nome_hist} histogram")
+            for etapa, h in sorted(self.etapas.items()):
+                acumulado = 0
+                for limite, contagem in zip(list(h.limites) + [math.inf], h.contagens):
+                    acumulado += contagem
+                    le = "+Inf" if limite == math.inf else repr(limite)
+                    linhas.append(f'{nome_hist}_bucket{{etapa="{_escapar(etapa)}",le="{le}"}} {acumulado}')
+                linhas.append(f'{nome_hist}_sum{{etapa="{_escapar(etapa)}"}} {h.soma!r}')
+                linhas.append(f'{nome_hist}_count{{etapa="{_escapar(etapa)}"}} {h.n}')
+
+            por_nome: Dict[str, List[Tuple[Tuple[Tuple[str, str], ...], float]]] = {}
+            for (nome, rotulos), valor in sorted(self.contadores.items()):
+                por_nome.setdefault(nome, []).append((rotulos, valor))
+        for nome, valores in por_nome.items():
+            metrica = f"{self.prefixo}_{nome}_total"
+            linhas.append(f"# TYPE {metrica} counter")
+            for rotulos, valor in valores:
+                texto_rotulos = ",".join(f'{k}="{_escapar(v)}"' for k, v in rotulos)
+                linhas.append(f"{metrica}{{{texto_rotulos}}} {valor:g}" if rotulos else f"{metrica} {valor:g}")
+        return "\n".join(linhas) + "\n"
+
+    def salvar(self, caminho_base: str) -> Tuple[str, str]:
+        """Grava `<caminho_base>.json` e `<caminho_base>.prom` (substituição atômica)"""
+        if os.path.dirname(caminho_base):
+            os.makedirs(os.path.dirname(caminho_base), exist_ok=True)
+        caminho_json = caminho_base + ".json"
+        caminho_prom = caminho_base + ".prom"
+        _gravar_atomico(caminho_json, json.dumps(self.relatorio(), ensure_ascii=False, indent=2))
+        _gravar_atomico(caminho_prom, self.texto_prometheus())
+        return caminho_json, caminho_prom
+
+    def descricao(self, n: int = 6) -> str:
+        """As `n` etapas que mais consumiram tempo, para o log"""
+        with self._trava:
+            maiores = sorted(self.etapas.items(), key=lambda item: item[1].soma, reverse=True)[:n]
+        return ", ".join(f"{nome} {h.soma:.1f}s (n={h.n}, p95 {h.quantil(0.95):.2f}s)" for nome, h in maiores)
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _gravar_atomico(caminho: str, conteudo: str) -> None:
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        f.write(conteudo)
+    os.replace(temporario, caminho)
+
+
+@contextmanager
+def perfilar(caminho: Optional[str] = None, linhas: int = 30, ordem: str = "cumulative") -> Iterator[cProfile.Profile]:
+    """Executa o bloco sob o cProfile e imprime as funções mais custosas
+
+    Com `caminho`, grava também as estatísticas brutas (abra com
+    `python -m pstats` ou snakeviz). Só a thread que entra no bloco é
+    perfilada; o trabalho feito em pools de threads aparece como espera.
+    """
+    perfil = cProfile.Profile()
+    perfil.enable()
+    try:
+        yield perfil
+    finally:
+        perfil.disable()
+        if caminho:
+            if os.path.dirname(caminho):
+                os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            perfil.dump_stats(caminho)
+        saida = io.StringIO()
+        pstats.Stats(perfil, stream=saida).sort_stats(ordem).print_stats(linhas)
+        print(saida.getvalue())
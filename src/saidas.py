@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+SAÍDAS EM FLUXO - RELATÓRIOS GRAVADOS À MEDIDA QUE OS PROCESSOS TERMINAM
+================================================================================
+Cada saída recebe uma linha (dicionário coluna -> valor) por processo
+concluído e grava imediatamente ou em pequenos blocos, com memória constante.
+Se a execução for interrompida, o que já foi gravado continua legível:
+
+- CSV e JSONL: uma linha por processo, descarregada no disco a cada gravação;
+- Parquet: um diretório com um arquivo `parte-NNNNN.parquet` por bloco;
+- XLSX: planilha do openpyxl em modo write-only (só fica legível ao fechar).
+================================================================================
+"""
+
+import csv
+import json
+import os
+from typing import Dict, List, Optional
+
+import pandas as pd
+from openpyxl import Workbook
+
+
+class SaidaRelatorio:
+    """Base das saídas em fluxo; use como gerenciador de contexto"""
+
+    def __init__(self, caminho: str, colunas: List[str]):
+        self.caminho = caminho
+        self.colunas = list(colunas)
+        self.linhas_gravadas = 0
+
+    def __enter__(self) -> "SaidaRelatorio":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    def escrever(self, linha: Dict) -> None:
+        self._escrever([linha.get(c, "") for c in self.colunas])
+        self.linhas_gravadas += 1
+
+    def _escrever(self, valores: List) -> None:
+        raise NotImplementedError
+
+    def fechar(self) -> None:
+        pass
+
+
+class SaidaCSV(SaidaRelatorio):
+    """CSV com cabeçalho, descarregado a cada linha"""
+
+    def __init__(self, caminho: str, colunas: List[str]):
+        super().__init__(caminho, colunas)
+        self._arquivo = open(caminho, "w", newline="", encoding="utf-8")
+        self._escritor = csv.writer(self._arquivo)
+        self._escritor.writerow(self.colunas)
+
+    def _escrever(self, valores: List) -> None:
+        self._escritor.writerow(valores)
+        self._arquivo.flush()
+
+    def fechar(self) -> None:
+        if not self._arquivo.closed:
+            self._arquivo.close()
+
+
+class SaidaJSONL(SaidaRelatorio):
+    """Um objeto JSON por linha, descarregado a cada linha"""
+
+    def __init__(self, caminho: str, colunas: List[str]):
+        super().__init__(caminho, colunas)
+        self._arquivo = open(caminho, "w", encoding="utf-8")
+
+    def _escrever(self, valores: List) -> None:
+        self._arquivo.write(json.dumps(dict(zip(self.colunas, valores)), ensure_ascii=False) + "\n")
+        self._arquivo.flush()
+
+    def fechar(self) -> None:
+        if not self._arquivo.closed:
+            self._arquivo.close()
+
+
+class SaidaParquet(SaidaRelatorio):
+    """Diretório de arquivos Parquet, um por bloco de `linhas_por_parte` linhas
+
+    O diretório inteiro é lido com `pd.read_parquet(caminho)`. Requer o
+    pyarrow (ou fastparquet) instalado.
+    """
+
+    def __init__(self, caminho: str, colunas: List[str], linhas_por_parte: int = 5000):
+        super().__init__(caminho, colunas)
+        try:
+            pd.io.parquet.get_engine("auto")
+        except ImportError as e:
+            raise ImportError("Saída Parquet requer pyarrow: pip install pyarrow") from e
+        self.linhas_por_parte = max(1, linhas_por_parte)
+        self._buffer: List[List] = []
+        self._partes = 0
+        os.makedirs(caminho, exist_ok=True)
+
+    def _escrever(self, valores: List) -> None:
+        self._buffer.append(valores)
+        if len(self._buffer) >= self.linhas_por_parte:
+            self._descarregar()
+
+    def _descarregar(self) -> None:
+        if not self._buffer:
+            return
+        df = pd.DataFrame(self._buffer, columns=self.colunas)
+        df.to_parquet(os.path.join(self.caminho, f"parte-{self._partes:05d}.parquet"), index=False)
+        self._partes += 1
+        self._buffer = []
+
+    def fechar(self) -> None:
+        self._descarregar()
+
+
+class SaidaXLSX(SaidaRelatorio):
+    """Planilha Excel em modo write-only do openpyxl (memória constante)"""
+
+    def __init__(self, caminho: str, colunas: List[str]):
+        super().__init__(caminho, colunas)
+        self._livro: Optional[Workbook] = Workbook(write_only=True)
+        self._planilha = self._livro.create_sheet("Sheet1")
+        self._planilha.append(self.colunas)
+
+    def _escrever(self, valores: List) -> None:
+        self._planilha.append(valores)
+
+    def fechar(self) -> None:
+        if self._livro is not None:
+            self._livro.save(self.caminho)
+            self._livro = None
+
+
+SAIDAS = {
+    "csv": SaidaCSV,
+    "jsonl": SaidaJSONL,
+    "parquet": SaidaParquet,
+    "xlsx": SaidaXLSX,
+}
+
+
+def abrir_saida(caminho: str, colunas: List[str], formato: Optional[str] = None) -> SaidaRelatorio:
+    """Abre a saída adequada ao formato (ou à extensão do caminho)"""
+    formato = (formato or os.path.splitext(caminho)[1].lstrip(".")).lower()
+    if formato not in SAIDAS:
+        raise ValueError(f"Formato de saída desconhecido: {formato!r} (use {', '.join(SAIDAS)})")
+    return SAIDAS[formato](caminho, colunas)
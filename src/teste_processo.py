@@ -4,7 +4,9 @@ Teste simplificado para o processo 1001535-69.2025.8.26.0260
 """
 
 import re
+import sys
 import time
+from statistics import median
 from playwright.sync_api import sync_playwright
 
 PROCESSO = "1001535-69.2025.8.26.0260"
@@ -97,5 +99,35 @@ def testar_processo():
             browser.close()
             print("🏁 Teste finalizado")
 
+def comparar_latencia(repeticoes: int = 3):
+    """Mede o tempo por consulta no navegador com cada estratégia de navegação
+    
+    Uso: python teste_processo.py --latencia
+    """
+    from extrator_jurimetria import Config, ExtratorTJSP, SessaoNavegador
+    
+    estrategias = {
+        "formulário + pausas fixas": dict(NAVEGACAO="formulario", ESPERAS_FIXAS=True),
+        "formulário + esperas por evento": dict(NAVEGACAO="formulario", ESPERAS_FIXAS=False),
+        "URL direta + esperas por evento": dict(NAVEGACAO="direta", ESPERAS_FIXAS=False),
+    }
+    print(f"⏱️ Latência por consulta - {PROCESSO} ({repeticoes} repetições)")
+    for nome, opcoes in estrategias.items():
+        config = Config(HEADLESS=True, BACKEND_CONSULTA="navegador", USAR_CACHE=False,
+                        USAR_DIARIO=False, **opcoes)
+        tempos = []
+        with ExtratorTJSP(config) as extrator, SessaoNavegador(config) as sessao:
+            sessao.iniciar()
+            for _ in range(repeticoes):
+                inicio = time.perf_counter()
+                proc = extrator.extrair_processo(PROCESSO, sessao)
+                tempos.append(time.perf_counter() - inicio)
+        print(f"   {nome:<34} mediana {median(tempos):6.2f} s  "
+              f"(mín {min(tempos):.2f} s, máx {max(tempos):.2f} s) - {proc.status}")
+
+
 if __name__ == "__main__":
-    testar_processo()
+    if "--latencia" in sys.argv:
+        comparar_latencia()
+    else:
+        testar_processo()
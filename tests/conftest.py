@@ -0,0 +1,6 @@
+"""Configuração dos testes: os módulos do projeto ficam em src/, sem pacote"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
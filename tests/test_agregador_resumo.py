@@ -0,0 +1,67 @@
+"""Resumo incremental: agregadores parciais, serialização e gravação"""
+
+import json
+import pickle
+
+import pytest
+
+from busca_http import interpretar_pagina
+from extrator_jurimetria import AgregadorResumo, Analisador, ExtratorTJSP, Processo
+from fixtures_esaj import PerfilSintetico, gerar_paginas
+
+
+@pytest.fixture(scope="module")
+def processos():
+    analisador = Analisador(referencia="2025-03-01")
+    processos = []
+    for i, (numero, html) in enumerate(gerar_paginas(30, PerfilSintetico(movimentacoes=20, corpo_kb=2))):
+        dados = interpretar_pagina(html)
+        proc = Processo(numero=numero, status="Sucesso", classe=dados["classe"], assunto=dados["assunto"],
+                        foro=("Foro Central", "Foro de Santo Amaro", "")[i % 3], vara=f"{i % 2 + 1}ª Vara",
+                        juiz=dados["juiz"], texto_completo=dados["texto"])
+        ExtratorTJSP._interpretar_partes(dados["partes"], proc)
+        ExtratorTJSP._interpretar_movimentacoes(dados["movimentacoes"], proc)
+        processos.append(analisador.analisar(proc))
+    processos.insert(7, Processo(numero="falhou-1", status="Erro: timeout"))
+    processos.append(Processo(numero="falhou-2", status="Não encontrado"))
+    return processos
+
+
+def agregar(processos):
+    agregador = AgregadorResumo()
+    for proc in processos:
+        agregador.adicionar(proc)
+    return agregador
+
+
+def test_mesclar_parciais_equivale_a_uma_passada(processos):
+    inteiro = agregar(processos)
+    partes = [agregar(processos[i::3]) for i in range(3)]
+    mesclado = partes[0].mesclar(partes[1]).mesclar(partes[2])
+    assert (mesclado.total, mesclado.sucesso) == (len(processos), len(processos) - 2)
+    assert mesclado.resumo() == inteiro.resumo()
+    assert mesclado.resumo()["por_foro"]["Não informado"]["total"] == 10
+
+
+def test_serializado_continua_agregando(processos):
+    metade = len(processos) // 2
+    agregador = pickle.loads(pickle.dumps(agregar(processos[:metade])))
+    # Valores novos de recorte ainda criam seus contadores após a desserialização
+    for proc in processos[metade:]:
+        agregador.adicionar(proc)
+    agregador.adicionar(Processo(numero="novo", status="Sucesso", foro="Foro Regional"))
+    esperado = agregar(processos + [Processo(numero="novo", status="Sucesso", foro="Foro Regional")])
+    assert agregador.resumo() == esperado.resumo()
+
+
+def test_salvar_grava_o_resumo_atual(tmp_path, processos):
+    agregador = agregar(processos)
+    caminho = agregador.salvar(str(tmp_path / "resumo.json"))
+    with open(caminho, encoding="utf-8") as f:
+        assert json.load(f) == json.loads(json.dumps(agregador.resumo()))
+    assert not (tmp_path / "resumo.json.tmp").exists()
+
+    vazio = AgregadorResumo()
+    vazio.adicionar(Processo(numero="x", status="Erro"))
+    with open(vazio.salvar(caminho), encoding="utf-8") as f:
+        assert json.load(f) == {"total": 0, "sucesso": 0}
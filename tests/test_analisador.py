@@ -0,0 +1,79 @@
+"""Analisador: busca de termos em uma passada e análise vetorizada"""
+
+import random
+
+import pytest
+
+from busca_http import interpretar_pagina
+from extrator_jurimetria import Analisador, BuscadorTermos, ExtratorTJSP, Processo, normalizar_busca
+from fixtures_esaj import PerfilSintetico, gerar_paginas
+
+
+@pytest.mark.parametrize("semente", range(20))
+def test_buscador_equivale_a_in_com_termos_aleatorios(semente):
+    rng = random.Random(semente)
+    alfabeto = "abc "
+    termos = {"".join(rng.choice(alfabeto) for _ in range(rng.randint(1, 5))).strip() or "a"
+              for _ in range(rng.randint(1, 15))}
+    buscador = BuscadorTermos(termos)
+    for _ in range(50):
+        texto = "".join(rng.choice(alfabeto) for _ in range(rng.randint(0, 40)))
+        assert buscador.buscar(texto) == {t for t in termos if t in texto}
+
+
+def test_buscador_equivale_a_in_nos_termos_do_analisador():
+    termos = (Analisador.BANCOS + Analisador.VEICULOS + Analisador.ESSENCIALIDADE + Analisador.GARANTIAS
+              + Analisador.STAY + Analisador.TERMOS_TEXTO + Analisador.TERMOS_MOVIMENTACOES)
+    buscador = BuscadorTermos(termos)
+    normalizados = {normalizar_busca(t) for t in termos}
+    for _, html in gerar_paginas(20, PerfilSintetico(movimentacoes=20, corpo_kb=2)):
+        texto = normalizar_busca(interpretar_pagina(html)["texto"])
+        assert buscador.buscar(texto) == {t for t in normalizados if t in texto}
+
+
+def test_normalizar_busca_remove_marcas_raras_e_preserva_outros_caracteres():
+    assert normalizar_busca("AÇÃO § 1º") == "acao § 1o"
+    assert normalizar_busca("Erdős – Łódź") == "erdos – łodz"
+
+
+def processos_sinteticos(n):
+    processos = []
+    for numero, html in gerar_paginas(n, PerfilSintetico(movimentacoes=30, corpo_kb=2)):
+        dados = interpretar_pagina(html)
+        proc = Processo(numero=numero, status="Sucesso", classe=dados["classe"], assunto=dados["assunto"],
+                        texto_completo=dados["texto"])
+        ExtratorTJSP._interpretar_partes(dados["partes"], proc)
+        ExtratorTJSP._interpretar_movimentacoes(dados["movimentacoes"], proc)
+        processos.append(proc)
+    return processos
+
+
+def processo(numero, *movimentacoes, recursos=()):
+    return Processo(numero=numero, recursos=list(recursos),
+                    movimentacoes=[{"data": d, "descricao": t} for d, t in movimentacoes])
+
+
+def test_analisar_df_coincide_com_analisar():
+    analisador = Analisador(referencia="2025-03-01")
+    processos = processos_sinteticos(40) + [
+        processo("a", ("01/12/2024", "Deferido o processamento da recuperação judicial."),
+                 ("05/12/2024", "Manifeste-se sobre o pedido de prorrogação do prazo de suspensão.")),
+        processo("b", ("01/06/2024", "Deferido o processamento da recuperação judicial."),
+                 ("20/11/2024", "Defiro a prorrogação do stay period por mais 180 dias.")),
+        processo("c", ("", "Deferido o processamento da recuperação judicial.")),
+        processo("d", ("10/10/2024", "Não homologado o plano"), ("11/10/2024", "Plano apresentado")),
+        processo("e", ("31/02/2024", "Convocação da assembleia geral de credores.")),
+        processo("f", recursos=[{"numero": "1", "classe": "Agravo de Instrumento", "situacao": "Em andamento"}]),
+        processo("g"),
+    ]
+    df = analisador.analisar_df(Analisador.dataframe(processos))
+    for i, proc in enumerate(processos):
+        analisador.analisar(proc)
+        esperado = {q: getattr(proc, q) for q in df.columns}
+        assert df.iloc[i].to_dict() == esperado, proc.numero
+
+
+def test_analisar_df_exige_os_marcos():
+    df = Analisador.dataframe([processo("a", ("01/01/2024", "Deferido o processamento"))])
+    with pytest.raises(ValueError, match="marcos"):
+        Analisador().analisar_df(df.drop(columns=["eventos"]))
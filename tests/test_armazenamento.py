@@ -0,0 +1,29 @@
+"""Banco SQLite de processos: textos guardados uma vez e busca de texto"""
+
+import pytest
+
+from armazenamento import ArmazenamentoProcessos
+from extrator_jurimetria import Processo
+
+
+def processo(i):
+    return Processo(numero=f"000000{i}-00.2024.8.26.0100", status="Sucesso",
+                    texto_completo=f"Página do processo {i}: pedido de essencialidade",
+                    texto_documentos="Decisão sobre a garantia fiduciária" if i % 2 else "",
+                    movimentacoes=[{"data": "01/02/2024", "descricao": "Deferido o processamento"}])
+
+
+@pytest.mark.parametrize("indexar_texto", [True, False])
+def test_texto_da_pagina_guardado_so_na_tabela_textos(tmp_path, indexar_texto):
+    with ArmazenamentoProcessos(str(tmp_path / "banco.sqlite"), indexar_texto=indexar_texto) as banco:
+        banco.gravar([processo(i) for i in range(1, 4)])
+        colunas = {linha[1] for linha in banco._db.execute("PRAGMA table_info(processos)")}
+        assert not colunas & {"texto_completo", "texto_documentos"}
+        lido = banco.obter(processo(1).numero)
+        assert lido.texto_completo == processo(1).texto_completo
+        assert lido.texto_documentos == processo(1).texto_documentos
+        assert banco.buscar_texto("essencialidade", origem="pagina") == [processo(i).numero for i in (1, 2, 3)]
+        assert banco.buscar_texto("fiduciaria", origem="documentos") == [processo(i).numero for i in (1, 3)]
+        assert len(banco.buscar_texto("deferido")) == (3 if indexar_texto else 0)
+        assert banco.reindexar_texto() == 3
+        assert banco.buscar_texto("essencialidade") == [processo(i).numero for i in (1, 2, 3)]
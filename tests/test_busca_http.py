@@ -0,0 +1,172 @@
+"""Cliente HTTP do e-SAJ contra o servidor local de fixtures_esaj"""
+
+import pytest
+
+import asyncio
+import time
+
+from busca_http import ClienteESAJ, Pesquisa, interpretar_lista, interpretar_pagina
+from controle_taxa import ControladorTaxa, Disjuntor
+from extrator_jurimetria import Config, ExtratorTJSP
+from fixtures_esaj import ServidorESAJ, gerar_lista, gerar_pagina, numero_recurso, numero_sintetico
+
+
+class ControleFalso:
+    """Registra as chamadas que o cliente faz ao controle de taxa"""
+
+    def __init__(self):
+        self.esperas = 0
+        self.resultados = []
+
+    def aguardar(self):
+        self.esperas += 1
+
+    def registrar(self, sucesso, latencia):
+        self.resultados.append(sucesso)
+
+
+@pytest.fixture(scope="module")
+def servidor():
+    with ServidorESAJ(recursos_por_processo=3) as servidor:
+        yield servidor
+
+
+@pytest.fixture
+def cliente(servidor):
+    cliente = ClienteESAJ(servidor.url_1grau)
+    yield cliente
+    cliente.fechar()
+
+
+@pytest.fixture
+def cliente_2grau(servidor):
+    cliente = ClienteESAJ(servidor.url_2grau, segundo_grau=True)
+    yield cliente
+    cliente.fechar()
+
+
+def test_consultar_devolve_a_pagina_do_processo(cliente):
+    numero = numero_sintetico(7)
+    html, dados = cliente.consultar(numero)
+    assert html == gerar_pagina(numero)
+    assert dados["encontrado"]
+    assert dados == interpretar_pagina(gerar_pagina(numero))
+    assert numero in dados["texto"]
+    assert len(dados["movimentacoes"]) == 50
+
+
+def test_consultar_numero_inexistente_devolve_a_mensagem(cliente):
+    html, dados = cliente.consultar("0000001-00.2020.8.26.0001")
+    assert not dados["encontrado"]
+    assert "Não existem informações" in dados["mensagem"]
+
+
+def test_descobrir_percorre_as_paginas_sob_demanda(servidor, cliente):
+    paginas = []
+    resultados = list(cliente.descobrir(Pesquisa("parte", "Metalcore Ltda"),
+                                        antes_de_cada_pagina=lambda: paginas.append(1)))
+    assert len(resultados) == servidor.resultados_por_pesquisa
+    assert len({r["numero"] for r in resultados}) == len(resultados)
+    assert len(paginas) == 3
+    assert all(r["parte"] == "Metalcore Ltda" for r in resultados)
+
+    antes = servidor.requisicoes
+    assert len(list(cliente.descobrir(Pesquisa("parte", "Metalcore Ltda"), max_paginas=1))) == 25
+    primeiro = next(cliente.descobrir(Pesquisa("oab", "123456SP")))
+    assert primeiro["numero"]
+    assert servidor.requisicoes - antes == 2
+
+
+def test_descobrir_filtra_por_classe(cliente):
+    pesquisa = Pesquisa("parte", "Metalcore Ltda", classes=("Recuperação Judicial",))
+    resultados = list(cliente.descobrir(pesquisa))
+    assert resultados
+    assert all(r["classe"] == "Recuperação Judicial" for r in resultados)
+
+
+def test_consultar_recursos_abre_cada_recurso_da_lista(cliente_2grau):
+    numero = numero_sintetico(3)
+    recursos = cliente_2grau.consultar_recursos(numero)
+    assert [r["numero"] for r in recursos] == [numero_recurso(numero, k) for k in range(3)]
+    assert all(r["classe"] == "Agravo de Instrumento" and r["relator"] for r in recursos)
+
+
+def test_consultar_recursos_sem_resultado(cliente_2grau):
+    assert cliente_2grau.consultar_recursos("0000001-00.2020.8.26.0001") == []
+
+
+@pytest.mark.parametrize("total, esperados", [(1, 1), (ClienteESAJ.MAX_RECURSOS + 5, ClienteESAJ.MAX_RECURSOS)])
+def test_consultar_recursos_pagina_unica_e_limite(total, esperados):
+    with ServidorESAJ(recursos_por_processo=total) as servidor:
+        cliente = ClienteESAJ(servidor.url_2grau, segundo_grau=True)
+        assert len(cliente.consultar_recursos(numero_sintetico(3))) == esperados
+        cliente.fechar()
+
+
+def test_cada_requisicao_passa_pelo_controle(servidor):
+    controle = ControleFalso()
+    cliente = ClienteESAJ(servidor.url_1grau, controle=controle)
+    antes = servidor.requisicoes
+    cliente.consultar(numero_sintetico(1))
+    cliente.consultar_recursos(numero_sintetico(2))
+    cliente.fechar()
+    assert controle.esperas == servidor.requisicoes - antes == 2
+    assert controle.resultados == [True, True]
+
+
+def test_descobrir_pesquisa_com_resultado_unico_segue_o_redirecionamento():
+    with ServidorESAJ(resultados_por_pesquisa=1) as servidor:
+        cliente = ClienteESAJ(servidor.url_1grau)
+        resultados = list(cliente.descobrir(Pesquisa("documento", "12.345.678/0001-90")))
+        cliente.fechar()
+        assert servidor.requisicoes == 2
+    (numero,) = [r["numero"] for r in interpretar_lista(gerar_lista("12.345.678/0001-90", total=1))["resultados"]]
+    assert [r["numero"] for r in resultados] == [numero]
+    assert "show.do" in resultados[0]["link"]
+
+
+def controle_com_disjuntor_meio_aberto():
+    controle = ControladorTaxa(None, disjuntor=Disjuntor(falhas_para_abrir=1, pausa_s=0.05))
+    controle.registrar(False, 1.0)
+    assert controle.disjuntor.estado == Disjuntor.ABERTO
+    time.sleep(0.06)
+    return controle
+
+
+def test_descobrir_informa_cada_pagina_ao_controle(cliente):
+    controle = controle_com_disjuntor_meio_aberto()
+    # A primeira página é a sonda do disjuntor meio-aberto; o resultado dela o fecha
+    resultados = list(cliente.descobrir(Pesquisa("parte", "Metalcore Ltda"), controle=controle))
+    assert len(resultados) == 60
+    assert controle.disjuntor.estado == Disjuntor.FECHADO
+
+
+@pytest.fixture
+def extrator(servidor, tmp_path):
+    config = Config(URL_TJSP_1GRAU=servidor.url_1grau, DIR_SAIDA=str(tmp_path), DIR_PDFS=str(tmp_path / "pdfs"),
+                    USAR_CACHE=False, DELAY_ENTRE_PROCESSOS=0, METRICAS=False, FILA_DESCOBERTA=4)
+    with ExtratorTJSP(config) as extrator:
+        yield extrator
+
+
+def descobrir(extrator, pesquisas, max_paginas=None):
+    async def coletar():
+        return [n async for n in extrator.descobrir_async(pesquisas, max_paginas)]
+    return asyncio.run(asyncio.wait_for(coletar(), 30))
+
+
+def test_descobrir_async_remove_repetidos_entre_pesquisas(extrator):
+    numeros = descobrir(extrator, [Pesquisa("parte", "Metalcore Ltda"), Pesquisa("advogado", "Metalcore Ltda")])
+    assert len(numeros) == len(set(numeros)) == 60
+
+
+def test_descobrir_async_respeita_max_paginas(extrator):
+    numeros = descobrir(extrator, [Pesquisa("parte", "Metalcore Ltda"), Pesquisa("parte", "Agro Norte Ltda")],
+                        max_paginas=1)
+    assert len(numeros) == 50
+
+
+def test_descobrir_async_fecha_o_disjuntor_meio_aberto(extrator):
+    extrator.controle = controle_com_disjuntor_meio_aberto()
+    assert len(descobrir(extrator, [Pesquisa("parte", "Metalcore Ltda")])) == 60
+    assert extrator.controle.disjuntor.estado == Disjuntor.FECHADO
@@ -0,0 +1,92 @@
+"""Cache de páginas: validade, remoção dos menos acessados e modo somente leitura"""
+
+import os
+
+import pytest
+
+import cache_paginas
+from cache_paginas import CachePaginas
+
+
+class Relogio:
+    """`time.time` controlado pelo teste"""
+
+    def __init__(self, agora=1_000_000.0):
+        self.agora = agora
+
+    def __call__(self):
+        return self.agora
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(cache_paginas.time, "time", relogio)
+    return relogio
+
+
+def conteudo(i, kb=8):
+    # Hexadecimal aleatório: comprime para cerca de metade, tamanho previsível
+    return f"{i}:" + os.urandom(kb * 512).hex()
+
+
+def objetos_em_disco(diretorio):
+    return sorted(nome for _, _, nomes in os.walk(diretorio / "objetos") for nome in nomes)
+
+
+def test_pagina_expira_pelo_ttl(tmp_path, relogio):
+    cache = CachePaginas(str(tmp_path), ttl_horas=1)
+    cache.guardar("1", "<html>1</html>", "texto 1")
+    relogio.agora += 3599
+    assert cache.obter("1").texto == "texto 1"
+    relogio.agora += 2
+    assert cache.obter("1") is None
+    assert cache.obter("1", ignorar_ttl=True).html == "<html>1</html>"
+    cache.fechar()
+
+
+def test_remove_a_pagina_menos_acessada_e_seus_objetos(tmp_path, relogio):
+    # ~4,5 KB por objeto comprimido: com o texto compartilhado, cabem duas páginas em 16 KB
+    cache = CachePaginas(str(tmp_path), ttl_horas=0, tamanho_maximo_mb=16 / 1024)
+    compartilhado = conteudo("comum")
+    for numero in ("1", "2"):
+        relogio.agora += 1
+        cache.guardar(numero, conteudo(numero), compartilhado)
+    relogio.agora += 1
+    assert cache.obter("1") is not None  # "2" passa a ser o menos acessado
+    relogio.agora += 1
+    cache.guardar("3", conteudo("3"), compartilhado)
+
+    assert cache.numeros() == ["1", "3"]
+    assert cache.obter("3").texto == compartilhado
+    assert cache.tamanho() <= cache.tamanho_maximo
+    # Só o html de "2" ficou órfão; o texto compartilhado continua em disco
+    assert len(objetos_em_disco(tmp_path)) == 3
+    assert cache._db.execute("SELECT COUNT(*) FROM objetos").fetchone()[0] == 3
+    cache.fechar()
+
+
+def test_substituir_pagina_apaga_conteudo_antigo(tmp_path, relogio):
+    cache = CachePaginas(str(tmp_path), ttl_horas=0)
+    cache.guardar("1", "<html>v1</html>", "texto")
+    cache.guardar("1", "<html>v2</html>", "texto")
+    assert cache.obter("1").html == "<html>v2</html>"
+    assert len(objetos_em_disco(tmp_path)) == 2
+    cache.fechar()
+
+
+def test_somente_leitura_recusa_escrita_e_nao_registra_acesso(tmp_path, relogio):
+    escrita = CachePaginas(str(tmp_path), ttl_horas=0)
+    escrita.guardar("1", "<html>1</html>", "texto 1")
+    acessado_em = escrita._db.execute("SELECT acessado_em FROM paginas").fetchone()[0]
+
+    leitura = CachePaginas(str(tmp_path), ttl_horas=0, somente_leitura=True)
+    relogio.agora += 60
+    assert leitura.obter("1").texto == "texto 1"
+    with pytest.raises(RuntimeError):
+        leitura.guardar("2", "<html>2</html>", "texto 2")
+    leitura.fechar()
+
+    assert escrita.numeros() == ["1"]
+    assert escrita._db.execute("SELECT acessado_em FROM paginas").fetchone()[0] == acessado_em
+    escrita.fechar()
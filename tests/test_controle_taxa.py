@@ -0,0 +1,117 @@
+"""Disjuntor e ajuste AIMD da taxa de consultas"""
+
+import pytest
+
+import controle_taxa
+from controle_taxa import ControladorTaxa, Disjuntor, LimitadorTaxa
+
+
+class Relogio:
+    """`time.monotonic` controlado pelo teste"""
+
+    def __init__(self, agora=1_000.0):
+        self.agora = agora
+
+    def __call__(self):
+        return self.agora
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(controle_taxa.time, "monotonic", relogio)
+    return relogio
+
+
+def test_disjuntor_abre_apos_falhas_seguidas(relogio):
+    disjuntor = Disjuntor(falhas_para_abrir=3, pausa_s=10)
+    disjuntor.falha()
+    disjuntor.falha()
+    disjuntor.sucesso()  # zera a sequência
+    disjuntor.falha()
+    disjuntor.falha()
+    assert disjuntor.estado == Disjuntor.FECHADO
+    assert disjuntor.espera() == 0.0
+    disjuntor.falha()
+    assert disjuntor.estado == Disjuntor.ABERTO
+    assert disjuntor.aberturas == 1
+    assert disjuntor.espera() == pytest.approx(10)
+    relogio.agora += 4
+    assert disjuntor.espera() == pytest.approx(6)
+
+
+def test_meio_aberto_libera_uma_unica_sonda(relogio):
+    disjuntor = Disjuntor(falhas_para_abrir=1, pausa_s=10)
+    disjuntor.falha()
+    relogio.agora += 10
+    assert disjuntor.espera() == 0.0  # a sonda
+    assert disjuntor.estado == Disjuntor.MEIO_ABERTO
+    assert disjuntor.espera() > 0  # os demais aguardam o resultado dela
+    assert disjuntor.espera() > 0
+    disjuntor.sucesso()
+    assert disjuntor.estado == Disjuntor.FECHADO
+    assert disjuntor.espera() == 0.0
+
+
+def test_sonda_com_falha_reabre_com_pausa_dobrada(relogio):
+    disjuntor = Disjuntor(falhas_para_abrir=1, pausa_s=10, pausa_maxima_s=15)
+    disjuntor.falha()
+    relogio.agora += 10
+    assert disjuntor.espera() == 0.0
+    disjuntor.falha()
+    assert disjuntor.estado == Disjuntor.ABERTO
+    assert disjuntor.aberturas == 2
+    assert disjuntor.espera() == pytest.approx(15)  # 20 s limitados a pausa_maxima_s
+    relogio.agora += 15
+    assert disjuntor.espera() == 0.0
+    disjuntor.sucesso()
+    disjuntor.falha()
+    assert disjuntor.espera() == pytest.approx(10)  # o sucesso restaurou a pausa inicial
+
+
+def test_aimd_soma_nos_sucessos_rapidos_e_multiplica_nas_falhas(relogio):
+    controle = ControladorTaxa(1.0, taxa_minima=0.1, taxa_maxima=1.1, incremento=0.05,
+                               fator_reducao=0.5, latencia_alvo=5.0)
+    controle.registrar(True, 0.5)
+    assert controle.taxa == pytest.approx(1.05)
+    controle.registrar(True, 0.5)
+    controle.registrar(True, 0.5)
+    assert controle.taxa == pytest.approx(1.1)  # teto em taxa_maxima
+
+    controle.registrar(True, 8.0)  # sucesso lento conta como sinal de sobrecarga
+    assert controle.taxa == pytest.approx(0.55)
+    controle.registrar(False, 0.5)  # mesma janela de latencia_alvo: um só sinal
+    assert controle.taxa == pytest.approx(0.55)
+    assert controle.reducoes == 1
+
+    for _ in range(4):
+        relogio.agora += 5
+        controle.registrar(False, 0.5)
+    assert controle.taxa == pytest.approx(0.1)  # piso em taxa_minima
+    assert controle.reducoes == 5
+
+
+def test_taxa_fixa_so_alimenta_o_disjuntor(relogio):
+    controle = ControladorTaxa(1.0, adaptativo=False, disjuntor=Disjuntor(falhas_para_abrir=2))
+    controle.registrar(True, 0.1)
+    controle.registrar(False, 0.1)
+    controle.registrar(False, 0.1)
+    assert controle.taxa == 1.0
+    assert controle.disjuntor.estado == Disjuntor.ABERTO
+
+
+def test_aguardar_disjuntor_nao_gasta_ficha(relogio):
+    controle = ControladorTaxa(1.0)
+    for _ in range(10):
+        controle.aguardar_disjuntor()
+    assert controle.limitador._reservar() == 0.0  # a ficha da rajada continua lá
+    assert controle.limitador._reservar() == pytest.approx(1.0)
+
+
+def test_limitador_espera_proporcional_as_fichas(relogio):
+    limitador = LimitadorTaxa(2.0, rajada=4)
+    assert limitador._reservar(4) == 0.0
+    assert limitador._reservar(1) == pytest.approx(0.5)
+    relogio.agora += 2.5  # repõe 5 fichas, limitadas à rajada
+    assert limitador._reservar(4) == 0.0
+    assert limitador._reservar(2) == pytest.approx(1.0)
@@ -0,0 +1,54 @@
+"""Diário de execução: retomada, política de repetição e linha truncada"""
+
+import json
+
+from diario_execucao import DiarioExecucao
+
+
+def test_linha_truncada_pela_queda_e_descartada(tmp_path):
+    caminho = tmp_path / "diario.jsonl"
+    with DiarioExecucao(str(caminho), sincronizar=False) as diario:
+        diario.registrar({"numero": "1", "status": "Sucesso"})
+        diario.registrar({"numero": "2", "status": "Sucesso"})
+    integro = caminho.read_bytes()
+    with open(caminho, "ab") as f:
+        f.write(b'{"numero": "3", "sta')
+
+    with DiarioExecucao(str(caminho), sincronizar=False) as diario:
+        assert caminho.read_bytes() == integro
+        assert len(diario) == 2
+        assert diario.concluido("3") is None
+        diario.registrar({"numero": "3", "status": "Sucesso"})
+    linhas = caminho.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(linha)["numero"] for linha in linhas] == ["1", "2", "3"]
+
+
+def test_linha_json_invalida_no_meio_corta_o_resto(tmp_path):
+    caminho = tmp_path / "diario.jsonl"
+    caminho.write_text('{"numero": "1", "status": "Sucesso"}\nlixo\n{"numero": "2", "status": "Sucesso"}\n',
+                       encoding="utf-8")
+    with DiarioExecucao(str(caminho), sincronizar=False) as diario:
+        assert len(diario) == 1
+    assert caminho.read_text(encoding="utf-8") == '{"numero": "1", "status": "Sucesso"}\n'
+
+
+def test_erros_sao_repetidos_ate_o_maximo_de_tentativas(tmp_path):
+    caminho = str(tmp_path / "diario.jsonl")
+    with DiarioExecucao(caminho, max_tentativas=2, sincronizar=False) as diario:
+        diario.registrar({"numero": "1", "status": "Erro"})
+        diario.registrar({"numero": "2", "status": "Sucesso"})
+        assert diario.concluido("1") is None
+        assert diario.concluido("2")["status"] == "Sucesso"
+    with DiarioExecucao(caminho, max_tentativas=2, sincronizar=False) as diario:
+        diario.registrar({"numero": "1", "status": "Erro"})
+        assert diario.concluido("1")["status"] == "Erro"
+        assert diario.contagem() == {"Erro": 1, "Sucesso": 1}
+
+
+def test_descartar_apaga_o_diario(tmp_path):
+    caminho = tmp_path / "diario.jsonl"
+    diario = DiarioExecucao(str(caminho), sincronizar=False)
+    diario.registrar({"numero": "1", "status": "Sucesso"})
+    diario.descartar()
+    assert not caminho.exists()
+    assert len(diario) == 0
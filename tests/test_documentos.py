@@ -0,0 +1,118 @@
+"""Coletor de documentos contra um servidor de arquivos local"""
+
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from controle_taxa import ControladorTaxa, Disjuntor
+from documentos import ColetorDocumentos
+
+
+def pdf_com_texto(texto):
+    """PDF mínimo de uma página com `texto` em Helvetica"""
+    fluxo = f"BT /F1 12 Tf 72 720 Td ({texto}) Tj ET".encode("latin-1")
+    objetos = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length %d >>\nstream\n" % len(fluxo) + fluxo + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    saida = bytearray(b"%PDF-1.4\n")
+    posicoes = []
+    for i, objeto in enumerate(objetos, 1):
+        posicoes.append(len(saida))
+        saida += b"%d 0 obj\n" % i + objeto + b"\nendobj\n"
+    xref = len(saida)
+    saida += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objetos) + 1)
+    saida += b"".join(b"%010d 00000 n \n" % p for p in posicoes)
+    saida += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objetos) + 1, xref)
+    return bytes(saida)
+
+
+@pytest.fixture
+def servidor(tmp_path):
+    """Serve `tmp_path / "site"`; `servidor.caminhos` lista os GETs recebidos"""
+    site = tmp_path / "site"
+    (site / "copia").mkdir(parents=True)
+    decisao = pdf_com_texto("Defiro o processamento da recuperacao judicial")
+    (site / "decisao.pdf").write_bytes(decisao)
+    (site / "copia" / "decisao.pdf").write_bytes(decisao)
+    (site / "peticao.pdf").write_bytes(pdf_com_texto("Pedido de essencialidade dos caminhoes"))
+    (site / "login.html").write_text("<html><body>Identifique-se</body></html>", encoding="utf-8")
+
+    caminhos = []
+
+    class Manipulador(SimpleHTTPRequestHandler):
+        def do_GET(self):
+            caminhos.append(self.path)
+            super().do_GET()
+
+        def log_message(self, *args):
+            pass
+
+    http = ThreadingHTTPServer(("127.0.0.1", 0), partial(Manipulador, directory=str(site)))
+    thread = threading.Thread(target=http.serve_forever, daemon=True)
+    thread.start()
+    http.url = f"http://127.0.0.1:{http.server_address[1]}"
+    http.caminhos = caminhos
+    yield http
+    http.shutdown()
+    http.server_close()
+
+
+def arquivos_pdf(diretorio):
+    return [nome for _, _, nomes in os.walk(diretorio) for nome in nomes if nome.endswith(".pdf")]
+
+
+def test_mesmo_documento_em_urls_diferentes_ocupa_um_arquivo(tmp_path, servidor):
+    urls = [f"{servidor.url}/decisao.pdf", f"{servidor.url}/copia/decisao.pdf", f"{servidor.url}/peticao.pdf"]
+    with ColetorDocumentos(str(tmp_path / "pdfs"), concorrencia=2) as coletor:
+        obtidos = coletor.baixar(urls)
+        assert set(obtidos) == set(urls)
+        assert obtidos[urls[0]] == obtidos[urls[1]] != obtidos[urls[2]]
+        assert len(arquivos_pdf(tmp_path / "pdfs")) == 2
+
+        # URLs já baixadas saem do índice, sem nova requisição
+        requisicoes = len(servidor.caminhos)
+        assert coletor.baixar(urls) == obtidos
+        assert len(servidor.caminhos) == requisicoes
+
+
+def test_resposta_que_nao_e_pdf_e_descartada(tmp_path, servidor):
+    urls = [f"{servidor.url}/login.html", f"{servidor.url}/inexistente.pdf", f"{servidor.url}/peticao.pdf"]
+    with ColetorDocumentos(str(tmp_path / "pdfs")) as coletor:
+        assert list(coletor.baixar(urls)) == [urls[2]]
+        assert len(arquivos_pdf(tmp_path / "pdfs")) == 1
+        assert not [nome for nome in os.listdir(tmp_path / "pdfs") if nome.endswith(".tmp")]
+
+
+def test_downloads_nao_gastam_o_orcamento_de_consultas(tmp_path, servidor):
+    # A 0,01 consulta/s, cobrar fichas dos PDFs levaria minutos
+    controle = ControladorTaxa(0.01, disjuntor=Disjuntor(falhas_para_abrir=1))
+    urls = [f"{servidor.url}/decisao.pdf", f"{servidor.url}/peticao.pdf"]
+    with ColetorDocumentos(str(tmp_path / "pdfs"), controle=controle) as coletor:
+        assert len(coletor.baixar(urls)) == 2
+    assert controle.taxa > 0.01  # os sucessos alimentaram o AIMD
+    assert controle.limitador._reservar() == 0.0  # a ficha da consulta continua disponível
+
+    with ColetorDocumentos(str(tmp_path / "outros"), controle=controle) as coletor:
+        assert coletor.baixar([f"{servidor.url}/inexistente.pdf"]) == {}
+    assert controle.disjuntor.estado == Disjuntor.ABERTO
+
+
+def test_texto_extraido_uma_vez_e_lido_em_disco(tmp_path, servidor):
+    pytest.importorskip("pypdf")
+    urls = [f"{servidor.url}/decisao.pdf", f"{servidor.url}/copia/decisao.pdf", f"{servidor.url}/peticao.pdf"]
+    diretorio = str(tmp_path / "pdfs")
+    with ColetorDocumentos(diretorio, workers_texto=1) as coletor:
+        texto = coletor.processar(urls)
+    assert texto.count("Defiro o processamento") == 1
+    assert "essencialidade dos caminhoes" in texto
+
+    with ColetorDocumentos(diretorio, somente_leitura=True) as leitor:
+        assert leitor.texto_em_disco(urls[1:2]) == "Defiro o processamento da recuperacao judicial"
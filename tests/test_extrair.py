@@ -0,0 +1,54 @@
+"""Leitura dos números de processo pela linha de comando"""
+
+import asyncio
+import io
+import os
+import threading
+
+import pytest
+
+from extrair import _ler_async, ler_numeros
+
+
+@pytest.mark.parametrize("texto, numeros", [
+    ("numero\n1\n2\n", ["1", "2"]),
+    ("classe,numero\nRJ,1\nRJ,2\n", ["1", "2"]),
+    ("numero,classe\r\n1,RJ\r\n", ["1"]),
+    ("1\n2\n", ["1", "2"]),
+    ('{"numero": "1"}\n"2"\n', ["1", "2"]),
+])
+def test_formato_detectado_pela_primeira_linha(texto, numeros):
+    assert list(ler_numeros(io.StringIO(texto))) == numeros
+
+
+def test_csv_sem_cabecalho_mantem_a_primeira_linha():
+    assert list(ler_numeros(io.StringIO("1,RJ\n2,RJ\n"), "csv")) == ["1", "2"]
+
+
+def test_leitura_assincrona_entrega_cada_linha_ao_chegar():
+    leitura, escrita = os.pipe()
+    entregue = threading.Event()
+
+    def escrever():
+        with os.fdopen(escrita, "w") as pipe:
+            pipe.write("1\n")
+            pipe.flush()
+            # A segunda linha só chega depois que a primeira foi entregue
+            entregue.wait(5)
+            pipe.write("2\n")
+
+    async def consumir():
+        recebidos = []
+        with os.fdopen(leitura) as pipe:
+            async for numero in _ler_async(ler_numeros(pipe, "texto")):
+                recebidos.append(numero)
+                entregue.set()
+        return recebidos
+
+    escritor = threading.Thread(target=escrever)
+    escritor.start()
+    try:
+        assert asyncio.run(asyncio.wait_for(consumir(), 10)) == ["1", "2"]
+    finally:
+        entregue.set()
+        escritor.join()
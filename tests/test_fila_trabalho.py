@@ -0,0 +1,48 @@
+"""Fila de trabalho em SQLite: concessões, expiração e itens esgotados"""
+
+import pytest
+
+from fila_trabalho import FilaSQLite
+
+
+@pytest.fixture
+def fila(tmp_path):
+    fila = FilaSQLite(str(tmp_path / "fila.sqlite"), max_tentativas=2)
+    fila.enfileirar(["a", "b", "c"])
+    yield fila
+    fila.fechar()
+
+
+def test_item_esgotado_nao_esvazia_a_concessao(fila):
+    for _ in range(2):
+        assert [i.numero for i in fila.obter("w", 1, lease_s=-1)] == ["a"]
+    # "a" vira falho, e a mesma chamada passa ao próximo pendente
+    assert [i.numero for i in fila.obter("w", 1, lease_s=60)] == ["b"]
+    assert fila.contagem() == {"falhou": 1, "em_andamento": 1, "pendente": 1}
+
+
+def test_concessao_expirada_passa_a_outro_worker(fila):
+    (item,) = fila.obter("w1", 1, lease_s=-1)
+    (outro,) = fila.obter("w2", 1, lease_s=60)
+    assert outro.numero == item.numero == "a"
+    assert outro.tentativa == 2
+    # O primeiro worker perdeu a concessão: não renova nem conclui
+    assert fila.renovar([item, outro], lease_s=60) == [item]
+    assert not fila.concluir(item, {"numero": "a", "status": "Sucesso"})
+    assert fila.concluir(outro, {"numero": "a", "status": "Sucesso"})
+    assert list(fila.resultados()) == [{"numero": "a", "status": "Sucesso"}]
+
+
+def test_concessao_vigente_nao_e_concedida_de_novo(fila):
+    assert [i.numero for i in fila.obter("w1", 2, lease_s=60)] == ["a", "b"]
+    assert [i.numero for i in fila.obter("w2", 2, lease_s=60)] == ["c"]
+    assert fila.obter("w3", 1, lease_s=60) == []
+
+
+def test_devolver_esgota_as_tentativas(fila):
+    (item,) = fila.obter("w", 1, lease_s=60)
+    assert fila.devolver(item, "Erro")
+    (item,) = fila.obter("w", 1, lease_s=60)
+    assert item.numero == "a" and item.tentativa == 2
+    assert fila.devolver(item, "Erro")
+    assert fila.contagem() == {"falhou": 1, "pendente": 2}
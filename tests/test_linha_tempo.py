@@ -0,0 +1,100 @@
+"""Linha do tempo das movimentações: eventos, negações e questões 11 a 14"""
+
+import pytest
+
+from extrator_jurimetria import (
+    EVENTO_AGC, EVENTO_DEFERIMENTO, EVENTO_MEDIACAO, EVENTO_PLANO_APRESENTADO, EVENTO_PLANO_APROVADO,
+    EVENTO_PLANO_HOMOLOGADO, EVENTO_PRORROGACAO, Analisador, Processo, classificar_movimentacao,
+)
+
+
+REFERENCIA = "2025-03-01"
+
+
+def processo(*movimentacoes, numero="0000001-00.2024.8.26.0100"):
+    return Processo(numero=numero, movimentacoes=[{"data": d, "descricao": t} for d, t in movimentacoes])
+
+
+@pytest.fixture(scope="module")
+def analisador():
+    return Analisador(referencia=REFERENCIA)
+
+
+@pytest.mark.parametrize("descricao, eventos", [
+    ("Homologado o plano aprovado pela assembleia geral de credores",
+     {EVENTO_PLANO_HOMOLOGADO, EVENTO_PLANO_APROVADO, EVENTO_AGC}),
+    ("defiro o processamento da RJ e designo mediação", {EVENTO_DEFERIMENTO, EVENTO_MEDIACAO}),
+    ("Defiro a prorrogação do stay period por mais 90 dias", {EVENTO_PRORROGACAO}),
+    ("Plano de recuperação judicial rejeitado pela assembleia", {EVENTO_AGC}),
+    ("Indeferido o pedido de tutela. Homologado o plano de recuperação", {EVENTO_PLANO_HOMOLOGADO}),
+    ("Homologação de cálculos", set()),
+])
+def test_eventos_da_movimentacao(descricao, eventos):
+    assert classificar_movimentacao(descricao)[0] == eventos
+
+
+@pytest.mark.parametrize("descricao, negado", [
+    ("Não homologado o plano", EVENTO_PLANO_HOMOLOGADO),
+    ("Indeferida a homologação do plano", EVENTO_PLANO_HOMOLOGADO),
+    ("Plano de recuperação não aprovado", EVENTO_PLANO_APROVADO),
+    ("Prorrogado o prazo para apresentação do plano", EVENTO_PLANO_APRESENTADO),
+])
+def test_negacao_nao_conta_como_evento(descricao, negado):
+    eventos, negados, _ = classificar_movimentacao(descricao)
+    assert negado not in eventos
+    assert negado in negados
+
+
+def test_dias_de_prorrogacao():
+    assert classificar_movimentacao("Defiro a prorrogação do stay period por mais 90 dias")[2] == 90
+    assert classificar_movimentacao("Prorrogado o prazo de suspensão")[2] == 180
+    assert classificar_movimentacao("Manifeste-se sobre o pedido de prorrogação do prazo de suspensão")[2] == 0
+
+
+def test_plano_homologado_e_agc_na_mesma_movimentacao(analisador):
+    proc = analisador.analisar(processo(("01/02/2024", "Homologado o plano aprovado pela assembleia geral de credores")))
+    assert proc.q13_plano_rj == "Homologado"
+    assert proc.q14_agc_mediacao == "AGC realizada/marcada"
+
+
+def test_mediacao_designada_no_deferimento(analisador):
+    proc = analisador.analisar(processo(("01/02/2024", "defiro o processamento da RJ e designo mediação")))
+    assert proc.q11_stay_period == "Vencido"
+    assert proc.q14_agc_mediacao == "Mediação em andamento"
+
+
+def test_homologacao_negada_nao_cai_nos_termos(analisador):
+    proc = analisador.analisar(processo(("01/02/2024", "Indeferida a homologação do plano")))
+    assert proc.q13_plano_rj == "Aguardando/Em elaboração"
+
+
+def test_termos_decidem_sem_evento_reconhecido(analisador):
+    proc = analisador.analisar(processo(("01/02/2024", "Plano em fase de homologação"),
+                                        ("02/02/2024", "Juntada de ata. Designada a mediação entre as partes")))
+    assert proc.q13_plano_rj == "Homologado"
+    assert proc.q14_agc_mediacao == "Mediação em andamento"
+
+
+@pytest.mark.parametrize("movimentacoes, esperado", [
+    ([("01/12/2024", "Deferido o processamento da recuperação judicial."),
+      ("05/12/2024", "Manifeste-se sobre o pedido de prorrogação do prazo de suspensão.")], "Ativo"),
+    ([("01/06/2024", "Deferido o processamento da recuperação judicial."),
+      ("20/11/2024", "Defiro a prorrogação do stay period por mais 180 dias."),
+      ("20/11/2024", "Publicada decisão: prorrogado o prazo de suspensão por 180 dias.")], "Prorrogado"),
+    ([("01/01/2024", "Deferido o processamento da recuperação judicial.")], "Vencido"),
+    ([("01/01/2024", "Deferido o processamento da recuperação judicial."),
+      ("01/02/2025", "Decretada a falência da recuperanda.")], "Encerrado"),
+    ([("", "Deferido o processamento da recuperação judicial.")], "Ativo"),
+])
+def test_stay_period(analisador, movimentacoes, esperado):
+    assert analisador.analisar(processo(*movimentacoes)).q11_stay_period == esperado
+
+
+def test_prazos_somam_prorrogacoes_distintas(analisador):
+    proc = processo(("01/06/2024", "Deferido o processamento da recuperação judicial."),
+                    ("20/11/2024", "Defiro a prorrogação do stay period por mais 180 dias."),
+                    ("20/11/2024", "Publicada decisão: prorrogado o prazo de suspensão por 180 dias."))
+    prazos = analisador.prazos([proc]).iloc[0]
+    assert prazos["prorrogacao_dias"] == 180
+    assert str(prazos["vencimento_stay"].date()) == "2025-05-27"
+    assert bool(prazos["stay_vigente"])
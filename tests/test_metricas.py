@@ -0,0 +1,106 @@
+"""Métricas: histogramas, mescla entre workers e exposição para o Prometheus"""
+
+import json
+import re
+
+import pytest
+
+from metricas import Histograma, Metricas
+
+# Linha de amostra do formato de exposição: nome{rotulo="valor",...} número
+_AMOSTRA = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{(?:[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\]|\\.)*",?)*\})? (\S+)$')
+
+
+def amostras(texto):
+    """nome{rotulos} -> valor das linhas que não são comentário"""
+    valores = {}
+    for linha in texto.splitlines():
+        if linha.startswith("#"):
+            assert re.match(r"^# (HELP|TYPE) [a-zA-Z_:][a-zA-Z0-9_:]* ", linha), linha
+            continue
+        casamento = _AMOSTRA.match(linha)
+        assert casamento, linha
+        valores[casamento.group(1) + (casamento.group(2) or "")] = float(casamento.group(3))
+    return valores
+
+
+def test_histograma_intervalos_e_quantis():
+    h = Histograma(limites=(1.0, 2.0, 4.0))
+    for valor in (0.5, 1.0, 1.5, 3.0, 10.0):
+        h.observar(valor)
+    assert h.contagens == [2, 1, 1, 1]  # o limite é inclusivo; 10 cai em +Inf
+    assert (h.n, h.soma, h.maximo) == (5, 16.0, 10.0)
+    assert h.quantil(0.4) == pytest.approx(1.0)
+    assert h.quantil(0.5) == pytest.approx(1.5)  # meio do intervalo (1, 2]
+    assert h.quantil(1.0) == 10.0
+    assert Histograma().quantil(0.5) == 0.0
+    assert h.resumo()["media_s"] == pytest.approx(3.2)
+
+
+def test_histograma_mescla_exige_mesmos_limites():
+    a, b = Histograma((1.0, 2.0)), Histograma((1.0, 2.0))
+    a.observar(0.5)
+    b.observar(1.5)
+    b.observar(5.0)
+    a.mesclar(b)
+    assert (a.contagens, a.n, a.maximo) == ([1, 1, 1], 3, 5.0)
+    with pytest.raises(ValueError):
+        a.mesclar(Histograma((1.0,)))
+
+
+def test_mesclar_soma_etapas_e_contadores():
+    workers = [Metricas(), Metricas()]
+    for i, m in enumerate(workers):
+        for _ in range(i + 2):
+            m.observar("consulta", 0.2)
+            m.contar("processos", status="Sucesso")
+        m.contar("processos", status="Erro")
+    workers[1].observar("documentos", 3.0)
+    with pytest.raises(RuntimeError):
+        with workers[1].etapa("analise"):
+            raise RuntimeError("falhou")
+
+    total = Metricas().mesclar(workers[0]).mesclar(workers[1])
+    assert total.etapas["consulta"].n == 5
+    assert total.etapas["documentos"].n == 1
+    assert total.contadores[("processos", (("status", "Sucesso"),))] == 5
+    assert total.contadores[("processos", (("status", "Erro"),))] == 2
+    assert total.contadores[("erros", (("etapa", "analise"), ("tipo", "RuntimeError")))] == 1
+    relatorio = json.loads(json.dumps(total.relatorio()))
+    assert relatorio["etapas"]["consulta"]["n"] == 5
+    assert {"status": "Sucesso", "valor": 5} in relatorio["contadores"]["processos"]
+
+
+def test_texto_prometheus_no_formato_de_exposicao():
+    m = Metricas(prefixo="teste")
+    for segundos in (0.003, 0.2, 0.2, 120.0):
+        m.observar("consulta", segundos)
+    m.contar("processos", 3, status="Sucesso")
+    m.contar("processos", status='Erro: "timeout"')
+    m.contar("reinicios")
+    texto = m.texto_prometheus()
+    assert texto.endswith("\n")
+    assert "# TYPE teste_etapa_segundos histogram" in texto
+    assert "# TYPE teste_processos_total counter" in texto
+
+    valores = amostras(texto)
+    baldes = [(chave, v) for chave, v in valores.items() if chave.startswith("teste_etapa_segundos_bucket")]
+    assert [v for _, v in baldes] == sorted(v for _, v in baldes)  # cumulativos
+    assert valores['teste_etapa_segundos_bucket{etapa="consulta",le="0.005"}'] == 1
+    assert valores['teste_etapa_segundos_bucket{etapa="consulta",le="0.25"}'] == 3
+    assert valores['teste_etapa_segundos_bucket{etapa="consulta",le="+Inf"}'] == 4
+    assert valores['teste_etapa_segundos_count{etapa="consulta"}'] == 4
+    assert valores['teste_etapa_segundos_sum{etapa="consulta"}'] == pytest.approx(120.403)
+    assert valores['teste_processos_total{status="Sucesso"}'] == 3
+    assert valores['teste_processos_total{status="Erro: \\"timeout\\""}'] == 1
+    assert valores["teste_reinicios_total"] == 1
+
+
+def test_salvar_grava_json_e_prom(tmp_path):
+    m = Metricas()
+    m.observar("consulta", 0.1)
+    caminho_json, caminho_prom = m.salvar(str(tmp_path / "metricas" / "execucao"))
+    with open(caminho_json, encoding="utf-8") as f:
+        assert json.load(f)["etapas"]["consulta"]["n"] == 1
+    with open(caminho_prom, encoding="utf-8") as f:
+        assert f.read() == m.texto_prometheus()
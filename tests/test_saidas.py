@@ -0,0 +1,69 @@
+"""Saídas em fluxo: o que é gravado volta igual na leitura"""
+
+import json
+
+import pandas as pd
+import pytest
+
+from saidas import SaidaJSONL, SaidaParquet, abrir_saida
+
+COLUNAS = ["numero", "q01", "credores", "observacao"]
+LINHAS = [
+    {"numero": "0000001-00.2024.8.26.0100", "q01": "Sim", "credores": 12, "observacao": "Garantia fiduciária"},
+    {"numero": "0000002-00.2024.8.26.0100", "q01": "Não", "credores": 3, "observacao": 'aspas "duplas", vírgula'},
+    {"numero": "0000003-00.2024.8.26.0100", "q01": "Sim", "credores": 0},  # coluna ausente vira ""
+]
+
+
+def gravar(caminho, formato=None):
+    with abrir_saida(str(caminho), COLUNAS, formato) as saida:
+        for linha in LINHAS:
+            saida.escrever(linha)
+    assert saida.linhas_gravadas == len(LINHAS)
+
+
+def esperado():
+    return pd.DataFrame([[linha.get(c, "") for c in COLUNAS] for linha in LINHAS], columns=COLUNAS)
+
+
+def test_csv_ida_e_volta(tmp_path):
+    gravar(tmp_path / "relatorio.csv")
+    lido = pd.read_csv(tmp_path / "relatorio.csv", dtype=str, keep_default_na=False)
+    pd.testing.assert_frame_equal(lido, esperado().astype(str))
+
+
+def test_jsonl_ida_e_volta_preserva_tipos(tmp_path):
+    gravar(tmp_path / "relatorio.jsonl")
+    with open(tmp_path / "relatorio.jsonl", encoding="utf-8") as f:
+        lidas = [json.loads(linha) for linha in f]
+    assert lidas == [{c: linha.get(c, "") for c in COLUNAS} for linha in LINHAS]
+
+
+def test_jsonl_legivel_antes_de_fechar(tmp_path):
+    saida = SaidaJSONL(str(tmp_path / "parcial.jsonl"), COLUNAS)
+    saida.escrever(LINHAS[0])
+    with open(tmp_path / "parcial.jsonl", encoding="utf-8") as f:
+        assert json.loads(f.readline())["numero"] == LINHAS[0]["numero"]
+    saida.fechar()
+
+
+def test_xlsx_ida_e_volta(tmp_path):
+    gravar(tmp_path / "relatorio.xlsx")
+    lido = pd.read_excel(tmp_path / "relatorio.xlsx", keep_default_na=False)
+    pd.testing.assert_frame_equal(lido, esperado(), check_dtype=False)
+
+
+def test_parquet_ida_e_volta(tmp_path):
+    pytest.importorskip("pyarrow")
+    caminho = tmp_path / "relatorio.parquet"
+    with SaidaParquet(str(caminho), COLUNAS, linhas_por_parte=2) as saida:
+        for linha in LINHAS:
+            saida.escrever(linha)
+    assert sorted(p.name for p in caminho.iterdir()) == ["parte-00000.parquet", "parte-00001.parquet"]
+    lido = pd.read_parquet(caminho)
+    pd.testing.assert_frame_equal(lido.astype(str), esperado().astype(str))
+
+
+def test_formato_desconhecido(tmp_path):
+    with pytest.raises(ValueError, match="desconhecido"):
+        abrir_saida(str(tmp_path / "relatorio.txt"), COLUNAS)
@@ -0,0 +1,79 @@
+"""Pool de contextos da sessão síncrona, com um navegador falso no lugar do Chromium"""
+
+import pytest
+
+from extrator_jurimetria import Config, SessaoNavegador
+
+
+class PaginaFalsa:
+    def is_closed(self):
+        return False
+
+
+class ContextoFalso:
+    def __init__(self, navegador):
+        self.navegador = navegador
+        self.fechado = False
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    def new_page(self):
+        return PaginaFalsa()
+
+    def route(self, padrao, funcao):
+        pass
+
+    def on(self, evento, funcao):
+        pass
+
+    def close(self):
+        self.fechado = True
+
+
+class NavegadorFalso:
+    def __init__(self):
+        self.contextos = []
+
+    def new_context(self, **opcoes):
+        self.contextos.append(ContextoFalso(self))
+        return self.contextos[-1]
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def sessao():
+    sessao = SessaoNavegador(Config(TAMANHO_POOL_CONTEXTOS=2, USOS_POR_CONTEXTO=3))
+    sessao._browser = NavegadorFalso()
+    yield sessao
+    sessao.fechar()
+
+
+def test_contextos_criados_so_quando_emprestados(sessao):
+    navegador = sessao._browser
+    assert navegador.contextos == []
+    for _ in range(3):
+        with sessao.pagina():
+            pass
+    assert len(navegador.contextos) == 1  # consultas avulsas reaproveitam o mesmo contexto
+
+    with sessao.pagina(), sessao.pagina(), sessao.pagina():
+        pass
+    assert len(navegador.contextos) == 4  # o primeiro se esgotou; três ao mesmo tempo
+    # Só TAMANHO_POOL_CONTEXTOS ficam guardados; o excedente é fechado
+    assert len(sessao._livres) == 2
+    assert sum(c.fechado for c in navegador.contextos) == 2
+
+
+def test_erro_descarta_o_contexto_sem_recriar(sessao):
+    navegador = sessao._browser
+    with pytest.raises(RuntimeError):
+        with sessao.pagina():
+            raise RuntimeError("página quebrada")
+    assert len(navegador.contextos) == 1 and navegador.contextos[0].fechado
+    assert sessao._livres == []